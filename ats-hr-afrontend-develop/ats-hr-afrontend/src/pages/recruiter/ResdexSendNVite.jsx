@@ -241,7 +241,7 @@ Best regards,
         <div className="bg-green-50 border border-green-200 text-green-700 px-4 py-3 rounded-lg space-y-2">
           <div className="flex items-center gap-2">
             <CheckCircle size={18} />
-            Sent: {status.sent} · Failed: {status.failed}
+            Queued: {status.queued} · Failed: {status.failed}
           </div>
           {Array.isArray(status.details) && status.details.length > 0 && (
             <div className="text-sm text-green-800">
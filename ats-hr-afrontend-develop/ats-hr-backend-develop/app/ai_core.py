@@ -4,27 +4,19 @@ import os
 import re
 
 try:
-    from sentence_transformers import SentenceTransformer
     import numpy as np
     _MODEL_LOADED = True
 except ImportError:
     _MODEL_LOADED = False
 
-# Singleton for embedding model
-_embedding_model = None
 
 def get_embedding_model():
-    global _embedding_model
+    """Process-wide model instance, owned by the shared embedding service."""
     if not _MODEL_LOADED:
         return None
-    if _embedding_model is None:
-        try:
-            # Using a small, fast model suitable for local deployment
-            _embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            print(f"Error loading embedding model: {e}")
-            return None
-    return _embedding_model
+    from app.services.embedding_service import embedding_service
+
+    return embedding_service.get_model()
 
 
 # ============================================================
@@ -37,32 +29,52 @@ def generate_embedding(text: str) -> List[float]:
     if not model or not text:
         # Fallback to dummy vector if model fails to load
         return [0.0] * 384
-    
-    embedding = model.encode(text)
-    return embedding.tolist()
 
-def generate_candidate_embedding(candidate_data: Dict[str, Any]) -> List[float]:
-    """
-    Generate a rich candidate embedding by combining various profile sections.
-    """
+    from app.services.embedding_service import embedding_service
+
+    return embedding_service.encode_one(text).tolist()
+
+
+async def generate_embedding_async(text: str) -> List[float]:
+    """Same as generate_embedding, without blocking the event loop."""
+    model = get_embedding_model()
+    if not model or not text:
+        return [0.0] * 384
+
+    from app.services.embedding_service import embedding_service
+
+    return (await embedding_service.encode_one_async(text)).tolist()
+
+def candidate_embedding_text(candidate_data: Dict[str, Any]) -> str:
+    """Composite profile text that candidate embeddings are generated from."""
     name = candidate_data.get('name', '')
     skills = " ".join(candidate_data.get('skills', [])) if isinstance(candidate_data.get('skills'), list) else str(candidate_data.get('skills', ''))
     experience = str(candidate_data.get('experience', ''))
     bio = candidate_data.get('internal_notes', '') or ''
     
     # Composite text for embedding
-    text = f"Candidate: {name}. Skills: {skills}. Experience: {experience}. Notes: {bio}"
-    return generate_embedding(text)
+    return f"Candidate: {name}. Skills: {skills}. Experience: {experience}. Notes: {bio}"
+
+
+def generate_candidate_embedding(candidate_data: Dict[str, Any]) -> List[float]:
+    """
+    Generate a rich candidate embedding by combining various profile sections.
+    """
+    return generate_embedding(candidate_embedding_text(candidate_data))
 
 
 # ============================================================
 # JOB EMBEDDING (REQUIRED BY jobs.py)
 # ============================================================
 
+def job_embedding_text(job_data: Dict[str, Any]) -> str:
+    """Composite text that job embeddings are generated from."""
+    return f"Job Title: {job_data.get('title', '')}. Description: {job_data.get('description', '')}. Skills: {job_data.get('skills', '')}"
+
+
 def generate_job_embedding(job_data: Dict[str, Any]) -> List[float]:
     """Generate job embedding for semantic matching."""
-    text = f"Job Title: {job_data.get('title', '')}. Description: {job_data.get('description', '')}. Skills: {job_data.get('skills', '')}"
-    return generate_embedding(text)
+    return generate_embedding(job_embedding_text(job_data))
 
 
 # ============================================================
@@ -93,17 +105,37 @@ def generate_fit_explanation(candidate: dict, job: dict) -> str:
 
 
 # ============================================================
-# FAISS INDEX PLACEHOLDER
+# FAISS / ANN VECTOR INDEX
 # ============================================================
 
 def add_to_faiss_index(vector: List[float], metadata: dict | None = None):
+    """
+    Add or replace a vector in the ANN index.
+    metadata must carry candidate_id or job_id, which is used as the key.
+    """
+    from app.services.vector_index import index_for_metadata
+
+    metadata = metadata or {}
+    index, entity_id = index_for_metadata(metadata)
+    added = bool(index and entity_id and index.upsert(entity_id, vector))
     return {
-        "status": "added",
-        "vector_length": len(vector),
-        "metadata": metadata or {}
+        "status": "added" if added else "skipped",
+        "vector_length": len(vector or []),
+        "metadata": metadata
     }
 
 
+def remove_from_faiss_index(metadata: dict):
+    """Delete a candidate/job vector from the ANN index."""
+    from app.services.vector_index import index_for_metadata
+
+    index, entity_id = index_for_metadata(metadata or {})
+    if index and entity_id:
+        index.remove(entity_id)
+        return {"status": "removed", "metadata": metadata}
+    return {"status": "skipped", "metadata": metadata}
+
+
 # ============================================================
 # RESUME PARSER
 # ============================================================
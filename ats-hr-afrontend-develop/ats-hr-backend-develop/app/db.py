@@ -60,6 +60,11 @@ def init_db():
     ensure_interview_workflow_columns()
     ensure_system_notification_columns()
     ensure_activity_log_indexes()
+    ensure_candidate_search_indexes()
+    ensure_candidate_terms()
+    ensure_candidate_email_logs()
+    ensure_candidate_invite_columns()
+    ensure_embedding_columns()
     ensure_enterprise_audit_log_columns()
     ensure_workflow_builder_schema()
     ensure_system_settings_schema()
@@ -230,13 +235,32 @@ def ensure_saved_search_columns():
     """
     Ensure saved_searches columns exist for ATS search storage without Alembic.
     """
-    if not DATABASE_URL or not DATABASE_URL.startswith("postgres"):
+    if not DATABASE_URL:
+        return
+
+    if DATABASE_URL.startswith("sqlite"):
+        try:
+            with engine.begin() as conn:
+                columns = {
+                    row[1]
+                    for row in conn.execute(text("PRAGMA table_info(saved_searches)")).fetchall()
+                }
+                for column in ("last_run_high_water", "last_alerted_at"):
+                    if columns and column not in columns:
+                        conn.execute(text(f"ALTER TABLE saved_searches ADD COLUMN {column} TIMESTAMP"))
+        except Exception as e:
+            print(f"Error ensuring saved_searches columns: {e}")
+        return
+
+    if not DATABASE_URL.startswith("postgres"):
         return
 
     ddl = [
         "ALTER TABLE saved_searches ADD COLUMN IF NOT EXISTS filters JSONB",
         "ALTER TABLE saved_searches ADD COLUMN IF NOT EXISTS result_count INTEGER DEFAULT 0",
         "ALTER TABLE saved_searches ADD COLUMN IF NOT EXISTS folder_id VARCHAR",
+        "ALTER TABLE saved_searches ADD COLUMN IF NOT EXISTS last_run_high_water TIMESTAMP",
+        "ALTER TABLE saved_searches ADD COLUMN IF NOT EXISTS last_alerted_at TIMESTAMP",
     ]
 
     with engine.begin() as conn:
@@ -764,6 +788,178 @@ def ensure_candidate_resume_columns():
             conn.execute(text(statement))
 
 
+def ensure_candidate_search_indexes():
+    """
+    Ensure candidates indexes used by the Resdex search index sync exist.
+    """
+    if not DATABASE_URL:
+        return
+
+    statements = [
+        "CREATE INDEX IF NOT EXISTS idx_candidates_updated_at ON candidates(updated_at)",
+    ]
+
+    with engine.begin() as conn:
+        for statement in statements:
+            try:
+                conn.execute(text(statement))
+            except Exception:
+                # Keep startup non-blocking for partially-migrated environments.
+                pass
+
+
+def ensure_candidate_terms():
+    """
+    Backfill the candidate_terms side table used by Resdex skill, tag and
+    certification filters (table itself is created by create_all).
+    """
+    if not DATABASE_URL:
+        return
+
+    from app.services.candidate_terms import backfill_candidate_terms
+
+    try:
+        with engine.begin() as conn:
+            written = backfill_candidate_terms(conn)
+        if written:
+            print(f"Backfilled {written} candidate search terms")
+    except Exception as e:
+        # Keep startup non-blocking for partially-migrated environments.
+        print(f"Candidate search term backfill skipped: {e}")
+
+
+def ensure_candidate_email_logs():
+    """
+    Move legacy candidates.email_logs JSON entries into the indexed
+    candidate_email_logs table (table itself is created by create_all).
+    """
+    if not DATABASE_URL:
+        return
+
+    from app.services.email_outbox import backfill_candidate_email_logs
+
+    try:
+        with engine.begin() as conn:
+            written = backfill_candidate_email_logs(conn)
+        if written:
+            print(f"Backfilled {written} candidate email log entries")
+    except Exception as e:
+        # Keep startup non-blocking for partially-migrated environments.
+        print(f"Candidate email log backfill skipped: {e}")
+
+
+def ensure_candidate_invite_columns():
+    """
+    Ensure candidate_invites can point at the outbox row carrying the invite.
+    """
+    if not DATABASE_URL:
+        return
+
+    if DATABASE_URL.startswith("sqlite"):
+        try:
+            with engine.begin() as conn:
+                columns = {
+                    row[1]
+                    for row in conn.execute(text("PRAGMA table_info(candidate_invites)")).fetchall()
+                }
+                if columns and "outbox_id" not in columns:
+                    conn.execute(text("ALTER TABLE candidate_invites ADD COLUMN outbox_id VARCHAR"))
+                conn.execute(
+                    text("CREATE INDEX IF NOT EXISTS ix_candidate_invites_outbox_id ON candidate_invites (outbox_id)")
+                )
+        except Exception as e:
+            print(f"Error ensuring candidate_invites columns: {e}")
+        return
+
+    if not DATABASE_URL.startswith("postgres"):
+        return
+
+    ddl = [
+        "ALTER TABLE candidate_invites ADD COLUMN IF NOT EXISTS outbox_id VARCHAR",
+        "CREATE INDEX IF NOT EXISTS ix_candidate_invites_outbox_id ON candidate_invites (outbox_id)",
+    ]
+
+    with engine.begin() as conn:
+        for statement in ddl:
+            conn.execute(text(statement))
+
+
+def ensure_embedding_columns():
+    """
+    Ensure the binary embedding columns (plus model version / freshness
+    tracking) exist on candidates/jobs and backfill them from the legacy JSON
+    ``embedding_vector`` column.
+    """
+    if not DATABASE_URL:
+        return
+
+    from app.utils.embedding_codec import pack_embedding
+
+    dialect = engine.dialect.name
+    blob_type = "BYTEA" if dialect == "postgresql" else "BLOB"
+    batch_size = 1000
+
+    for table in ("candidates", "jobs"):
+        try:
+            with engine.begin() as conn:
+                if dialect == "sqlite":
+                    columns = {
+                        row[1]
+                        for row in conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
+                    }
+                    if "embedding_f32" not in columns:
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN embedding_f32 BLOB"))
+                    if "embedding_model" not in columns:
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN embedding_model VARCHAR(100)"))
+                    if "embedding_updated_at" not in columns:
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN embedding_updated_at TIMESTAMP"))
+                else:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS embedding_f32 {blob_type}"))
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(100)"))
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS embedding_updated_at TIMESTAMP"))
+                    columns = {
+                        row[0]
+                        for row in conn.execute(
+                            text(
+                                "SELECT column_name FROM information_schema.columns "
+                                "WHERE table_name = :table"
+                            ),
+                            {"table": table},
+                        ).fetchall()
+                    }
+
+            if "embedding_vector" not in columns:
+                continue
+
+            last_id = ""
+            while True:
+                with engine.begin() as conn:
+                    rows = conn.execute(
+                        text(
+                            f"SELECT id, embedding_vector FROM {table} "
+                            "WHERE embedding_f32 IS NULL AND embedding_vector IS NOT NULL AND id > :last_id "
+                            "ORDER BY id LIMIT :limit"
+                        ),
+                        {"last_id": last_id, "limit": batch_size},
+                    ).fetchall()
+                    if not rows:
+                        break
+                    updates = [
+                        {"id": row[0], "blob": packed}
+                        for row in rows
+                        if (packed := pack_embedding(row[1])) is not None
+                    ]
+                    if updates:
+                        conn.execute(
+                            text(f"UPDATE {table} SET embedding_f32 = :blob WHERE id = :id"),
+                            updates,
+                        )
+                    last_id = rows[-1][0]
+        except Exception as e:
+            # Keep startup non-blocking for partially-migrated environments.
+            print(f"Embedding column migration skipped for {table}: {e}")
+
+
 def ensure_activity_log_indexes():
     """
     Ensure activity_logs indexes exist for query-heavy feed endpoints.
@@ -3,7 +3,6 @@ Email Service
 Handles all email notifications, reminders, and escalations
 """
 
-import smtplib
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -12,7 +11,8 @@ from datetime import datetime
 import logging
 from fastapi import BackgroundTasks
 from app.db import SessionLocal
-from app import models
+from app.services.settings_cache import system_settings_cache
+from app.services.mail_transport import SMTPSettings, mail_transport
 
 logger = logging.getLogger(__name__)
 
@@ -22,50 +22,55 @@ FROM_EMAIL = os.getenv("SENDER_EMAIL", "noreply@akshu-hr.com")
 FROM_PASSWORD = os.getenv("SENDER_PASSWORD", "your_app_password")
 
 
-def _get_setting(key: str, default=None):
-    db = SessionLocal()
-    try:
-        row = (
-            db.query(models.SystemSettings)
-            .filter(
-                (models.SystemSettings.config_key == key)
-                | (
-                    (models.SystemSettings.module_name == key.split(".", 1)[0])
-                    & (models.SystemSettings.setting_key == key.split(".", 1)[1] if "." in key else key)
-                )
-            )
-            .order_by(models.SystemSettings.updated_at.desc())
-            .first()
-        )
-        if not row:
-            return default
-        if row.value_json is not None:
-            return row.value_json
-        if row.setting_value is not None:
-            return row.setting_value
-        return default
-    except Exception:
-        return default
-    finally:
-        db.close()
-
-
-def send_email(to_email: str, subject: str, text: str = None, html_content: str = None):
+def resolve_smtp_settings() -> SMTPSettings:
     """
-    Supports BOTH plain text and HTML emails.
+    Current provider / SMTP settings from the in-memory settings cache,
+    passed to the transport with each message.
     """
-
-    provider = str(_get_setting("email.provider", "smtp") or "smtp").strip().lower()
-    if not bool(_get_setting("notify.enable_system_emails", True)):
-        logger.info("System emails disabled by settings")
-        return True
-
-    sender_name = str(_get_setting("email.from_name", "ATS-HR") or "ATS-HR").strip()
-    sender_address = str(_get_setting("email.from_address", FROM_EMAIL) or FROM_EMAIL).strip()
-
+    provider = system_settings_cache.get_str("email.provider", "smtp").lower()
+    enabled = system_settings_cache.get_bool("notify.enable_system_emails", True)
+
+    sender_name = system_settings_cache.get_str("email.from_name", "ATS-HR")
+    sender_address = system_settings_cache.get_str("email.from_address", FROM_EMAIL)
+
+    if provider not in {"smtp", "sendgrid"}:
+        provider = "smtp"
+
+    if provider == "sendgrid":
+        # Keep runtime simple: SendGrid SMTP relay mode using existing SMTP pipeline.
+        sendgrid_key = system_settings_cache.get_str("email.sendgrid_api_key", "")
+        if sendgrid_key:
+            smtp_server = "smtp.sendgrid.net"
+            smtp_port = 587
+            smtp_user = "apikey"
+            smtp_password = sendgrid_key
+        else:
+            smtp_server = SMTP_SERVER
+            smtp_port = SMTP_PORT
+            smtp_user = sender_address
+            smtp_password = FROM_PASSWORD
+    else:
+        smtp_cfg = system_settings_cache.get_dict("email.smtp_config")
+        smtp_server = str(smtp_cfg.get("server") or SMTP_SERVER)
+        smtp_port = int(smtp_cfg.get("port") or SMTP_PORT)
+        smtp_user = str(smtp_cfg.get("username") or sender_address)
+        smtp_password = str(smtp_cfg.get("password") or FROM_PASSWORD)
+
+    return SMTPSettings(
+        server=smtp_server,
+        port=smtp_port,
+        username=smtp_user,
+        password=smtp_password,
+        sender_address=sender_address,
+        sender_name=sender_name,
+        enabled=enabled,
+    )
+
+
+def build_message(settings: SMTPSettings, to_email: str, subject: str, text: str = None, html_content: str = None):
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
-    msg["From"] = f"{sender_name} <{sender_address}>"
+    msg["From"] = f"{settings.sender_name} <{settings.sender_address}>"
     msg["To"] = to_email
 
     # Add plain text if provided
@@ -75,36 +80,23 @@ def send_email(to_email: str, subject: str, text: str = None, html_content: str
     # Add HTML if provided
     if html_content:
         msg.attach(MIMEText(html_content, "html"))
+    return msg
 
+
+def send_email(to_email: str, subject: str, text: str = None, html_content: str = None):
+    """
+    Supports BOTH plain text and HTML emails.
+    Sends synchronously on a pooled SMTP connection; prefer the email outbox
+    (send_email_background / app.services.email_outbox) for anything called
+    from a request handler or in bulk.
+    """
     try:
-        if provider not in {"smtp", "sendgrid"}:
-            provider = "smtp"
-
-        if provider == "sendgrid":
-            # Keep runtime simple: SendGrid SMTP relay mode using existing SMTP pipeline.
-            sendgrid_key = str(_get_setting("email.sendgrid_api_key", "") or "").strip()
-            if sendgrid_key:
-                smtp_server = "smtp.sendgrid.net"
-                smtp_port = 587
-                smtp_user = "apikey"
-                smtp_password = sendgrid_key
-            else:
-                smtp_server = SMTP_SERVER
-                smtp_port = SMTP_PORT
-                smtp_user = sender_address
-                smtp_password = FROM_PASSWORD
-        else:
-            smtp_cfg = _get_setting("email.smtp_config", {}) or {}
-            smtp_server = str(smtp_cfg.get("server") or SMTP_SERVER)
-            smtp_port = int(smtp_cfg.get("port") or SMTP_PORT)
-            smtp_user = str(smtp_cfg.get("username") or sender_address)
-            smtp_password = str(smtp_cfg.get("password") or FROM_PASSWORD)
-
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
-        server.login(smtp_user, smtp_password)
-        server.sendmail(sender_address, to_email, msg.as_string())
-        server.quit()
+        settings = resolve_smtp_settings()
+        if not settings.enabled:
+            logger.info("System emails disabled by settings")
+            return True
+
+        mail_transport.deliver(settings, build_message(settings, to_email, subject, text, html_content), to_email)
         logger.info(f"Email sent to {to_email}: {subject}")
         return True
     except Exception as e:
@@ -121,8 +113,19 @@ def send_email_background(
 ):
     """
     Allows async (non-blocking) HTML OR text emails.
+    The message is stored in the email outbox before returning, so it
+    survives a worker restart; the outbox is drained after the response.
     """
-    background_tasks.add_task(send_email, to_email, subject, text, html_content)
+    from app.services.email_outbox import enqueue_email, wake_outbox_worker
+
+    db = SessionLocal()
+    try:
+        message_id = enqueue_email(db, to_email, subject, text, html_content).id
+        db.commit()
+    finally:
+        db.close()
+    background_tasks.add_task(wake_outbox_worker)
+    return message_id
 
 
 # ========================
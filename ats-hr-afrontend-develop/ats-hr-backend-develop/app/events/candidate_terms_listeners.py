@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event, inspect
+
+from app import models
+from app.services.candidate_terms import delete_candidate_terms, sync_candidate_terms
+
+_REGISTERED = False
+
+_TERM_FIELDS = ("skills", "tags", "certifications_text", "parsed_resume")
+
+
+def _candidate_inserted(mapper, connection, target: Any) -> None:
+    sync_candidate_terms(connection, [getattr(target, "id", None)])
+
+
+def _candidate_updated(mapper, connection, target: Any) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _TERM_FIELDS):
+        sync_candidate_terms(connection, [getattr(target, "id", None)])
+
+
+def _candidate_deleted(mapper, connection, target: Any) -> None:
+    delete_candidate_terms(connection, [getattr(target, "id", None)])
+
+
+def _certification_changed(mapper, connection, target: Any) -> None:
+    sync_candidate_terms(connection, [getattr(target, "candidate_id", None)])
+
+
+def register_candidate_terms_listeners() -> None:
+    """
+    Keep candidate_terms in step with skills/tags/certifications, in the same
+    transaction as the change itself.
+    """
+    global _REGISTERED
+    if _REGISTERED:
+        return
+
+    event.listen(models.Candidate, "after_insert", _candidate_inserted)
+    event.listen(models.Candidate, "after_update", _candidate_updated)
+    event.listen(models.Candidate, "before_delete", _candidate_deleted)
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(models.Certification, name, _certification_changed)
+
+    _REGISTERED = True
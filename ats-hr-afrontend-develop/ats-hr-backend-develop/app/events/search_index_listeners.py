@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app import models
+from app.services.candidate_search_index import candidate_search_index
+from app.services.resdex_cache import bump_candidate_version
+from app.services.skill_vocabulary import skill_vocabulary
+from app.services.vector_index import candidate_vector_index, job_vector_index
+
+_REGISTERED = False
+
+_PENDING_CANDIDATES = "search_index_pending_candidates"
+_PENDING_JOBS = "search_index_pending_jobs"
+_PENDING_SKILLS = "search_index_pending_skills"
+
+
+def _remember(target: Any, key: str, entity_id: str | None) -> None:
+    if not entity_id:
+        return
+    session = object_session(target)
+    if session is None:
+        _mark_dirty(key, [entity_id])
+        return
+    session.info.setdefault(key, set()).add(str(entity_id))
+
+
+def _mark_dirty(key: str, entity_ids) -> None:
+    if key == _PENDING_CANDIDATES:
+        candidate_search_index.mark_dirty(entity_ids)
+        candidate_vector_index.mark_dirty(entity_ids)
+        bump_candidate_version()
+    elif key == _PENDING_JOBS:
+        job_vector_index.mark_dirty(entity_ids)
+    elif key == _PENDING_SKILLS:
+        skill_vocabulary.mark_dirty()
+        bump_candidate_version()
+
+
+def _candidate_changed(mapper, connection, target) -> None:
+    _remember(target, _PENDING_CANDIDATES, getattr(target, "id", None))
+
+
+def _certification_changed(mapper, connection, target) -> None:
+    _remember(target, _PENDING_CANDIDATES, getattr(target, "candidate_id", None))
+
+
+def _job_changed(mapper, connection, target) -> None:
+    _remember(target, _PENDING_JOBS, getattr(target, "id", None))
+
+
+def _skill_changed(mapper, connection, target) -> None:
+    _remember(target, _PENDING_SKILLS, getattr(target, "id", None))
+
+
+def _after_commit(session: Session) -> None:
+    for key in (_PENDING_CANDIDATES, _PENDING_JOBS, _PENDING_SKILLS):
+        pending = session.info.pop(key, None)
+        if pending:
+            _mark_dirty(key, pending)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_CANDIDATES, None)
+    session.info.pop(_PENDING_JOBS, None)
+    session.info.pop(_PENDING_SKILLS, None)
+
+
+def register_search_index_listeners() -> None:
+    """
+    Keep the Resdex inverted index, the candidate/job vector indexes, the
+    skill vocabulary and the Resdex result caches in sync with committed
+    changes (create, update, merge, deactivate, delete, certification edits).
+    """
+    global _REGISTERED
+    if _REGISTERED:
+        return
+
+    for model, handler in (
+        (models.Candidate, _candidate_changed),
+        (models.Certification, _certification_changed),
+        (models.Job, _job_changed),
+        (models.Skill, _skill_changed),
+    ):
+        event.listen(model, "after_insert", handler)
+        event.listen(model, "after_update", handler)
+        event.listen(model, "after_delete", handler)
+
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+    _REGISTERED = True
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app import models
+from app.services.settings_cache import system_settings_cache
+
+_REGISTERED = False
+
+_PENDING_SETTINGS = "settings_cache_pending"
+
+
+def _settings_changed(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is None:
+        system_settings_cache.notify_changed()
+        return
+    session.info[_PENDING_SETTINGS] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_SETTINGS, None):
+        system_settings_cache.notify_changed()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_SETTINGS, None)
+
+
+def register_settings_listeners() -> None:
+    """
+    Reload the in-memory system settings, in this worker and (via the
+    signal file) the others, after any committed write to ``SystemSettings``
+    (/v1/settings, super-admin system settings and maintenance, seeding).
+    """
+    global _REGISTERED
+    if _REGISTERED:
+        return
+
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(models.SystemSettings, name, _settings_changed)
+
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+    _REGISTERED = True
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import os
+import threading
 from app.routes import documents
 from app.db import init_db
 from app.routes import chat
@@ -101,6 +102,12 @@ from app.permissions import ROLE_PERMISSIONS
 from app import models
 from app.services.audit_service import register_audit_middleware
 from app.events.audit_listeners import register_audit_listeners
+from app.events.search_index_listeners import register_search_index_listeners
+from app.events.candidate_terms_listeners import register_candidate_terms_listeners
+from app.events.settings_listeners import register_settings_listeners
+from app.services.vector_index import load_vector_indexes, save_vector_indexes
+from app.services.model_registry import NLP_WARMUP_MODELS, model_registry, warm_up_from_env
+from app.services.resume_parse_pool import resume_parse_pool
 from app.middleware.maintenance_mode import register_maintenance_middleware
 
 
@@ -277,6 +284,19 @@ async def startup_event():
     init_db()
     seed_permissions_to_db()
     register_audit_listeners()
+    register_search_index_listeners()
+    register_candidate_terms_listeners()
+    register_settings_listeners()
+
+    # ⭐ Reload ANN vector index snapshots (no re-encoding on restart)
+    try:
+        load_vector_indexes()
+    except Exception as e:
+        print(f"Failed to load vector index snapshots: {e}")
+
+    # ⭐ Load and warm up NLP models off the startup path (NLP_WARMUP_MODELS)
+    if NLP_WARMUP_MODELS.strip():
+        threading.Thread(target=warm_up_from_env, name="nlp-warmup", daemon=True).start()
     
     # ⭐ Initialize Passive Requirement Monitoring
     try:
@@ -288,6 +308,14 @@ async def startup_event():
     except Exception as e:
         print(f"Failed to start background scheduler: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    try:
+        save_vector_indexes()
+    except Exception as e:
+        print(f"Failed to save vector index snapshots: {e}")
+    resume_parse_pool.shutdown()
+
 # ---------------- BASIC ENDPOINTS ----------------
 @app.get("/api")
 def read_root():
@@ -303,6 +331,12 @@ def health_check():
     return {"status": "healthy", "app": "Akshu HR Platform"}
 
 
+@app.get("/health/models")
+def model_health():
+    """Load state, load time and resident-memory cost of each NLP model."""
+    return {"models": model_registry.stats()}
+
+
 # ---------------- FRONTEND STATIC SERVE ----------------
 frontend_dist = os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "dist")
 
@@ -5,9 +5,10 @@ Implements hybrid matching: Rule-based (70%) + Semantic similarity (30%)
 
 import logging
 from typing import Dict, List, Tuple
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
+from app.services.embedding_service import embedding_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,28 +20,22 @@ class MatchingService:
     """
     
     def __init__(self):
-        """Initialize the SBERT model (all-MiniLM-L6-v2)"""
-        try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("SBERT model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load SBERT model: {e}")
-            raise
-        
-        self.embedding_cache = {}  # Cache embeddings to optimize performance
+        """Use the shared SBERT model (all-MiniLM-L6-v2) of the embedding service"""
+        self.model = embedding_service.get_model()
+        if self.model is None:
+            logger.error("Failed to load SBERT model")
+            raise RuntimeError("SBERT model is not available")
+        logger.info("SBERT model loaded successfully")
+
+        # Bounded LRU shared with every other embedding consumer
+        self.embedding_cache = embedding_service.cache
     
     def _get_embedding(self, text: str) -> np.ndarray:
-        """Get or create embedding for text with caching"""
+        """Get or create embedding for text (cached by the embedding service)"""
         if not text:
             return np.array([])
         
-        text_lower = text.lower()
-        if text_lower in self.embedding_cache:
-            return self.embedding_cache[text_lower]
-        
-        embedding = self.model.encode(text, convert_to_tensor=False)
-        self.embedding_cache[text_lower] = embedding
-        return embedding
+        return embedding_service.encode_one(text)
     
     def _calculate_skill_match(
         self, 
@@ -146,6 +141,80 @@ class MatchingService:
         similarity_pct = float(similarity) * 100
         return max(0, min(100, similarity_pct))
     
+    def calculate_semantic_similarities(
+        self,
+        job_description: str,
+        candidate_summaries: List[str]
+    ) -> List[float]:
+        """
+        Vectorized version of _calculate_semantic_similarity for many candidates.
+
+        Summaries are encoded in one batch (cached ones are served by the
+        embedding cache), stacked into a normalized float32 matrix and scored
+        against the job with a single matrix-vector product.
+
+        Returns: similarity scores (0-100), aligned with candidate_summaries
+        """
+        scores = [0.0] * len(candidate_summaries)
+        if not job_description or not candidate_summaries:
+            return scores
+
+        job_embedding = self._get_embedding(job_description)
+        positions = [i for i, text in enumerate(candidate_summaries) if text]
+        if len(job_embedding) == 0 or not positions:
+            return scores
+
+        matrix = embedding_service.encode([candidate_summaries[i] for i in positions])
+        return self._similarity_scores(job_embedding, matrix, positions, scores)
+
+    async def calculate_semantic_similarities_async(
+        self,
+        job_description: str,
+        candidate_summaries: List[str]
+    ) -> List[float]:
+        """
+        Same as calculate_semantic_similarities, awaiting the embedding
+        service instead of blocking the event loop. Use it from async routes.
+        """
+        scores = [0.0] * len(candidate_summaries)
+        if not job_description or not candidate_summaries:
+            return scores
+
+        positions = [i for i, text in enumerate(candidate_summaries) if text]
+        if not positions:
+            return scores
+
+        # Job text and summaries go through the same micro-batch
+        vectors = await embedding_service.encode_async(
+            [job_description] + [candidate_summaries[i] for i in positions]
+        )
+        return self._similarity_scores(vectors[0], vectors[1:], positions, scores)
+
+    async def calculate_semantic_similarity_async(
+        self,
+        job_description: str,
+        candidate_summary: str
+    ) -> float:
+        """Async counterpart of _calculate_semantic_similarity."""
+        return (await self.calculate_semantic_similarities_async(job_description, [candidate_summary]))[0]
+
+    @staticmethod
+    def _similarity_scores(
+        job_embedding: np.ndarray,
+        candidate_matrix: np.ndarray,
+        positions: List[int],
+        scores: List[float]
+    ) -> List[float]:
+        matrix = np.array(candidate_matrix, dtype=np.float32)
+        matrix /= (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8)
+        job_vec = np.asarray(job_embedding, dtype=np.float32)
+        job_vec = job_vec / (np.linalg.norm(job_vec) + 1e-8)
+
+        similarity_pct = np.clip((matrix @ job_vec) * 100.0, 0.0, 100.0)
+        for i, value in zip(positions, similarity_pct.tolist()):
+            scores[i] = float(value)
+        return scores
+
     def calculate_match_score(
         self,
         candidate_skills: List[str],
@@ -154,7 +223,8 @@ class MatchingService:
         candidate_experience_years: float = 0,
         required_experience_years: float = 0,
         job_description: str = "",
-        candidate_summary: str = ""
+        candidate_summary: str = "",
+        semantic_score: float = None
     ) -> Dict:
         """
         Calculate comprehensive match score using hybrid approach.
@@ -170,6 +240,9 @@ class MatchingService:
         - experience_match: Experience comparison
         - experience_score: Experience match score
         - semantic_score: SBERT similarity score
+
+        Pass a precomputed semantic_score (e.g. from
+        calculate_semantic_similarities) to skip per-candidate encoding.
         """
         
         # Calculate rule-based components
@@ -185,9 +258,10 @@ class MatchingService:
         rule_based_score = (skill_match + experience_score) / 2
         
         # Calculate semantic similarity
-        semantic_score = self._calculate_semantic_similarity(
-            job_description, candidate_summary
-        )
+        if semantic_score is None:
+            semantic_score = self._calculate_semantic_similarity(
+                job_description, candidate_summary
+            )
         
         # Final hybrid score
         final_score = (rule_based_score * 0.7) + (semantic_score * 0.3)
@@ -218,8 +292,9 @@ class MatchingService:
         }
     
     def clear_cache(self):
-        """Clear embedding cache to free memory"""
-        self.embedding_cache.clear()
+        """Clear the in-memory embedding cache to free memory"""
+        if self.embedding_cache is not None:
+            self.embedding_cache.clear()
         logger.info("Embedding cache cleared")
 
 
@@ -21,6 +21,7 @@ from datetime import datetime, date
 import uuid
 from app.db import Base
 from app.utils.user_agent import parse_user_agent
+from app.utils.embedding_codec import EmbeddingVector
 from sqlalchemy import UniqueConstraint   # 👈 add at top if not present
 
 def validate_candidate_job_match(candidate, job):
@@ -275,7 +276,10 @@ class Job(Base):
 
     is_active = Column(Boolean, default=True)
 
-    embedding_vector = Column(JSON, nullable=True)
+    # float32 bytes; legacy JSON values are backfilled by ensure_embedding_columns()
+    embedding_vector = Column("embedding_f32", EmbeddingVector, nullable=True)
+    embedding_model = Column(String(100), nullable=True)
+    embedding_updated_at = Column(DateTime, nullable=True)
 
     # ⭐ REQUIRED for JD Upload feature
     jd_url = Column(String)
@@ -580,7 +584,10 @@ class Candidate(Base):
     parsed_at = Column(DateTime)
     parser_version = Column(String(50))
     raw_text = Column(Text)
-    embedding_vector = Column(JSON)
+    # float32 bytes; legacy JSON values are backfilled by ensure_embedding_columns()
+    embedding_vector = Column("embedding_f32", EmbeddingVector)
+    embedding_model = Column(String(100))
+    embedding_updated_at = Column(DateTime)
     resume_versions = Column(JSON)
 
     fit_score = Column(Float)
@@ -1015,6 +1022,27 @@ class Certification(Base):
     candidate = relationship("Candidate", back_populates="certifications")
 
 
+# ============================================================
+# CANDIDATE SEARCH TERMS (normalized skills / tags / certifications)
+# ============================================================
+class CandidateTerm(Base):
+    """
+    One normalized skill, tag or certification of a candidate. Maintained by
+    app.services.candidate_terms so Resdex filters can use an index instead
+    of scanning the JSON columns.
+    """
+    __tablename__ = "candidate_terms"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    candidate_id = Column(String, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(10), nullable=False)   # skill | tag | cert
+    value = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        Index("idx_candidate_terms_kind_value", "kind", "value", "candidate_id"),
+    )
+
+
 # ============================================================
 # MARKETING SOURCE MANAGEMENT (Bulk sourcing system)
 # ============================================================
@@ -2731,6 +2759,10 @@ class SavedSearch(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_used_at = Column(DateTime, nullable=True)
+    # Newest candidate change seen by the last run ("new since last run" mode)
+    last_run_high_water = Column(DateTime, nullable=True)
+    # Candidate changes up to here have been checked for alerts
+    last_alerted_at = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
     
     # Relationships
@@ -2738,6 +2770,24 @@ class SavedSearch(Base):
     user = relationship("User")
 
 
+class SavedSearchAlertedCandidate(Base):
+    """
+    A candidate already announced by a saved-search alert. Each candidate is
+    announced once per search, however often it is edited afterwards
+    (written by app.services.saved_search_alerts).
+    """
+    __tablename__ = "saved_search_alerted_candidates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    saved_search_id = Column(String, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False)
+    candidate_id = Column(String, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
+    alerted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("saved_search_id", "candidate_id", name="uq_saved_search_alerted_candidate"),
+    )
+
+
 class Folder(Base):
     __tablename__ = "folders"
 
@@ -2765,8 +2815,10 @@ class CandidateInvite(Base):
     job_id = Column(String, ForeignKey("jobs.id"), nullable=True)
     
     # Status tracking
-    status = Column(String, default="sent")  # sent, opened, accepted, declined
+    status = Column(String, default="sent")  # queued, job_invite_sent, failed, sent, opened, accepted, declined
     message = Column(Text, nullable=True)
+    # Email carrying the invite; the outbox drain moves status off "queued"
+    outbox_id = Column(String, ForeignKey("email_outbox.id", ondelete="SET NULL"), nullable=True, index=True)
     
     # Metadata
     sent_at = Column(DateTime, default=datetime.utcnow)
@@ -2780,6 +2832,78 @@ class CandidateInvite(Base):
     job = relationship("Job")
 
 
+# ============================================================
+# OUTBOUND EMAIL (durable queue + per-candidate log)
+# ============================================================
+class EmailOutbox(Base):
+    """
+    One outbound email. Rows are written in the request transaction and
+    delivered by app.services.email_outbox, which claims due rows in batches.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    text_body = Column(Text, nullable=True)
+    html_body = Column(Text, nullable=True)
+
+    status = Column(String(20), nullable=False, default="queued")  # queued | sending | retrying | sent | failed | skipped
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = Column(String(32), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+
+    created_by = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("idx_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+        Index("idx_email_outbox_claim_token", "claim_token"),
+    )
+
+
+class CandidateEmailLog(Base):
+    """
+    One email sent to a candidate (replaces appending to Candidate.email_logs).
+    """
+    __tablename__ = "candidate_email_logs"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    candidate_id = Column(String, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
+    outbox_id = Column(String, ForeignKey("email_outbox.id", ondelete="SET NULL"), nullable=True)
+    subject = Column(String, nullable=True)
+    body = Column(Text, nullable=True)
+    sent_by = Column(String, nullable=True)
+    sent_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_candidate_email_logs_candidate_sent", "candidate_id", "sent_at"),
+    )
+
+
+class ResumeParseCache(Base):
+    """
+    Parse result of a resume file, keyed by the SHA-256 of its bytes and the
+    parser version (see app.services.resume_parse_cache).
+    """
+    __tablename__ = "resume_parse_cache"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    content_hash = Column(String(64), nullable=False)
+    parser_version = Column(String(50), nullable=False)
+    result = Column(JSON, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("content_hash", "parser_version", name="uq_resume_parse_cache_hash_version"),
+    )
+
+
 # ============================================================
 # ACTIVITY TRACKING SYSTEM
 # ============================================================
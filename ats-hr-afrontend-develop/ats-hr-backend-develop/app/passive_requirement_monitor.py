@@ -248,6 +248,54 @@ def setup_background_scheduler():
             name='Scan for passive requirements',
             replace_existing=True
         )
+
+        # Keep candidate/job embeddings fresh off the request path
+        from app.services.embedding_refresh import (
+            EMBEDDING_REFRESH_INTERVAL_MINUTES,
+            run_embedding_refresh,
+        )
+
+        scheduler.add_job(
+            func=run_embedding_refresh,
+            trigger=IntervalTrigger(minutes=EMBEDDING_REFRESH_INTERVAL_MINUTES),
+            id='embedding_refresh',
+            name='Re-embed stale candidates and jobs',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+
+        # Notify saved-search owners about newly matching candidates
+        from app.services.saved_search_alerts import (
+            SAVED_SEARCH_ALERT_INTERVAL_MINUTES,
+            run_saved_search_alert_tick,
+        )
+
+        scheduler.add_job(
+            func=run_saved_search_alert_tick,
+            trigger=IntervalTrigger(minutes=SAVED_SEARCH_ALERT_INTERVAL_MINUTES),
+            id='saved_search_alerts',
+            name='Alert saved-search owners about new matches',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+
+        # Deliver queued outbound emails (also woken right after enqueue)
+        from app.services.email_outbox import (
+            EMAIL_OUTBOX_POLL_SECONDS,
+            run_email_outbox_tick,
+        )
+
+        scheduler.add_job(
+            func=run_email_outbox_tick,
+            trigger=IntervalTrigger(seconds=EMAIL_OUTBOX_POLL_SECONDS),
+            id='email_outbox',
+            name='Deliver queued outbound emails',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
         
         scheduler.start()
         logger.info("Background scheduler started for passive requirement monitoring")
@@ -33,20 +33,12 @@ try:
 except Exception:
     phonenumbers = None
 
-_NLP = None
-
 def _get_nlp():
-    global _NLP
-    if _NLP is not None:
-        return _NLP
     if spacy is None:
-        _NLP = None
-        return _NLP
-    try:
-        _NLP = spacy.load("en_core_web_sm")
-    except Exception:
-        _NLP = None
-    return _NLP
+        return None
+    from app.services.model_registry import get_spacy
+
+    return get_spacy(("en_core_web_sm",))
 
 # ---------------------------
 # TEXT EXTRACTION
@@ -3,48 +3,23 @@ import re
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+from app.services.model_registry import SPACY_PREFERENCE, get_skill_extractor, get_spacy, model_registry
 
-@lru_cache(maxsize=1)
-def _get_spacy_nlp():
-    try:
-        import spacy
-    except Exception:
-        return None
 
-    for model_name in ("en_core_web_trf", "en_core_web_lg", "en_core_web_sm"):
-        try:
-            return spacy.load(model_name)
-        except Exception:
-            continue
-    return None
+def _get_spacy_nlp():
+    return get_spacy(SPACY_PREFERENCE)
 
 
-@lru_cache(maxsize=1)
 def _get_hf_ner():
     if str(os.getenv("ENABLE_HF_NER", "")).strip().lower() not in {"1", "true", "yes", "on"}:
         return None
-    try:
-        from transformers import pipeline
-    except Exception:
-        return None
-    try:
-        return pipeline("ner", model="dslim/bert-base-NER", aggregation_strategy="simple")
-    except Exception:
-        return None
+    return model_registry.get("hf:ner")
 
 
-@lru_cache(maxsize=1)
 def _get_hf_zero_shot():
     if str(os.getenv("ENABLE_HF_ZERO_SHOT", "")).strip().lower() not in {"1", "true", "yes", "on"}:
         return None
-    try:
-        from transformers import pipeline
-    except Exception:
-        return None
-    try:
-        return pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-    except Exception:
-        return None
+    return model_registry.get("hf:zero_shot")
 
 
 @lru_cache(maxsize=1)
@@ -57,22 +32,8 @@ def _get_pyresparser():
         return None
 
 
-@lru_cache(maxsize=1)
 def _get_skill_extractor():
-    try:
-        from skillextractor.named_entity_recognition_scorer import SkillExtractor
-        from skillextractor.base import SKILL_DB
-        from spacy.matcher import PhraseMatcher
-    except Exception:
-        return None
-
-    nlp = _get_spacy_nlp()
-    if nlp is None:
-        return None
-    try:
-        return SkillExtractor(nlp, SKILL_DB, PhraseMatcher)
-    except Exception:
-        return None
+    return get_skill_extractor(SPACY_PREFERENCE)
 
 
 def _normalize_skills(skills: List[Any]) -> List[str]:
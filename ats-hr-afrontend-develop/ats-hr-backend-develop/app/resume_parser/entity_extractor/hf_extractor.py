@@ -1,20 +1,13 @@
-from functools import lru_cache
 import os
 from typing import Dict, List
 
+from app.services.model_registry import model_registry
+
 
-@lru_cache(maxsize=1)
 def _get_ner():
     if str(os.getenv("ENABLE_HF_NER", "")).strip().lower() not in {"1", "true", "yes", "on"}:
         return None
-    try:
-        from transformers import pipeline
-    except Exception:
-        return None
-    try:
-        return pipeline("ner", model="dslim/bert-base-NER", aggregation_strategy="simple")
-    except Exception:
-        return None
+    return model_registry.get("hf:ner")
 
 
 def extract_entities_hf(text: str) -> List[Dict]:
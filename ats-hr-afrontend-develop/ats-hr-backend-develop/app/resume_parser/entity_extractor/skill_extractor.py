@@ -1,23 +1,10 @@
-from functools import lru_cache
 from typing import Dict, List
 
+from app.services.model_registry import SPACY_NAME_PREFERENCE, get_skill_extractor
+
 
-@lru_cache(maxsize=1)
 def _get_skill_extractor():
-    try:
-        from skillextractor.named_entity_recognition_scorer import SkillExtractor
-        from skillextractor.base import SKILL_DB
-        from spacy.matcher import PhraseMatcher
-        import spacy
-    except Exception:
-        return None
-    for model in ("en_core_web_lg", "en_core_web_sm"):
-        try:
-            nlp = spacy.load(model)
-            return SkillExtractor(nlp, SKILL_DB, PhraseMatcher)
-        except Exception:
-            continue
-    return None
+    return get_skill_extractor(SPACY_NAME_PREFERENCE)
 
 
 def extract_skills_cogito(text: str) -> List[Dict]:
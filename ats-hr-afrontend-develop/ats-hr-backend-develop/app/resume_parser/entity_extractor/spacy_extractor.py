@@ -1,19 +1,10 @@
-from functools import lru_cache
 from typing import Dict, List
 
+from app.services.model_registry import SPACY_PREFERENCE, get_spacy
+
 
-@lru_cache(maxsize=1)
 def _get_nlp():
-    try:
-        import spacy
-    except Exception:
-        return None
-    for model in ("en_core_web_trf", "en_core_web_lg", "en_core_web_sm"):
-        try:
-            return spacy.load(model)
-        except Exception:
-            continue
-    return None
+    return get_spacy(SPACY_PREFERENCE)
 
 
 def extract_entities_spacy(text: str) -> Dict[str, List[str]]:
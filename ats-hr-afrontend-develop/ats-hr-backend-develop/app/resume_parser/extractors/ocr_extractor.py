@@ -1,4 +1,16 @@
-from typing import List
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+# Pages are rasterized and OCR'd one at a time on a small pool; each worker
+# drives its own pdftoppm/tesseract subprocess, so only OCR_WORKERS page
+# images are ever in memory. OCR stops once OCR_TARGET_CHARS of text is read.
+# Resume parse pool workers set OCR_WORKERS to 1 (see resume_parse_pool), so
+# parallelism comes from the processes and pipelines do not multiply.
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "20"))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_TARGET_CHARS = int(os.getenv("OCR_TARGET_CHARS", "12000"))
 
 
 def _prepare_image(image):
@@ -11,17 +23,23 @@ def _prepare_image(image):
     return img
 
 
+def _ocr_image(image) -> str:
+    import pytesseract
+
+    prepared = _prepare_image(image)
+    return pytesseract.image_to_string(prepared, lang="eng", config="--psm 6") or ""
+
+
 def extract_text_from_images(images: List) -> str:
     try:
-        import pytesseract
+        import pytesseract  # noqa: F401
     except Exception:
         return ""
 
     chunks = []
     for image in images:
         try:
-            prepared = _prepare_image(image)
-            text = pytesseract.image_to_string(prepared, lang="eng", config="--psm 6")
+            text = _ocr_image(image)
             if text and text.strip():
                 chunks.append(text)
         except Exception:
@@ -29,20 +47,73 @@ def extract_text_from_images(images: List) -> str:
     return "\n".join(chunks).strip()
 
 
-def extract_pdf_with_ocr(file_path: str, dpi: int = 300, max_pages: int = 20) -> str:
+def _ocr_pdf_page(file_path: str, page: int, dpi: int) -> str:
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(file_path, dpi=dpi, first_page=page, last_page=page)
     try:
-        from pdf2image import convert_from_path
+        return _ocr_image(images[0]) if images else ""
+    finally:
+        for image in images:
+            image.close()
+
+
+def _pdf_page_count(file_path: str) -> Optional[int]:
+    from pdf2image import pdfinfo_from_path
+
+    try:
+        return int(pdfinfo_from_path(file_path).get("Pages") or 0)
     except Exception:
-        return ""
+        return None
 
+
+def extract_pdf_with_ocr(
+    file_path: str,
+    dpi: int = 300,
+    max_pages: int = OCR_MAX_PAGES,
+    workers: Optional[int] = None,
+    target_chars: int = OCR_TARGET_CHARS,
+) -> str:
     try:
-        pages = convert_from_path(file_path, dpi=dpi)
+        import pdf2image  # noqa: F401
+        import pytesseract  # noqa: F401
     except Exception:
         return ""
 
-    if not pages:
+    page_count = _pdf_page_count(file_path)
+    if not page_count:
         return ""
-    return extract_text_from_images(pages[:max_pages])
+    last_page = min(page_count, max_pages)
+    workers = max(1, min(OCR_WORKERS if workers is None else workers, last_page))
+
+    # Pages are consumed in order; at most `workers` are rasterized/in flight
+    chunks: List[str] = []
+    collected = 0
+    next_page = 1
+    pending = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+    try:
+        while next_page <= last_page and len(pending) < workers:
+            pending.append(pool.submit(_ocr_pdf_page, file_path, next_page, dpi))
+            next_page += 1
+
+        while pending:
+            try:
+                text = pending.popleft().result()
+            except Exception:
+                text = ""
+            if text and text.strip():
+                chunks.append(text)
+                collected += len(text.strip())
+            if target_chars and collected >= target_chars:
+                break
+            if next_page <= last_page:
+                pending.append(pool.submit(_ocr_pdf_page, file_path, next_page, dpi))
+                next_page += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return "\n".join(chunks).strip()
 
 
 def extract_image_file_text(file_path: str) -> str:
@@ -56,4 +127,3 @@ def extract_image_file_text(file_path: str) -> str:
     except Exception:
         return ""
     return extract_text_from_images([image])
-
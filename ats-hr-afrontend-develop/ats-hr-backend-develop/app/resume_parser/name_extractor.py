@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 
+from app.services.model_registry import SPACY_NAME_PREFERENCE, get_spacy
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,17 +20,11 @@ class NameExtractor:
     """
     
     def __init__(self):
-        """Initialize name extractor with NLP model if available"""
-        self.nlp = None
-        try:
-            import spacy
-            try:
-                self.nlp = spacy.load("en_core_web_lg")
-            except Exception:
-                # Fall back to smaller model if large is not installed.
-                self.nlp = spacy.load("en_core_web_sm")
-        except Exception as e:
-            logger.warning(f"spaCy model not loaded: {e}. NER strategy will be skipped.")
+        """Initialize name extractor with the shared NLP model if available"""
+        # Large model preferred, small one as fallback; loaded once per process
+        self.nlp = get_spacy(SPACY_NAME_PREFERENCE)
+        if self.nlp is None:
+            logger.warning("spaCy model not loaded. NER strategy will be skipped.")
         
         # Common false positive patterns
         self.job_keywords = {
@@ -79,6 +79,16 @@ ROLE_NOISE_KEYWORDS = {
 }
 
 
+def get_resume_parser() -> "ResumeParser":
+    """
+    The process-wide parser instance (extractors are stateless after init,
+    so one instance serves every request and thread).
+    """
+    from app.services.model_registry import model_registry
+
+    return model_registry.get("resume_parser") or ResumeParser()
+
+
 class ResumeParser:
     """Main parser."""
 
@@ -8,7 +8,7 @@ import logging
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import List
 
-from .parser import ResumeParser
+from .parser import get_resume_parser
 from .models import ResumeParseResponse
 from .text_extractor import extract_text_from_file, clean_extracted_text
 
@@ -107,7 +107,7 @@ async def parse_single_resume(file: UploadFile = File(...)) -> ResumeParseRespon
             raw_text = clean_extracted_text(raw_text)
             
             # Parse resume
-            parser = ResumeParser()
+            parser = get_resume_parser()
             result = parser.parse(raw_text, file.filename)
             
             logger.info(f"Resume parsing completed: {result.status}")
@@ -212,7 +212,7 @@ async def parse_bulk_resumes(files: List[UploadFile] = File(...)):
                     raw_text = extract_text_from_file(temp_file.name, file_ext)
                     raw_text = clean_extracted_text(raw_text)
                     
-                    parser = ResumeParser()
+                    parser = get_resume_parser()
                     result = parser.parse(raw_text, file.filename)
                     
                     results.append({
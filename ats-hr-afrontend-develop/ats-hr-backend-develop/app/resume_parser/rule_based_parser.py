@@ -179,17 +179,19 @@ ALLOWED_MIME_PREFIXES = (
 )
 
 
-@lru_cache(maxsize=1)
-def _get_minilm():
-    from sentence_transformers import SentenceTransformer
+def _encode_normalized(texts: List[str]):
+    # Shared MiniLM instance and micro-batcher instead of a parser-local model
+    import numpy as np
+
+    from app.services.embedding_service import embedding_service
 
-    return SentenceTransformer("all-MiniLM-L6-v2")
+    vectors = embedding_service.encode(texts)
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-8)
 
 
 @lru_cache(maxsize=1)
 def _skill_embeddings():
-    model = _get_minilm()
-    return model.encode(SKILL_LIST, convert_to_tensor=True)
+    return _encode_normalized(SKILL_LIST)
 
 
 def _detect_mime(file_path: str) -> str:
@@ -586,18 +588,15 @@ def _normalize_skills_semantic(candidates: List[str], threshold: float = 0.75) -
         return []
 
     try:
-        model = _get_minilm()
-        from sentence_transformers import util
-
         skill_embeds = _skill_embeddings()
-        cand_embeds = model.encode(candidates, convert_to_tensor=True)
-        cos = util.cos_sim(cand_embeds, skill_embeds)
+        cand_embeds = _encode_normalized(candidates)
+        cos = cand_embeds @ skill_embeds.T
 
         normalized: List[str] = []
         for idx, candidate in enumerate(candidates):
             row = cos[idx]
-            best_idx = int(row.argmax().item())
-            best_score = float(row[best_idx].item())
+            best_idx = int(row.argmax())
+            best_score = float(row[best_idx])
             if best_score >= threshold:
                 normalized.append(SKILL_LIST[best_idx])
                 continue
@@ -816,15 +815,16 @@ def _semantic_match_score(resume_text: str, job_description: str) -> float:
     if not resume_text or not job_description:
         return 0.0
     try:
-        model = _get_minilm()
-        from sentence_transformers import util
-
-        emb = model.encode([resume_text, job_description], convert_to_tensor=True)
-        return float(util.cos_sim(emb[0], emb[1]).item())
+        emb = _encode_normalized([resume_text, job_description])
+        return float(emb[0] @ emb[1])
     except Exception:
         return 0.0
 
 
+# Bump when parser changes alter the output: cached parse results are keyed on it
+PARSER_VERSION = "v1"
+
+
 def _build_canonical_payload(text: str, extraction_method: str, job_description: str = "") -> Dict[str, Any]:
     lines = _split_lines(text)
     sections = _detect_sections(lines)
@@ -874,7 +874,7 @@ def _build_canonical_payload(text: str, extraction_method: str, job_description:
         "summary": summary,
         "raw_text": text,
         "extraction_method": extraction_method,
-        "parser_version": "v1",
+        "parser_version": PARSER_VERSION,
         "confidence": {
             "personal": round(c_personal, 2),
             "professional": round(c_prof, 2),
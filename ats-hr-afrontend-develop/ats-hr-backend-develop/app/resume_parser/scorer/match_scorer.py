@@ -1,6 +1,5 @@
 import math
 import re
-from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Set
 
 
@@ -56,24 +55,23 @@ def _education_level(value: Any) -> int:
     return 0
 
 
-@lru_cache(maxsize=1)
-def _get_sentence_transformer():
+def _get_embedding_service():
     try:
-        from sentence_transformers import SentenceTransformer
+        from app.services.embedding_service import embedding_service
 
-        return SentenceTransformer("all-MiniLM-L6-v2")
+        return embedding_service if embedding_service.available else None
     except Exception:
         return None
 
 
 def _semantic_score(resume_text: str, job_text: str) -> float:
-    model = _get_sentence_transformer()
-    if model is not None:
+    service = _get_embedding_service()
+    if service is not None:
         try:
-            from sentence_transformers import util
+            import numpy as np
 
-            embeddings = model.encode([resume_text, job_text], convert_to_tensor=True)
-            score = float(util.cos_sim(embeddings[0], embeddings[1]).item())
+            a, b = service.encode([resume_text, job_text])
+            score = float(a @ b / ((np.linalg.norm(a) * np.linalg.norm(b)) + 1e-8))
             return max(0.0, min(1.0, score))
         except Exception:
             pass
@@ -1,6 +1,7 @@
-from functools import lru_cache
 from typing import Dict, List, Tuple
 
+from app.services.model_registry import model_registry
+
 SECTION_KEYWORDS = {
     "PERSONAL_INFO": ["contact", "personal", "about", "profile", "details"],
     "SUMMARY": ["summary", "objective", "overview", "about me"],
@@ -13,16 +14,8 @@ SECTION_KEYWORDS = {
 }
 
 
-@lru_cache(maxsize=1)
 def _get_zero_shot_classifier():
-    try:
-        from transformers import pipeline
-    except Exception:
-        return None
-    try:
-        return pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-    except Exception:
-        return None
+    return model_registry.get("hf:zero_shot")
 
 
 def _split_blocks(text: str) -> List[str]:
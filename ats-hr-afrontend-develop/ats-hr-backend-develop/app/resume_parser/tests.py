@@ -400,7 +400,29 @@ class TestUtilityExtractors:
         assert "germany" not in normalized
         assert "india" not in normalized
         assert all(not re.fullmatch(r"(19|20)\d{2}", skill.lower()) for skill in result)
-    
+
+    def test_skills_matcher_boundaries_and_section_attribution(self):
+        """Alias hits respect word boundaries and score by the section they fall in."""
+        from .utility_extractors import SkillsExtractor
+
+        extractor = SkillsExtractor()
+        matches = extractor._alias_matcher.find("sap fico, node.js and concats c++")
+        found = {canonical for _, _, canonical in matches}
+        assert {"SAP FICO", "Node.js", "C++"} <= found
+        assert "SAP CATS" not in found
+
+        scored = {}
+        text = "Skills\nPython\n\nExperience\nBuilt Docker images\n\nEducation\nB.Tech, used SQL"
+        extractor._collect_skills(
+            text,
+            [
+                ("skills_section", extractor._find_section_spans(text, extractor.SKILL_SECTION_HEADERS)),
+                ("experience_section", extractor._find_section_spans(text, extractor.EXPERIENCE_SECTION_HEADERS)),
+            ],
+            scored,
+        )
+        assert scored == {"Python": 95, "Docker": 82, "SQL": 74}
+
     def test_experience_calculation(self):
         """Test experience calculation"""
         from .utility_extractors import ExperienceCalculator
@@ -422,5 +444,36 @@ class TestUtilityExtractors:
         assert ("2" in result2 and "3" in result2)
 
 
+class TestOcrExtractor:
+    """Test page-by-page PDF OCR"""
+
+    def test_pages_are_capped_and_ocr_stops_early(self, monkeypatch):
+        import sys
+        import types
+
+        from .extractors import ocr_extractor
+
+        # The page OCR itself is stubbed; only the import guard needs the modules
+        for name in ("pdf2image", "pytesseract"):
+            monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+        seen = []
+
+        def fake_page(file_path, page, dpi):
+            seen.append(page)
+            return "" if page == 2 else f"page {page} " + "x" * 100
+
+        monkeypatch.setattr(ocr_extractor, "_pdf_page_count", lambda path: 50)
+        monkeypatch.setattr(ocr_extractor, "_ocr_pdf_page", fake_page)
+
+        text = ocr_extractor.extract_pdf_with_ocr("scan.pdf", max_pages=5, workers=2, target_chars=0)
+        assert sorted(seen) == [1, 2, 3, 4, 5]
+        assert text.startswith("page 1") and "page 3" in text and "page 5" in text
+
+        seen.clear()
+        text = ocr_extractor.extract_pdf_with_ocr("scan.pdf", max_pages=20, workers=1, target_chars=200)
+        assert seen == [1, 2, 3]
+        assert "page 3" in text and "page 4" not in text
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -3,7 +3,8 @@ Utility extractors for contact info, education, skills, and experience.
 """
 
 import re
-from typing import Dict, List, Optional, Set, Tuple
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -315,6 +316,71 @@ class EducationExtractor:
         return None
 
 
+class _AliasAutomaton:
+    """
+    Aho-Corasick automaton over normalized skill aliases.
+
+    One left-to-right pass reports every alias occurrence (overlapping ones
+    included) as ``(start, end, canonical)``. A hit only counts when it is not
+    glued to an ASCII letter/digit on either side, which is what the former
+    per-alias ``(?<![A-Za-z0-9])...(?![A-Za-z0-9])`` patterns checked.
+    """
+
+    _ALNUM = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+
+    def __init__(self, aliases: Dict[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[int, str], ...]] = [()]
+
+        for alias, canonical in aliases.items():
+            if not alias:
+                continue
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += ((len(alias), canonical),)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        goto, fail, out, alnum = self._goto, self._fail, self._out, self._ALNUM
+        size = len(text)
+        matches: List[Tuple[int, int, str]] = []
+        state = 0
+        for index, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = index + 1
+            if end < size and text[end] in alnum:
+                continue
+            for length, canonical in out[state]:
+                start = end - length
+                if start == 0 or text[start - 1] not in alnum:
+                    matches.append((start, end, canonical))
+        return matches
+
+
 class SkillsExtractor:
     """Extract only recruiter-searchable professional skills."""
 
@@ -585,10 +651,14 @@ class SkillsExtractor:
         "testing",
     }
 
+    EXPERIENCE_SECTION_HEADERS = {"experience", "work experience", "professional experience"}
+
     def __init__(self):
         self._all_canonical_skills = self._build_canonical_skills()
         self._alias_to_skill = self._build_alias_map()
-        self._alias_patterns = self._build_alias_patterns()
+        self._alias_matcher = _AliasAutomaton(self._alias_to_skill)
+        self._containment = self._build_containment_table()
+        self._section_patterns: Dict[FrozenSet[str], re.Pattern] = {}
 
     def extract(self, text: str) -> List[str]:
         """Extract strict, industry-recognized skills with confidence threshold."""
@@ -598,17 +668,19 @@ class SkillsExtractor:
 
         scored: Dict[str, int] = {}
 
-        for section in self._find_sections(clean_text, self.SKILL_SECTION_HEADERS):
-            self._collect_skills(section, "skills_section", scored)
-            for candidate in self._tokenize_section_items(section):
+        skill_spans = self._find_section_spans(clean_text, self.SKILL_SECTION_HEADERS)
+        for start, end in skill_spans:
+            for candidate in self._tokenize_section_items(clean_text[start:end]):
                 canonical = self._canonicalize_token(candidate)
                 if canonical:
                     scored[canonical] = max(scored.get(canonical, 0), self.SOURCE_CONFIDENCE["skills_section"])
 
-        for section in self._find_sections(clean_text, {"experience", "work experience", "professional experience"}):
-            self._collect_skills(section, "experience_section", scored)
-
-        self._collect_skills(clean_text, "full_text", scored)
+        experience_spans = self._find_section_spans(clean_text, self.EXPERIENCE_SECTION_HEADERS)
+        self._collect_skills(
+            clean_text,
+            [("skills_section", skill_spans), ("experience_section", experience_spans)],
+            scored,
+        )
 
         return self._finalize(scored)
 
@@ -639,35 +711,61 @@ class SkillsExtractor:
 
         return alias_map
 
-    def _build_alias_patterns(self) -> List[Tuple[str, re.Pattern]]:
-        patterns: List[Tuple[str, re.Pattern]] = []
-        seen: Set[Tuple[str, str]] = set()
-        for alias_key, canonical in self._alias_to_skill.items():
-            if not alias_key or (canonical, alias_key) in seen:
-                continue
-            seen.add((canonical, alias_key))
-            token = re.escape(alias_key).replace(r"\ ", r"\s+")
-            pattern = re.compile(rf"(?<![A-Za-z0-9]){token}(?![A-Za-z0-9])", re.IGNORECASE)
-            patterns.append((canonical, pattern))
-        return patterns
-
-    def _find_sections(self, text: str, headers: Set[str]) -> List[str]:
+    def _build_containment_table(self) -> Dict[str, FrozenSet[str]]:
+        """For every catalog skill key, the other catalog keys it contains as whole words."""
+        keys = {self._normalize_skill_key(skill) for skill in self._all_canonical_skills}
+        keys.discard("")
+        contained: Dict[str, Set[str]] = {key: set() for key in keys}
+        for inner in keys:
+            pattern = re.compile(rf"\b{re.escape(inner)}\b")
+            for outer in keys:
+                if outer != inner and pattern.search(outer):
+                    contained[outer].add(inner)
+        return {key: frozenset(inners) for key, inners in contained.items()}
+
+    def _key_contains(self, outer: str, inner: str) -> bool:
+        known = self._containment.get(outer)
+        if known is not None and inner in self._containment:
+            return inner == outer or inner in known
+        return re.search(rf"\b{re.escape(inner)}\b", outer) is not None
+
+    def _find_section_spans(self, text: str, headers: Set[str]) -> List[Tuple[int, int]]:
         if not text:
             return []
-        header_re = "|".join(re.escape(header) for header in sorted(headers))
-        stop_re = "|".join(re.escape(header) for header in sorted(self.STOP_SECTION_HEADERS))
-        pattern = re.compile(
-            rf"(?:^|\n)\s*(?:{header_re})\s*:?\s*(?:\n|$)(.+?)(?=\n\s*(?:{stop_re})\s*:?\s*(?:\n|$)|\Z)",
-            re.IGNORECASE | re.DOTALL,
-        )
-        return [m.group(1) for m in pattern.finditer(text)]
+        key = frozenset(headers)
+        pattern = self._section_patterns.get(key)
+        if pattern is None:
+            header_re = "|".join(re.escape(header) for header in sorted(headers))
+            stop_re = "|".join(re.escape(header) for header in sorted(self.STOP_SECTION_HEADERS))
+            pattern = re.compile(
+                rf"(?:^|\n)\s*(?:{header_re})\s*:?\s*(?:\n|$)(.+?)(?=\n\s*(?:{stop_re})\s*:?\s*(?:\n|$)|\Z)",
+                re.IGNORECASE | re.DOTALL,
+            )
+            self._section_patterns[key] = pattern
+        return [m.span(1) for m in pattern.finditer(text)]
 
-    def _collect_skills(self, text: str, source: str, scored: Dict[str, int]) -> None:
-        confidence = self.SOURCE_CONFIDENCE.get(source, 70)
-        lowered = self._normalize_skill_key(text)
-        for canonical, pattern in self._alias_patterns:
-            if pattern.search(lowered):
-                scored[canonical] = max(scored.get(canonical, 0), confidence)
+    def _find_sections(self, text: str, headers: Set[str]) -> List[str]:
+        return [text[start:end] for start, end in self._find_section_spans(text, headers)]
+
+    def _collect_skills(
+        self,
+        text: str,
+        sections: List[Tuple[str, List[Tuple[int, int]]]],
+        scored: Dict[str, int],
+    ) -> None:
+        """
+        Score every alias hit in one pass over ``text``. A hit inside one of the
+        ``(source, spans)`` sections gets that source's confidence, else full_text.
+        """
+        lowered, offsets = self._normalize_skill_key_with_offsets(text)
+        default = self.SOURCE_CONFIDENCE["full_text"]
+        for start, end, canonical in self._alias_matcher.find(lowered):
+            first, last = offsets[start], offsets[end - 1]
+            confidence = default
+            for source, spans in sections:
+                if any(lo <= first and last < hi for lo, hi in spans):
+                    confidence = max(confidence, self.SOURCE_CONFIDENCE.get(source, 70))
+            scored[canonical] = max(scored.get(canonical, 0), confidence)
 
     def _tokenize_section_items(self, text: str) -> List[str]:
         candidates: List[str] = []
@@ -715,6 +813,35 @@ class SkillsExtractor:
         text = re.sub(r"\s+", " ", text)
         return text.strip()
 
+    def _normalize_skill_key_with_offsets(self, value: str) -> Tuple[str, List[int]]:
+        """``_normalize_skill_key`` that also maps each output character to its index in ``value``."""
+        text = str(value or "")
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            pairs = enumerate(lowered)
+        else:  # a character lowercased into several (e.g. "İ")
+            pairs = ((index, ch) for index, raw in enumerate(text) for ch in raw.lower())
+        chars: List[str] = []
+        offsets: List[int] = []
+        for index, ch in pairs:
+            if ch == "&":
+                piece = " and "
+            elif ch == "/":
+                piece = " / "
+            elif ch.isalnum() or ch in "_#+.-":
+                piece = ch
+            else:
+                piece = " "
+            for out in piece:
+                if out == " " and (not chars or chars[-1] == " "):
+                    continue
+                chars.append(out)
+                offsets.append(index)
+        if chars and chars[-1] == " ":
+            chars.pop()
+            offsets.pop()
+        return "".join(chars), offsets
+
     def _is_rejected_token(self, token: str) -> bool:
         raw = str(token or "").strip()
         if not raw:
@@ -753,20 +880,21 @@ class SkillsExtractor:
         }
         ordered = sorted(filtered.keys(), key=lambda skill: (-filtered[skill], -len(skill), skill.lower()))
 
+        keys = {skill: self._normalize_skill_key(skill) for skill in ordered}
         deduped: List[str] = []
         for skill in ordered:
-            key = self._normalize_skill_key(skill)
+            key = keys[skill]
             replaced = False
             for idx, existing in enumerate(deduped):
-                existing_key = self._normalize_skill_key(existing)
+                existing_key = keys[existing]
                 if key == existing_key:
                     replaced = True
                     break
-                if re.search(rf"\b{re.escape(existing_key)}\b", key) and len(key) > len(existing_key):
+                if len(key) > len(existing_key) and self._key_contains(key, existing_key):
                     deduped[idx] = skill
                     replaced = True
                     break
-                if re.search(rf"\b{re.escape(key)}\b", existing_key) and len(existing_key) >= len(key):
+                if len(existing_key) >= len(key) and self._key_contains(existing_key, key):
                     replaced = True
                     break
             if not replaced:
@@ -11,11 +11,12 @@ from app.db import get_db
 from app import models, schemas
 from app.auth import get_current_user
 from app.ai_core import generate_candidate_embedding
-from app.resume_parser import parse_resume as parse_resume_file
 from app.resume_parser.text_extractor import extract_text_from_file, clean_extracted_text
 from app.models import Notification
 from app.schemas import NotificationResponse
 from app.services.activity_service import ActivityService
+from app.services.email_outbox import candidate_email_history
+from app.services.resume_parse_cache import content_sha256, parse_resume_cached
 from app.validators import (
     validate_location,
     validate_pincode,
@@ -142,7 +143,7 @@ def parse_resume_only(
             text = file_bytes.decode("latin-1", "ignore")
     text = clean_extracted_text(text)
 
-    parsed_result = parse_resume_file(filepath) or {}
+    parsed_result = parse_resume_cached(db, filepath, digest=content_sha256(file_bytes))
     parsed = parsed_result.get("data") if isinstance(parsed_result, dict) else {}
     if not isinstance(parsed, dict):
         parsed = {}
@@ -193,6 +194,7 @@ def get_my_profile(
 
     data = schemas.CandidateResponse.model_validate(cand).model_dump()
     data["profile_strength_percentage"] = completion
+    data["email_logs"] = candidate_email_history(db, cand.id)
 
     return {
         "message": "success",
@@ -436,7 +438,7 @@ def upload_resume(
             text = file_bytes.decode("latin-1", "ignore")
     text = clean_extracted_text(text)
 
-    parsed_result = parse_resume_file(filepath) or {}
+    parsed_result = parse_resume_cached(db, filepath, digest=content_sha256(file_bytes))
     parsed = parsed_result.get("data") if isinstance(parsed_result, dict) else {}
     if not isinstance(parsed, dict):
         parsed = {}
@@ -21,7 +21,7 @@ import asyncio
 
 from fastapi.responses import FileResponse, StreamingResponse
 
-from sqlalchemy import func, String, cast, or_, and_
+from sqlalchemy import func, String, cast, or_, and_, insert
 
 from sqlalchemy.exc import IntegrityError
 
@@ -52,7 +52,8 @@ from app.ai_core import (
 
 )
 
-from app.resume_parser import parse_resume as parse_resume_file
+from app.services.resume_parse_cache import content_sha256, get_cached_parses, parse_resume_cached, store_parses
+from app.services.resume_parse_pool import resume_parse_pool
 
 from app.auth import get_current_user
 
@@ -86,6 +87,8 @@ from app.utils.candidate_bulk_upload import (
 
 from app.models import SystemSettings
 from app.task_queue import task_queue, get_task_status, TaskStatus
+from app.services.candidate_rows import load_candidate_rows
+from app.services.email_outbox import enqueue_email, outbox_status, wake_outbox_worker
 
 
 
@@ -99,6 +102,9 @@ BULK_UPLOAD_DIR = "uploads/bulk_uploads"
 
 ERRORS_DIR = os.path.join(BULK_UPLOAD_DIR, "errors")
 
+# Parse results written to the resume parse cache per round-trip
+PARSE_CACHE_STORE_BATCH = 25
+
 os.makedirs(ERRORS_DIR, exist_ok=True)
 
 LOCK_RELEASE_STATUSES = {
@@ -1428,7 +1434,7 @@ async def search_candidates(
 
         # Apply pagination
 
-        candidates = query.offset(offset).limit(limit).all()
+        candidates = load_candidate_rows(query.offset(offset).limit(limit))
 
         
 
@@ -1573,7 +1579,7 @@ async def manual_add_candidate(
 
     # 3️⃣ Parse Resume
 
-    parse_result = parse_resume_file(file_path) or {}
+    parse_result = parse_resume_cached(db, file_path)
 
     parsed = parse_result.get("data", {}) if parse_result.get("success") else {}
 
@@ -2761,7 +2767,11 @@ async def bulk_email(
 
 
 
-    candidates = db.query(models.Candidate).filter(models.Candidate.id.in_(candidate_ids)).all()
+    candidates = (
+        db.query(models.Candidate.id, models.Candidate.email)
+        .filter(models.Candidate.id.in_(candidate_ids))
+        .all()
+    )
 
     if not candidates:
 
@@ -2769,46 +2779,68 @@ async def bulk_email(
 
 
 
+    # Each email is an outbox row plus one indexed log row per candidate;
+    # the outbox worker delivers them in batches after the commit
     sent = []
-
-
+    message_ids = []
+    logs = []
+    now = datetime.utcnow()
 
     for c in candidates:
 
-        logs = c.email_logs or []
+        if not c.email:
+            continue
 
+        outbox = enqueue_email(db, c.email, subject, text=message_body, created_by=current_user["id"])
         logs.append({
-
+            "id": models.generate_uuid(),
+            "candidate_id": c.id,
+            "outbox_id": outbox.id,
             "subject": subject,
-
             "body": message_body,
-
-            "sent_at": datetime.utcnow().isoformat(),
-
-            "sent_by": current_user["id"]
-
+            "sent_by": current_user["id"],
+            "sent_at": now,
         })
-
-        c.email_logs = logs
-
         sent.append(c.email)
+        message_ids.append(outbox.id)
 
-
+    db.flush()
+    if logs:
+        db.execute(insert(models.CandidateEmailLog.__table__), logs)
 
     db.commit()
+    wake_outbox_worker()
 
 
 
     return {
 
-        "message": "Emails successfully sent",
+        "message": "Emails queued for delivery",
+
+        "sent_to": sent,
 
-        "sent_to": sent
+        "message_ids": message_ids
 
     }
 
 
 
+@router.get("/email/status")
+@require_permission("candidates", "view")
+async def bulk_email_status(
+    message_ids: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Delivery status of emails queued by /email/send (comma-separated ids)."""
+    allow_user(current_user)
+
+    ids = [m.strip() for m in (message_ids or "").split(",") if m.strip()][:200]
+    results = outbox_status(db, ids)
+    return {"count": len(results), "results": results}
+
+
+
 
 
 @router.get("/{candidate_id}/resume/download")
@@ -3723,7 +3755,7 @@ async def upload_resume(
     with open(path, 'wb') as f:
         f.write(await file.read())
 
-    parsed = parse_resume_file(path) or {}
+    parsed = parse_resume_cached(db, path)
     data = parsed.get('data') if isinstance(parsed, dict) else parsed
     if not isinstance(data, dict):
         raise HTTPException(400, 'Failed to parse resume')
@@ -3827,6 +3859,7 @@ async def upload_resume(
 async def reparse_candidate_resume(
     candidate_id: str,
     overwrite_mode: str = Query("smart", regex="^(smart|force)$"),
+    force_reparse: bool = Query(False),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -3841,7 +3874,7 @@ async def reparse_candidate_resume(
     if not resume_path:
         raise HTTPException(404, "Resume file not found for this candidate")
 
-    parsed = parse_resume_file(resume_path) or {}
+    parsed = parse_resume_cached(db, resume_path, force=force_reparse)
     data = parsed.get("data") if isinstance(parsed, dict) else parsed
     if not isinstance(data, dict):
         raise HTTPException(400, "Failed to parse resume")
@@ -3927,7 +3960,7 @@ async def bulk_resume_upload(
         try:
             with open(path, 'wb') as f:
                 f.write(await file.read())
-            parsed = parse_resume_file(path) or {}
+            parsed = parse_resume_cached(db, path)
             data = parsed.get('data') if isinstance(parsed, dict) else parsed
             if not isinstance(data, dict):
                 raise ValueError('parse failed')
@@ -4165,7 +4198,7 @@ async def upload_resume(
     with open(path, 'wb') as f:
         f.write(await file.read())
 
-    parsed = parse_resume_file(path) or {}
+    parsed = parse_resume_cached(db, path)
     data = parsed.get('data') if isinstance(parsed, dict) else parsed
     if not isinstance(data, dict):
         raise HTTPException(400, 'Failed to parse resume')
@@ -4285,7 +4318,7 @@ async def bulk_resume_upload(
         try:
             with open(path, 'wb') as f:
                 f.write(await file.read())
-            parsed = parse_resume_file(path) or {}
+            parsed = parse_resume_cached(db, path)
             data = parsed.get('data') if isinstance(parsed, dict) else parsed
             if not isinstance(data, dict):
                 raise ValueError('parse failed')
@@ -4395,27 +4428,62 @@ async def _process_bulk_resume_upload_async(
     task_id: str,
     files_payload: List[dict],
     duplicate_option: str,
+    force_reparse: bool = False,
 ) -> None:
     db = SessionLocal()
     try:
         task_queue.update_task_progress(task_id, 1, TaskStatus.PROCESSING)
         os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-        results = []
-        success = failed = duplicates = updated = 0
         total = len(files_payload)
+        results = [None] * total
+        success = failed = duplicates = updated = 0
 
-        for index, payload in enumerate(files_payload, start=1):
+        staged = []
+        for payload in files_payload:
             original_name = payload.get("filename") or "resume.pdf"
             safe_name = f"{uuid.uuid4().hex}_{original_name}"
             path = os.path.join(UPLOAD_DIR, safe_name)
+            content = payload.get("content") or b""
+            with open(path, "wb") as f:
+                f.write(content)
+            staged.append((original_name, safe_name, path, content_sha256(content)))
+
+        # Files parsed before come from the cache (one lookup, off the event
+        # loop); the rest run on the worker pool and arrive as they finish
+        cached = {}
+        if not force_reparse:
+            hits = await asyncio.to_thread(get_cached_parses, db, [digest for *_, digest in staged])
+            cached = {
+                position: hits[digest]
+                for position, (*_, digest) in enumerate(staged)
+                if digest in hits
+            }
+
+        async def parsed_files():
+            for position, parsed in cached.items():
+                yield position, parsed, None
+            to_store = []
+            async for position, parsed, parse_error in resume_parse_pool.parse_stream(
+                (i, path) for i, (_, _, path, _) in enumerate(staged) if i not in cached
+            ):
+                if parse_error is None:
+                    to_store.append((staged[position][3], parsed))
+                    if len(to_store) >= PARSE_CACHE_STORE_BATCH:
+                        await asyncio.to_thread(store_parses, db, to_store)
+                        to_store = []
+                yield position, parsed, parse_error
+            if to_store:
+                await asyncio.to_thread(store_parses, db, to_store)
+
+        completed = 0
+        async for position, parsed, parse_error in parsed_files():
+            original_name, safe_name, path, _ = staged[position]
             email = None
 
             try:
-                with open(path, "wb") as f:
-                    f.write(payload.get("content") or b"")
-
-                parsed = parse_resume_file(path) or {}
+                if parse_error is not None:
+                    raise parse_error
                 data = parsed.get("data") if isinstance(parsed, dict) else parsed
                 if not isinstance(data, dict):
                     raise ValueError("parse failed")
@@ -4521,7 +4589,7 @@ async def _process_bulk_resume_upload_async(
                 elif status == "created":
                     success += 1
 
-                results.append(
+                results[position] = (
                     {
                         "resume": original_name,
                         "candidate_id": getattr(candidate, "public_id", None),
@@ -4533,7 +4601,7 @@ async def _process_bulk_resume_upload_async(
             except Exception as e:
                 db.rollback()
                 failed += 1
-                results.append(
+                results[position] = (
                     {
                         "resume": original_name,
                         "candidate_id": None,
@@ -4543,9 +4611,9 @@ async def _process_bulk_resume_upload_async(
                     }
                 )
             finally:
-                progress = int((index / total) * 100) if total else 100
+                completed += 1
+                progress = int((completed / total) * 100) if total else 100
                 task_queue.update_task_progress(task_id, progress)
-                await asyncio.sleep(0)
 
         task_queue.complete_task(
             task_id,
@@ -4569,6 +4637,7 @@ async def _process_bulk_resume_upload_async(
 async def bulk_resume_upload_async(
     files: List[UploadFile] = File(...),
     duplicate_option: str = Form("overwrite"),
+    force_reparse: bool = Form(False),
     current_user=Depends(get_current_user),
 ):
     allow_user(current_user)
@@ -4612,6 +4681,7 @@ async def bulk_resume_upload_async(
             task_id=task_id,
             files_payload=files_payload,
             duplicate_option=duplicate_option,
+            force_reparse=force_reparse,
         )
     )
 
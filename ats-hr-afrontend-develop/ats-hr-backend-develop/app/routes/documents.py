@@ -10,6 +10,7 @@ from app.db import get_db
 from app import models, schemas
 from app.auth import get_current_user
 from app.permissions import require_permission
+from app.services.settings_cache import system_settings_cache
 from urllib.parse import quote
 import os
 router = APIRouter(prefix="/v1/documents", tags=["Documents"])
@@ -39,25 +40,13 @@ def ensure_employee_owns_profile(current_user, employee):
 
 
 def _get_upload_policy(db: Session):
-    rows = (
-        db.query(models.SystemSettings)
-        .filter(models.SystemSettings.config_key.in_(["uploads.max_file_size_mb", "uploads.allowed_extensions"]))
-        .all()
-    )
-    max_mb = 10
+    max_mb = system_settings_cache.get_int("uploads.max_file_size_mb", 10, db=db) or 10
     allowed = set(ALLOWED_EXT)
-    for row in rows:
-        key = row.config_key or f"{row.module_name}.{row.setting_key}"
-        value = row.value_json if row.value_json is not None else row.setting_value
-        if key == "uploads.max_file_size_mb":
-            try:
-                max_mb = int(value or 10)
-            except Exception:
-                max_mb = 10
-        if key == "uploads.allowed_extensions" and isinstance(value, list):
-            parsed = {str(v).lower().strip() for v in value if str(v).strip()}
-            if parsed:
-                allowed = parsed
+    value = system_settings_cache.get("uploads.allowed_extensions", db=db)
+    if isinstance(value, list):
+        parsed = {str(v).lower().strip() for v in value if str(v).strip()}
+        if parsed:
+            allowed = parsed
     return max_mb, allowed
 
 
@@ -13,6 +13,7 @@ from sqlalchemy import or_, cast, String
 from app.db import get_db
 from app import models, schemas
 from app.ai_core import generate_job_embedding
+from app.services.embedding_service import EMBEDDING_MODEL_VERSION
 from app.auth import get_current_user
 from app.services.activity_service import ActivityService
 from sqlalchemy.exc import IntegrityError
@@ -108,6 +109,9 @@ def create_job(
 ):
     job_id = generate_job_id(db)
     embedding = generate_job_embedding(job_data.dict())
+    # All-zero fallback vector means the model was unavailable; leave it
+    # untagged so the background refresh embeds the job later
+    embedded = any(embedding)
 
     job = models.Job(
         job_id=job_id,
@@ -129,6 +133,8 @@ def create_job(
 
         is_active=True,
         embedding_vector=embedding,
+        embedding_model=EMBEDDING_MODEL_VERSION if embedded else None,
+        embedding_updated_at=datetime.utcnow() if embedded else None,
         created_by=user["id"],
         client_id=job_data.client_id
     )
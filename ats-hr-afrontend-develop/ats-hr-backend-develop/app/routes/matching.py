@@ -11,6 +11,8 @@ from app.db import get_db
 from app import models
 from app.matching_service import get_matching_service
 from app.auth import get_current_user
+from app.services.candidate_rows import MATCHING_FIELDS, load_candidate_rows
+from app.services.vector_index import candidate_vector_index, job_vector_index
 from pydantic import BaseModel
 import logging
 
@@ -50,6 +52,21 @@ class CandidateMatchResult(BaseModel):
     experience_match: str
 
 
+class SimilarCandidateResult(BaseModel):
+    """Candidate returned by a vector similarity lookup"""
+    candidate_id: str
+    candidate_name: str
+    candidate_email: str
+    similarity: float
+
+
+def _candidate_summary(candidate) -> str:
+    """Text used for the semantic part of the match score"""
+    if isinstance(candidate.parsed_resume, dict):
+        return candidate.parsed_resume.get("summary", "") or ""
+    return ""
+
+
 @router.post("/evaluate", response_model=MatchingResponse)
 async def evaluate_match(
     request: MatchingRequest,
@@ -92,6 +109,11 @@ async def evaluate_match(
     if not candidate_summary and candidate.experience:
         candidate_summary = candidate.experience
     
+    # Embed off the event loop; calculate_match_score would block on encode()
+    semantic_score = await matching_service.calculate_semantic_similarity_async(
+        job_description, candidate_summary
+    )
+
     # Calculate match
     result = matching_service.calculate_match_score(
         candidate_skills=candidate_skills,
@@ -100,7 +122,8 @@ async def evaluate_match(
         candidate_experience_years=candidate_experience,
         required_experience_years=required_experience,
         job_description=job_description,
-        candidate_summary=candidate_summary
+        candidate_summary=candidate_summary,
+        semantic_score=semantic_score
     )
     
     logger.info(
@@ -115,6 +138,7 @@ async def get_recommended_candidates(
     job_id: str,
     limit: int = Query(10, ge=1, le=100),
     min_score: float = Query(40, ge=0, le=100),
+    scope: str = Query("submitted", regex="^(submitted|pool)$"),
     db: Session = Depends(get_db),
     current_user: Dict = Depends(get_current_user)
 ):
@@ -127,35 +151,65 @@ async def get_recommended_candidates(
     Query Parameters:
     - limit: Maximum number of candidates to return (default 10)
     - min_score: Minimum match score to include (default 40)
+    - scope: "submitted" (default) or "pool" to recommend from the whole
+      candidate pool via an ANN lookup on the job embedding
     """
     
     job = db.query(models.Job).filter(models.Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    candidates_subquery = db.query(models.CandidateSubmission.candidate_id).filter(
-        models.CandidateSubmission.job_id == job_id
-    ).distinct()
-    
-    candidates = db.query(models.Candidate).filter(
-        models.Candidate.id.in_(candidates_subquery)
-    ).all()
+    if scope == "pool":
+        job_vector_index.ensure_fresh(db)
+        job_vector = job_vector_index.get(job.id)
+        if job_vector is None:
+            job_vector = job.embedding_vector
+        candidate_vector_index.ensure_fresh(db)
+        # Over-fetch so the rule-based re-score still has enough to pick from
+        hits = candidate_vector_index.search(job_vector, k=max(limit * 5, 50))
+        if not hits:
+            return []
+        candidates = load_candidate_rows(
+            db.query(models.Candidate).filter(
+                models.Candidate.id.in_([candidate_id for candidate_id, _ in hits])
+            ),
+            MATCHING_FIELDS,
+        )
+    else:
+        candidates_subquery = db.query(models.CandidateSubmission.candidate_id).filter(
+            models.CandidateSubmission.job_id == job_id
+        ).distinct()
+        
+        candidates = load_candidate_rows(
+            db.query(models.Candidate).filter(models.Candidate.id.in_(candidates_subquery)),
+            MATCHING_FIELDS,
+        )
     
     if not candidates:
         return []
     
     matching_service = get_matching_service()
     results = []
+
+    # Semantic similarity for all candidates in one batched matrix product
+    job_description = job.description or job.title or ""
+    try:
+        semantic_scores = await matching_service.calculate_semantic_similarities_async(
+            job_description, [_candidate_summary(c) for c in candidates]
+        )
+    except Exception as e:
+        logger.error(f"Batched semantic scoring failed for job {job.id}: {e}")
+        semantic_scores = [0.0] * len(candidates)
     
-    for candidate in candidates:
+    for candidate, semantic_score in zip(candidates, semantic_scores):
         try:
             match_result = matching_service.calculate_match_score(
                 candidate_skills=candidate.skills or [],
                 required_skills=job.skills or [],
                 candidate_experience_years=candidate.experience_years or 0,
                 required_experience_years=job.min_experience or 0,
-                job_description=job.description or job.title or "",
-                candidate_summary=candidate.parsed_resume.get("summary", "") if candidate.parsed_resume else ""
+                job_description=job_description,
+                semantic_score=semantic_score
             )
             
             if match_result["match_score"] >= min_score:
@@ -177,6 +231,55 @@ async def get_recommended_candidates(
     return results[:limit]
 
 
+@router.get("/candidates/{candidate_id}/similar-candidates", response_model=List[SimilarCandidateResult])
+async def get_similar_candidates(
+    candidate_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Get candidates whose profile embedding is closest to the given candidate,
+    using a sub-linear ANN lookup on the candidate vector index.
+    """
+    
+    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    candidate_vector_index.ensure_fresh(db)
+    vector = candidate_vector_index.get(candidate.id)
+    if vector is None:
+        vector = candidate.embedding_vector
+    
+    hits = candidate_vector_index.search(vector, k=limit, exclude_ids=[candidate.id])
+    if not hits:
+        return []
+    
+    by_id = {
+        c.id: c
+        for c in load_candidate_rows(
+            db.query(models.Candidate).filter(
+                models.Candidate.id.in_([hit_id for hit_id, _ in hits])
+            ),
+            ("id", "full_name", "email"),
+        )
+    }
+    
+    results = []
+    for hit_id, similarity in hits:
+        c = by_id.get(hit_id)
+        if not c:
+            continue
+        results.append(SimilarCandidateResult(
+            candidate_id=c.id,
+            candidate_name=c.full_name or "Unknown",
+            candidate_email=c.email or "",
+            similarity=round(max(0.0, similarity) * 100, 1)
+        ))
+    return results
+
+
 @router.get("/jobs/{job_id}/candidates-with-scores", response_model=List[CandidateMatchResult])
 async def get_candidates_with_scores(
     job_id: str,
@@ -198,22 +301,33 @@ async def get_candidates_with_scores(
         models.CandidateSubmission.job_id == job_id
     ).distinct()
     
-    candidates = db.query(models.Candidate).filter(
-        models.Candidate.id.in_(candidates_subquery)
-    ).all()
+    candidates = load_candidate_rows(
+        db.query(models.Candidate).filter(models.Candidate.id.in_(candidates_subquery)),
+        MATCHING_FIELDS,
+    )
     
     matching_service = get_matching_service()
     results = []
+
+    # Semantic similarity for all candidates in one batched matrix product
+    job_description = job.description or job.title or ""
+    try:
+        semantic_scores = await matching_service.calculate_semantic_similarities_async(
+            job_description, [_candidate_summary(c) for c in candidates]
+        )
+    except Exception as e:
+        logger.error(f"Batched semantic scoring failed for job {job.id}: {e}")
+        semantic_scores = [0.0] * len(candidates)
     
-    for candidate in candidates:
+    for candidate, semantic_score in zip(candidates, semantic_scores):
         try:
             match_result = matching_service.calculate_match_score(
                 candidate_skills=candidate.skills or [],
                 required_skills=job.skills or [],
                 candidate_experience_years=candidate.experience_years or 0,
                 required_experience_years=job.min_experience or 0,
-                job_description=job.description or job.title or "",
-                candidate_summary=candidate.parsed_resume.get("summary", "") if candidate.parsed_resume else ""
+                job_description=job_description,
+                semantic_score=semantic_score
             )
             
             results.append(CandidateMatchResult(
@@ -2,21 +2,21 @@
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
-import time
 
 from app.db import get_db
 from app import models
 from app.auth import get_current_user
 from app.permissions import require_permission
 from app.utils.role_check import allow_user
-from app.email_service import send_email
+from app.services.email_outbox import enqueue_email, outbox_status, wake_outbox_worker
 from app.validators import validate_email, sanitize_email
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/nvite", tags=["NVite"])
 
 
-DEFAULT_TEMPLATE = """Dear {{name}},\n\nGreetings from {{company}}!\n\nWe came across your profile and believe you could be a great fit for the position of {{job_title}} at our organization.\n\n\ud83d\udccc Job Role: {{job_title}}\n\ud83d\udccd Location: {{location}}\n\nIf you are interested, we would love for you to apply using the link below:\n\n\ud83d\udc49 Apply Here: {{apply_link}}\n\nOur team will review your application and get in touch if your profile matches our requirements.\n\nBest regards,\n{{recruiter}}\n{{company}}\n"""
+DEFAULT_TEMPLATE = """Dear {{name}},\n\nGreetings from {{company}}!\n\nWe came across your profile and believe you could be a great fit for the position of {{job_title}} at our organization.\n\n\U0001f4cc Job Role: {{job_title}}\n\U0001f4cd Location: {{location}}\n\nIf you are interested, we would love for you to apply using the link below:\n\n\U0001f449 Apply Here: {{apply_link}}\n\nOur team will review your application and get in touch if your profile matches our requirements.\n\nBest regards,\n{{recruiter}}\n{{company}}\n"""
 
 
 class JobInviteRequest(BaseModel):
@@ -81,14 +81,30 @@ async def send_job_invites(
 
     subject = f"Opportunity at {payload.company_name} – {payload.job_title}"
 
-    sent = 0
+    queued = 0
     failed = 0
     details = []
 
-    # Duplicate detection window
+    # Duplicate detection window. Queued invites count only when an outbox
+    # row carries them; older in-memory queued invites may never have gone out.
     duplicate_cutoff = datetime.utcnow() - timedelta(days=30)
+    invites = models.CandidateInvite
+    already_invited = {
+        row[0]
+        for row in db.query(invites.candidate_id)
+        .filter(
+            invites.candidate_id.in_([c.id for c in candidates]),
+            invites.job_id == payload.job_id,
+            invites.sent_at >= duplicate_cutoff,
+            or_(
+                invites.status.in_(["sent", "job_invite_sent"]),
+                and_(invites.status == "queued", invites.outbox_id.isnot(None)),
+            ),
+        )
+        .all()
+    }
 
-    for idx, candidate in enumerate(candidates, start=1):
+    for candidate in candidates:
         candidate_name = candidate.full_name or candidate.name or candidate.email or "Candidate"
         candidate_email = candidate.email
 
@@ -107,55 +123,57 @@ async def send_job_invites(
         candidate.email = normalized_email
 
         # Avoid duplicate invites for same job within 30 days
-        existing = (
-            db.query(models.CandidateInvite)
-            .filter(
-                models.CandidateInvite.candidate_id == candidate.id,
-                models.CandidateInvite.job_id == payload.job_id,
-                models.CandidateInvite.sent_at >= duplicate_cutoff,
-                models.CandidateInvite.status.in_(["sent", "job_invite_sent"]),
-            )
-            .first()
-        )
-        if existing:
+        if candidate.id in already_invited:
             failed += 1
             details.append({"candidate": candidate_name, "status": "failed", "reason": "duplicate invite"})
             continue
 
-        personalized = apply_template(template, candidate_name)
-
-        success = send_email(
-            to_email=normalized_email,
-            subject=subject,
-            text=personalized,
+        # The email goes through the durable outbox in this transaction; the
+        # outbox drain moves the invite to job_invite_sent or failed
+        outbox = enqueue_email(
+            db,
+            normalized_email,
+            subject,
+            text=apply_template(template, candidate_name),
+            created_by=current_user.get("id"),
         )
-
-        invite_status = "job_invite_sent" if success else "failed"
-
-        invite = models.CandidateInvite(
-            candidate_id=candidate.id,
-            recruiter_id=current_user.get("id"),
-            job_id=payload.job_id,
-            status=invite_status,
-            message=template,
+        db.add(
+            models.CandidateInvite(
+                candidate_id=candidate.id,
+                recruiter_id=current_user.get("id"),
+                job_id=payload.job_id,
+                status="queued",
+                message=template,
+                outbox_id=outbox.id,
+            )
         )
-        db.add(invite)
-
-        if success:
-            sent += 1
-            details.append({"candidate": candidate_name, "status": "sent"})
-        else:
-            failed += 1
-            details.append({"candidate": candidate_name, "status": "failed", "reason": "email send failed"})
-
-        # Simple rate limiting: pause after every 10 emails
-        if idx % 10 == 0:
-            time.sleep(0.2)
+        queued += 1
+        details.append({"candidate": candidate_name, "status": "queued", "message_id": outbox.id})
 
     db.commit()
+    if queued:
+        wake_outbox_worker()
 
+    # Nothing has been delivered yet when this returns; per-message outcome is
+    # available from /nvite/message-status and on the CandidateInvite rows
     return {
-        "sent": sent,
+        "sent": 0,
+        "queued": queued,
         "failed": failed,
         "details": details,
     }
+
+
+@router.get("/message-status")
+@require_permission("candidates", "view")
+async def invite_message_status(
+    message_ids: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Delivery status of queued invite emails (comma-separated message ids)."""
+    allow_user(current_user)
+
+    ids = [m.strip() for m in (message_ids or "").split(",") if m.strip()][:200]
+    results = outbox_status(db, ids)
+    return {"count": len(results), "results": results}
@@ -506,10 +506,10 @@ def upload_resume(
         f.write(file.file.read())
     
     # Parse resume (trigger AI parsing)
-    from app.resume_parser import parse_resume
+    from app.services.resume_parse_cache import parse_resume_cached
     
     try:
-        parsed_result = parse_resume(file_path) or {}
+        parsed_result = parse_resume_cached(db, file_path)
         parsed_data = parsed_result.get("data") if isinstance(parsed_result, dict) else {}
         if not isinstance(parsed_data, dict):
             parsed_data = {}
@@ -4,9 +4,10 @@ Resdex - Advanced search, saved searches, folders, and invites
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, String, or_, and_
+from sqlalchemy import func, or_, and_
 from datetime import datetime, timedelta
 from typing import Optional, List
+import heapq
 import time
 
 from app.db import get_db
@@ -14,33 +15,112 @@ from app import models
 from app.auth import get_current_user
 from app.permissions import require_permission
 from app.utils.role_check import allow_user
-from app.ai_core import generate_embedding
-from app.utils.search_utils import cosine_similarity
+from app.ai_core import generate_embedding_async
+from app.services.candidate_rows import load_candidate_rows, prefetch_certifications
+from app.services.candidate_search_index import candidate_search_index
+from app.services.candidate_terms import certifications_filter, skills_filter, tags_filter
+from app.services.vector_index import candidate_vector_index
 from app.utils.resdex_search_engine import (
     split_csv,
     tokenize,
     apply_synonyms,
     extract_experience_range,
-    candidate_document,
-    keyword_score,
     skills_score,
     experience_score,
     location_score,
-    availability_bucket,
+    availability_bucket_sql,
     availability_score,
+    bounded_top_k,
     certification_score,
     recency_score,
     structured_score,
     confidence,
-    facets,
     spell_check_query,
     search_suggestions,
-    related_searches,
-    safe_lower,
 )
+from app.services.resdex_enrichments import compute_enrichments, get_enrichments, start_enrichments
+from app.services.resdex_cache import RankingState, candidate_data_version, ranking_cache_key, resdex_ranking_cache
+from app.services.resdex_facets import facet_signature
 
 router = APIRouter(prefix="/v1/resdex", tags=["resdex"])
 
+# Number of top-ranked rows that get the full score
+RERANK_WINDOW = 300
+
+# Filtered sets up to this size are ranked exactly. Larger ones are ranked
+# over a bounded recall pool: the BM25 and ANN top hits plus the filtered
+# rows with the best indexed columns, RECALL_SIZE (or the page depth) each.
+EXACT_POOL_LIMIT = 2000
+RECALL_SIZE = RERANK_WINDOW
+
+
+def _recency_column():
+    return func.coalesce(models.Candidate.last_activity_at, models.Candidate.created_at)
+
+
+def _filtered_ids(id_query, ids: List[str], chunk_size: int = 500) -> List[str]:
+    """Subset of ``ids`` that passes the filters of ``id_query``."""
+    out: List[str] = []
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        out.extend(row[0] for row in id_query.filter(models.Candidate.id.in_(chunk)).all())
+    return out
+
+
+def _recall_pool(query, total: int, depth: int, keyword_hits: dict, query_embedding) -> List[str]:
+    """
+    Ids of the filtered candidates worth scoring for a relevance sort.
+
+    Small filtered sets are returned whole. For larger ones only the top
+    BM25 and ANN hits that pass the filters are kept, topped up with the
+    filtered rows that rank best on indexed columns (profile completeness,
+    then recency) so a search without a query, or with very selective
+    filters, still fills every page.
+    """
+    id_query = query.with_entities(models.Candidate.id).order_by(None)
+    if total <= EXACT_POOL_LIMIT:
+        return [row[0] for row in id_query.all()]
+
+    size = max(RECALL_SIZE, depth)
+    recalled = dict.fromkeys(
+        cid for cid, _ in heapq.nlargest(size, keyword_hits.items(), key=lambda kv: kv[1])
+    )
+    if query_embedding:
+        recalled.update(dict.fromkeys(cid for cid, _ in candidate_vector_index.search(query_embedding, size)))
+    pool = dict.fromkeys(_filtered_ids(id_query, list(recalled))) if recalled else {}
+
+    top_rows = (
+        id_query.order_by(
+            models.Candidate.profile_completion.desc(),
+            _recency_column().desc(),
+            models.Candidate.id,
+        )
+        .limit(size)
+        .all()
+    )
+    pool.update(dict.fromkeys(row[0] for row in top_rows))
+    return list(pool)
+
+
+def _sorted_ids(query, sort_key: str, depth: int) -> List[str]:
+    """Top ``depth`` filtered ids for the column sorts, ordered in SQL."""
+    if sort_key == "experience_desc":
+        order = (func.coalesce(models.Candidate.experience_years, 0).desc(), models.Candidate.id)
+    else:
+        order = (_recency_column().desc(), models.Candidate.id)
+    id_query = query.with_entities(models.Candidate.id).order_by(None)
+    return [row[0] for row in id_query.order_by(*order).limit(depth).all()]
+
+
+def _load_rows(db: Session, ids: List[str], chunk_size: int = 500) -> list:
+    """Projected rows for ``ids``, in the same order."""
+    by_id = {}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        for row in load_candidate_rows(db.query(models.Candidate).filter(models.Candidate.id.in_(chunk))):
+            by_id[row.id] = row
+    return [by_id[i] for i in ids if i in by_id]
+
 
 # ============================================================
 # SUGGEST - Query autocomplete suggestions
@@ -92,12 +172,22 @@ async def resdex_search(
     sort: str = "relevance",
     limit: int = 20,
     offset: int = 0,
+    include_enrichments: bool = True,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     """
     Live search across all candidate data (Intake, Profile, Pool)
     Aggregates and de-duplicates results
+
+    Suggestions, related searches, did-you-mean and facets are computed
+    concurrently and returned inline. include_enrichments=false returns a
+    search id instead and leaves them running in the background, to be
+    fetched from /search/{search_id}/enrichments on the same worker process.
+
+    certifications matches certification names (certification records,
+    certifications_text and the parsed resume's certifications list), not
+    free-text mentions in the resume body or summary.
     """
     allow_user(current_user)
     
@@ -174,56 +264,18 @@ async def resdex_search(
             elif la == "90days":
                 query = query.filter(models.Candidate.last_activity_at >= (now - timedelta(days=90)))
 
-        # Skills filter against JSON (best-effort string match)
-        if required_skills:
-            if (skills_logic or "").strip().upper() == "OR":
-                query = query.filter(
-                    or_(
-                        *[
-                            cast(models.Candidate.skills, String).ilike(f"%{s}%")
-                            for s in required_skills
-                        ]
-                    )
-                )
-            else:
-                for s in required_skills:
-                    query = query.filter(cast(models.Candidate.skills, String).ilike(f"%{s}%"))
-
-        # Tags filter against JSON (best-effort)
-        if required_tags:
-            if (tags_logic or "").strip().upper() == "OR":
-                query = query.filter(
-                    or_(
-                        *[
-                            cast(models.Candidate.tags, String).ilike(f"%{t}%")
-                            for t in required_tags
-                        ]
-                    )
-                )
-            else:
-                for t in required_tags:
-                    query = query.filter(cast(models.Candidate.tags, String).ilike(f"%{t}%"))
-
-        candidates = query.all()
+        # Skills / tags / certifications via the indexed candidate_terms table
+        for predicate in (
+            skills_filter(required_skills, skills_logic),
+            tags_filter(required_tags, tags_logic),
+            certifications_filter(required_certs),
+        ):
+            if predicate is not None:
+                query = query.filter(predicate)
 
-        # Post-filters not easily expressible in SQL
         if availability_list:
-            allowed = set([a for a in availability_list if a])
-            candidates = [c for c in candidates if (availability_bucket(c) or "") in allowed]
-
-        if required_certs:
-            req = [safe_lower(x) for x in required_certs if x]
-            filtered = []
-            for c in candidates:
-                doc = candidate_document(c)
-                if any(r in doc for r in req):
-                    filtered.append(c)
-            candidates = filtered
-
-        # -------------------------
-        # Stage 2: Semantic + Keyword scoring inputs
-        # -------------------------
-        query_embedding = generate_embedding(q.strip()) if (q and q.strip()) else None
+            allowed = [a for a in availability_list if a]
+            query = query.filter(availability_bucket_sql().in_(allowed))
 
         structured_filters = {
             "min_exp": effective_min_exp,
@@ -241,108 +293,193 @@ async def resdex_search(
             "willing_to_relocate": willing_to_relocate,
         }
 
-        scored = []
-        for c in candidates:
-            doc = candidate_document(c)
+        has_query = bool(q and q.strip())
 
-            semantic = 0.0
-            if query_embedding and getattr(c, "embedding_vector", None):
-                sim = cosine_similarity(query_embedding, c.embedding_vector)
-                semantic = float(max(0.0, sim) * 100.0)
+        def _final_score(parts: dict, cert_sc: float) -> float:
+            final_score = (
+                parts["relevance"] * 0.25
+                + parts["skills"] * 0.25
+                + parts["experience"] * 0.20
+                + parts["location"] * 0.10
+                + cert_sc * 0.10
+                + parts["recency"] * 0.05
+                + parts["completeness"] * 0.03
+                + parts["availability"] * 0.02
+            )
+            return float(round(min(100.0, max(0.0, final_score)), 2))
 
-            keyword = keyword_score(query_tokens, doc) if (q and q.strip()) else 50.0
-            structured = structured_score(structured_filters, c)
-            relevance = float((semantic * 0.4) + (keyword * 0.3) + (structured * 0.3))
+        # Only the top window is ever returned or summarised (related searches
+        # read the first rows), so only that window is fully scored.
+        window = max(offset + limit, RERANK_WINDOW)
+        sort_key = (sort or "relevance").strip().lower()
+        if sort_key not in ("experience_desc", "recency_desc"):
+            sort_key = "relevance"
+
+        # Everything up to the ranked window depends only on the query, the
+        # filters, the sort and the caller scope, so pages 2..N reuse it
+        # (invalidated by candidate commits)
+        cache_key = ranking_cache_key(
+            q,
+            {**structured_filters, "certifications": required_certs},
+            scope=current_user.get("role"),
+            sort=sort_key,
+        )
+        state = resdex_ranking_cache.get(cache_key)
+        if state is None or not state.covers(offset + limit):
+            total_count = query.order_by(None).count()
 
             # -------------------------
-            # Stage 3: Multi-factor ranking
+            # Stage 2: Semantic + Keyword scoring inputs
             # -------------------------
-            skill_sc = skills_score(skills_for_scoring, getattr(c, "skills", []) or [])
-            exp_sc = experience_score(query_tokens, effective_min_exp, effective_max_exp, c)
-            loc_sc = location_score(location, c)
-            cert_sc = certification_score(required_certs, c)
-            rec_sc = recency_score(c)
-            complete_sc = float(getattr(c, "profile_completion", 0) or 0.0)
-            avail_sc = availability_score(c)
+            query_embedding = await generate_embedding_async(q.strip()) if (q and q.strip()) else None
+
+            # Keyword relevance comes from the BM25 inverted index: only the posting
+            # lists of the query terms are touched, not every candidate document.
+            keyword_hits = {}
+            if q and q.strip():
+                candidate_search_index.ensure_fresh(db)
+                keyword_hits = candidate_search_index.keyword_scores(query_tokens)
+            if query_embedding:
+                candidate_vector_index.ensure_fresh(db)
+
+            # First stage: a bounded set of ids. Column sorts are exact in SQL;
+            # relevance uses the recall pool. Only these rows are hydrated.
+            if sort_key == "relevance":
+                pool_ids = _recall_pool(query, total_count, window, keyword_hits, query_embedding)
+            else:
+                pool_ids = _sorted_ids(query, sort_key, window)
+            candidates = _load_rows(db, pool_ids)
 
-            final_score = (
-                relevance * 0.25
-                + skill_sc * 0.25
-                + exp_sc * 0.20
-                + loc_sc * 0.10
-                + cert_sc * 0.10
-                + rec_sc * 0.05
-                + complete_sc * 0.03
-                + avail_sc * 0.02
-            )
-            final_score = float(round(min(100.0, max(0.0, final_score)), 2))
-
-            breakdown = {
-                "semantic": semantic,
-                "keyword": keyword,
-                "structured": structured,
-                "relevance": relevance,
-                "skills": skill_sc,
-                "experience": exp_sc,
-                "location": loc_sc,
-                "certification": cert_sc,
-                "recency": rec_sc,
-                "completeness": complete_sc,
-                "availability": avail_sc,
-                "final_score": final_score,
-            }
+            # Semantic similarity: one matrix-vector product over the pool
+            semantic_hits = {}
+            if query_embedding:
+                semantic_hits = candidate_vector_index.similarities(query_embedding, [c.id for c in candidates])
 
-            scored.append(
-                {
-                    "_candidate_obj": c,
-                    "id": c.id,
-                    "name": c.full_name or "N/A",
-                    "email": c.email or "N/A",
-                    "phone": c.phone or "N/A",
-                    "skills": c.skills if isinstance(c.skills, list) else [],
-                    "experience": c.experience_years or 0,
-                    "location": c.current_location or "N/A",
-                    "city": c.city or "N/A",
-                    "employer": c.current_employer or "N/A",
-                    "designation": c.experience or getattr(c, "current_job_title", None) or "N/A",
-                    "salary": c.expected_salary or 0,
-                    "status": str(c.status) if c.status else "N/A",
-                    "resume_url": c.resume_url,
-                    "source": c.source or "N/A",
-                    "match_score": final_score,
-                    "score_breakdown": breakdown,
-                    "confidence": confidence(breakdown),
+            # -------------------------
+            # Stage 3: Multi-factor ranking
+            # -------------------------
+            # Every component except certification only reads columns already on
+            # the row; certification needs the certifications relationship, so it
+            # is the one left for the re-rank stage.
+            def _components(c) -> dict:
+                semantic = float(max(0.0, semantic_hits.get(c.id, 0.0)) * 100.0)
+                keyword = keyword_hits.get(c.id, 0.0) if has_query else 50.0
+                structured = structured_score(structured_filters, c)
+                return {
+                    "semantic": semantic,
+                    "keyword": keyword,
+                    "structured": structured,
+                    "relevance": float((semantic * 0.4) + (keyword * 0.3) + (structured * 0.3)),
+                    "skills": skills_score(skills_for_scoring, getattr(c, "skills", []) or []),
+                    "experience": experience_score(query_tokens, effective_min_exp, effective_max_exp, c),
+                    "location": location_score(location, c),
+                    "recency": recency_score(c),
+                    "completeness": float(getattr(c, "profile_completion", 0) or 0.0),
+                    "availability": availability_score(c),
                 }
-            )
 
-        # -------------------------
-        # Sorting / pagination
-        # -------------------------
-        sort_key = (sort or "relevance").strip().lower()
-        if sort_key == "experience_desc":
-            scored.sort(key=lambda x: float(x.get("experience") or 0), reverse=True)
-        elif sort_key == "recency_desc":
-            scored.sort(
-                key=lambda x: float(x.get("score_breakdown", {}).get("recency") or 0),
-                reverse=True,
+            components = [_components(c) for c in candidates]
+            cert_scores = {}
+
+            def _rerank(indices: List[int]) -> List[float]:
+                prefetch_certifications(db, [candidates[i] for i in indices])
+                for i in indices:
+                    cert_scores[i] = certification_score(required_certs, candidates[i])
+                return [_final_score(components[i], cert_scores[i]) for i in indices]
+
+            if sort_key == "relevance":
+                # Certification weighs 0.10, so the cheap components plus a perfect
+                # certification score bound each candidate's final score
+                bounds = [_final_score(parts, 100.0) for parts in components]
+                order = [i for i, _ in bounded_top_k(bounds, _rerank, window)]
+            else:
+                order = list(range(len(candidates)))
+                _rerank(order)
+
+            # Only the ordered ids and their score rows are cached; the rows
+            # themselves are re-read for each page
+            state = RankingState(
+                [candidates[i].id for i in order],
+                [
+                    dict(
+                        components[i],
+                        certification=cert_scores[i],
+                        final_score=_final_score(components[i], cert_scores[i]),
+                    )
+                    for i in order
+                ],
+                total_count,
+                exhausted=len(order) < window,
             )
+            resdex_ranking_cache.set(cache_key, state)
+            rows_by_id = {c.id: c for c in candidates}
         else:
-            scored.sort(key=lambda x: float(x.get("match_score") or 0), reverse=True)
+            rows_by_id = {}
+
+        # related_searches() reads the skills of the first 10 results
+        page_ids = state.ids[offset : offset + limit]
+        head_ids = state.ids[:10]
+        missing = [i for i in dict.fromkeys(head_ids + page_ids) if i not in rows_by_id]
+        if missing:
+            rows_by_id.update((c.id, c) for c in _load_rows(db, missing))
+
+        def _result(position: int) -> Optional[dict]:
+            c = rows_by_id.get(state.ids[position])
+            if c is None:
+                return None
+            breakdown = state.breakdown(position)
+            return {
+                "_candidate_obj": c,
+                "id": c.id,
+                "name": c.full_name or "N/A",
+                "email": c.email or "N/A",
+                "phone": c.phone or "N/A",
+                "skills": c.skills if isinstance(c.skills, list) else [],
+                "experience": c.experience_years or 0,
+                "location": c.current_location or "N/A",
+                "city": c.city or "N/A",
+                "employer": c.current_employer or "N/A",
+                "designation": c.experience or getattr(c, "current_job_title", None) or "N/A",
+                "salary": c.expected_salary or 0,
+                "status": str(c.status) if c.status else "N/A",
+                "resume_url": c.resume_url,
+                "source": c.source or "N/A",
+                "match_score": breakdown["final_score"],
+                "score_breakdown": breakdown,
+                "confidence": confidence(breakdown),
+            }
 
-        total_count = len(scored)
-        paginated = scored[offset : offset + limit]
+        # -------------------------
+        # Pagination
+        # -------------------------
+        total_count = state.total
+        scored = [r for r in map(_result, range(len(head_ids))) if r is not None]
 
         paginated_results = []
-        for r in paginated:
-            rr = dict(r)
-            rr.pop("_candidate_obj", None)
-            paginated_results.append(rr)
+        for position in range(offset, offset + len(page_ids)):
+            rr = _result(position)
+            if rr is not None:
+                rr.pop("_candidate_obj", None)
+                paginated_results.append(rr)
 
         search_time_ms = int((time.perf_counter() - t0) * 1000)
-        did_you_mean = spell_check_query(db, q or "")
-        suggestions = search_suggestions(db, q or "", current_user)
-        related = related_searches(q or "", scored)
-        facet_data = facets(scored)
+
+        # Facets count the whole filtered set, so they depend on the filters only
+        facet_key = (candidate_data_version(), facet_signature({**structured_filters, "certifications": required_certs}))
+        if include_enrichments:
+            enrichments = await compute_enrichments(q or "", scored, current_user, query, facet_key)
+            enrichment_meta = {
+                "suggestions": enrichments["suggestions"],
+                "related_searches": enrichments["related_searches"],
+                "did_you_mean": enrichments["did_you_mean"],
+                "facets": enrichments["facets"],
+            }
+        else:
+            search_id = start_enrichments(q or "", scored, current_user, query, facet_key)
+            enrichment_meta = {
+                "search_id": search_id,
+                "enrichments_url": f"/v1/resdex/search/{search_id}/enrichments",
+            }
 
         return {
             "total": total_count,
@@ -352,9 +489,7 @@ async def resdex_search(
             "results": paginated_results,
             "metadata": {
                 "search_time_ms": search_time_ms,
-                "suggestions": suggestions,
-                "related_searches": related,
-                "did_you_mean": did_you_mean,
+                **enrichment_meta,
                 "active_filters": {
                     "q": q,
                     "min_exp": effective_min_exp,
@@ -372,7 +507,6 @@ async def resdex_search(
                     "last_active": last_active,
                     "willing_to_relocate": willing_to_relocate,
                 },
-                "facets": facet_data,
             },
         }
     
@@ -387,6 +521,26 @@ async def resdex_search(
             "error": str(e),
         }
 
+
+@router.get("/search/{search_id}/enrichments")
+@require_permission("candidates", "view")
+async def resdex_search_enrichments(
+    search_id: str,
+    wait: float = 0.0,
+    current_user=Depends(get_current_user),
+):
+    """
+    Suggestions, related searches, did-you-mean and facets of a previous
+    /search call. ``wait`` (seconds, max 10) long-polls for tasks still running.
+    """
+    allow_user(current_user)
+
+    data = await get_enrichments(search_id, current_user, wait=max(0.0, min(wait, 10.0)))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Search enrichments not found or expired")
+    return data
+
+
 # ============================================================
 # SAVED SEARCHES
 # ============================================================
@@ -3,12 +3,14 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import cast, String, or_
+from sqlalchemy import cast, String, func, or_
 
 from app.db import get_db
 from app import models
 from app.auth import get_current_user
 from app.permissions import require_permission
+from app.services.candidate_rows import load_candidate_rows
+from app.services.saved_search_alerts import changed_since
 from app.utils.role_check import allow_user
 
 router = APIRouter(prefix="/searches", tags=["Searches"])
@@ -171,12 +173,29 @@ async def list_searches(
 @require_permission("searches", "view")
 async def run_search(
     search_id: str,
+    mode: str = "all",  # all | new (only candidates changed since the last run)
+    since: Optional[datetime] = None,
+    limit: int = 50,
+    offset: int = 0,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    """
+    Run a saved search, one page at a time.
+
+    mode=new only scans candidates created/updated after the search's
+    high-water mark. The first page (offset=0) advances the mark; later pages
+    should pass back the ``since`` returned by the first one.
+    """
     allow_user(current_user)
     recruiter_id = current_user.get("id")
 
+    mode = (mode or "all").strip().lower()
+    if mode not in ("all", "new"):
+        raise HTTPException(status_code=400, detail="mode must be 'all' or 'new'")
+    limit = max(1, min(limit, 500))
+    offset = max(0, offset)
+
     saved = (
         db.query(models.SavedSearch)
         .filter(
@@ -189,12 +208,27 @@ async def run_search(
     if not saved:
         raise HTTPException(status_code=404, detail="Search not found")
 
+    # Taken before querying, so rows changed during this run are picked up next time
+    high_water = db.query(func.max(models.Candidate.updated_at)).scalar()
+
     filters = saved.filters or {}
     query = _build_candidate_query(db, filters)
-    candidates = query.order_by(models.Candidate.created_at.desc()).all()
+    if mode == "new":
+        since = since or saved.last_run_high_water
+        if since is not None:
+            query = query.filter(changed_since(since))
+
+    total = query.order_by(None).count()
+    candidates = load_candidate_rows(
+        query.order_by(models.Candidate.created_at.desc(), models.Candidate.id.desc()).offset(offset).limit(limit),
+        ("id", "full_name", "email", "phone", "status"),
+    )
 
     saved.last_used_at = datetime.utcnow()
-    saved.result_count = len(candidates)
+    if mode == "all" or since is None:
+        saved.result_count = total
+    if offset == 0 and high_water is not None:
+        saved.last_run_high_water = high_water
     db.commit()
 
     results = []
@@ -209,7 +243,13 @@ async def run_search(
 
     return {
         "filters": filters,
-        "result_count": len(results),
+        "mode": mode,
+        "since": since,
+        "high_water": saved.last_run_high_water,
+        "result_count": total,
+        "count": len(results),
+        "limit": limit,
+        "offset": offset,
         "candidates": results,
     }
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.db import get_db
-from app.models import Skill
+from app.services.skill_vocabulary import skill_vocabulary
 
 router = APIRouter(
     prefix="/v1/skills",
@@ -20,23 +20,16 @@ def search_skills(
     REAL-WORLD SKILL SEARCH / AUTOCOMPLETE
 
     - Case insensitive
-    - Partial match
+    - Partial match (prefix matches first)
+    - Served from the in-memory skill vocabulary, not a per-keystroke query
     - Returns standardized skill names
     - Used by Job, Candidate, Consultant forms
     """
 
-    keyword = q.strip().lower()
-
-    skills = (
-        db.query(Skill)
-        .filter(Skill.normalized_name.ilike(f"%{keyword}%"))
-        .order_by(Skill.name.asc())
-        .limit(limit)
-        .all()
-    )
+    results = skill_vocabulary.search(q, limit=limit, db=db)
 
     return {
         "query": q,
-        "count": len(skills),
-        "results": [skill.name for skill in skills]
+        "count": len(results),
+        "results": results
     }
@@ -633,6 +633,11 @@ class CandidateResponse(CandidateBase):
     last_activity_type: Optional[str] = None
     last_activity_relative: Optional[str] = None
 
+    @validator("embedding_vector", pre=True)
+    def embedding_as_list(cls, v):
+        # Stored as float32 bytes, exposed as ndarray by the ORM
+        return v.tolist() if hasattr(v, "tolist") else v
+
     class Config:
         from_attributes = True
 
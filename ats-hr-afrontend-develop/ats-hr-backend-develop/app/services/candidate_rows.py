@@ -0,0 +1,130 @@
+"""
+Column-projected candidate rows for search and scoring hot paths.
+
+Hydrating ``models.Candidate`` for thousands of rows pays for dozens of
+unused columns, the joined ``merged_into`` relationship, identity-map
+bookkeeping and a lazy ``certifications`` load per row. ``CandidateRow`` is a
+``__slots__`` object built straight from a ``with_entities`` projection of
+only the columns the scorers read; certifications are prefetched for many
+rows with one ``IN`` query.
+
+Rows are read-only snapshots: never ``db.add`` them or expect writes to persist.
+"""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy.orm import Query, Session
+
+from app import models
+
+# Columns read by resdex_search_engine scorers/facets and the result payloads
+RESDEX_FIELDS = (
+    "id",
+    "full_name",
+    "email",
+    "phone",
+    "skills",
+    "tags",
+    "experience",
+    "experience_years",
+    "current_job_title",
+    "current_employer",
+    "current_location",
+    "preferred_location",
+    "city",
+    "expected_salary",
+    "status",
+    "resume_url",
+    "source",
+    "profile_completion",
+    "willing_to_relocate",
+    "last_activity_at",
+    "created_at",
+    "availability_to_join",
+    "notice_period_days",
+    "notice_period",
+    "certifications_text",
+    "qualification",
+    "education",
+)
+
+# Columns read by MatchingService-based endpoints
+MATCHING_FIELDS = (
+    "id",
+    "full_name",
+    "email",
+    "skills",
+    "experience_years",
+    "parsed_resume",
+)
+
+CertificationRef = namedtuple("CertificationRef", ["name", "organization"])
+
+_ALL_FIELDS = tuple(dict.fromkeys(RESDEX_FIELDS + MATCHING_FIELDS))
+
+
+class CandidateRow:
+    """
+    Lightweight stand-in for ``models.Candidate`` with only projected columns.
+    Columns that were not projected read as None. ``certifications`` stays
+    None until ``prefetch_certifications`` fills it.
+    """
+
+    __slots__ = _ALL_FIELDS + ("certifications",)
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self) -> str:
+        return f"<CandidateRow {self.id}>"
+
+
+def load_candidate_rows(query: Query, fields: Sequence[str] = RESDEX_FIELDS) -> List[CandidateRow]:
+    """
+    Run a ``db.query(models.Candidate)...`` query as a column projection.
+    Filters, ordering, offset and limit on ``query`` are kept.
+    """
+    fields = [f for f in fields if f in _ALL_FIELDS]
+    rows = query.with_entities(*[getattr(models.Candidate, f) for f in fields]).all()
+    out: List[CandidateRow] = []
+    for row in rows:
+        item = CandidateRow()
+        for name, value in zip(fields, row):
+            setattr(item, name, value)
+        out.append(item)
+    return out
+
+
+def prefetch_certifications(db: Session, rows: Iterable[CandidateRow], chunk_size: int = 500) -> None:
+    """Fill ``certifications`` for every row that does not have it yet."""
+    pending: Dict[str, List[CandidateRow]] = {}
+    for row in rows:
+        if row.certifications is None:
+            pending.setdefault(row.id, []).append(row)
+    if not pending:
+        return
+
+    found: Dict[str, List[CertificationRef]] = {}
+    ids = list(pending)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        for candidate_id, name, organization in (
+            db.query(
+                models.Certification.candidate_id,
+                models.Certification.name,
+                models.Certification.organization,
+            )
+            .filter(models.Certification.candidate_id.in_(chunk))
+            .order_by(models.Certification.candidate_id, models.Certification.created_at)
+            .all()
+        ):
+            found.setdefault(candidate_id, []).append(CertificationRef(name, organization))
+
+    for candidate_id, items in pending.items():
+        certs = found.get(candidate_id, [])
+        for row in items:
+            row.certifications = list(certs)
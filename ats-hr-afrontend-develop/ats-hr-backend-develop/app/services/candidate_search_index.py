@@ -0,0 +1,305 @@
+"""
+In-process inverted index for Resdex keyword search.
+
+Indexes the same text ``candidate_document`` builds (skills, employer, title,
+parsed resume, certifications, tags, ...) and ranks it with BM25, so a search
+only touches the posting lists of its query terms instead of re-building and
+substring-scanning every candidate document on every request.
+
+The index is built lazily on first use and kept fresh incrementally:
+- commits that touch candidates/certifications mark ids dirty
+  (see ``app.events.search_index_listeners``)
+- writes from other worker processes are picked up through an
+  ``updated_at`` high-water mark
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
+
+from app import models
+from app.db import SessionLocal
+from app.utils.resdex_search_engine import apply_synonyms, candidate_document, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def index_terms(text: str) -> List[str]:
+    """Tokenize text exactly the way Resdex tokenizes queries."""
+    return apply_synonyms(tokenize(text or ""))
+
+
+def is_searchable(c: models.Candidate) -> bool:
+    """Only active, non-merged candidates are visible in Resdex."""
+    if getattr(c, "merged_into_id", None):
+        return False
+    return getattr(c, "is_active", True) is not False
+
+
+class CandidateSearchIndex:
+    """
+    Token -> {candidate_id: term frequency} postings with BM25 ranking.
+    """
+
+    # How often (seconds) a search re-checks the DB for rows changed by other workers
+    SYNC_INTERVAL_SECONDS = 5.0
+    REBUILD_BATCH_SIZE = 1000
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+
+        self._loaded = False
+        self._dirty: Set[str] = set()
+        self._high_water: Optional[datetime] = None
+        self._last_sync = 0.0
+
+    # --------------------------------------------------------
+    # WRITE PATH
+    # --------------------------------------------------------
+
+    def index_text(self, candidate_id: str, text: str) -> None:
+        """Insert or replace the document for a candidate."""
+        if not candidate_id:
+            return
+        counts = Counter(index_terms(text))
+
+        with self._lock:
+            self._remove_locked(candidate_id)
+            if not counts:
+                return
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[candidate_id] = tf
+            length = sum(counts.values())
+            self._doc_terms[candidate_id] = tuple(counts.keys())
+            self._doc_len[candidate_id] = length
+            self._total_len += length
+
+    def add_candidate(self, c: models.Candidate) -> None:
+        if is_searchable(c):
+            self.index_text(c.id, candidate_document(c))
+        else:
+            self.remove(c.id)
+
+    def remove(self, candidate_id: str) -> None:
+        with self._lock:
+            self._remove_locked(candidate_id)
+
+    def _remove_locked(self, candidate_id: str) -> None:
+        terms = self._doc_terms.pop(candidate_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            plist = self._postings.get(term)
+            if plist is None:
+                continue
+            plist.pop(candidate_id, None)
+            if not plist:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(candidate_id, 0)
+
+    def mark_dirty(self, candidate_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._dirty.update(i for i in candidate_ids if i)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_len.clear()
+            self._total_len = 0
+            self._loaded = False
+            self._dirty.clear()
+            self._high_water = None
+            self._last_sync = 0.0
+
+    # --------------------------------------------------------
+    # DB SYNC
+    # --------------------------------------------------------
+
+    def _advance_high_water(self, updated_at: Optional[datetime]) -> None:
+        if updated_at and (self._high_water is None or updated_at > self._high_water):
+            self._high_water = updated_at
+
+    def rebuild(self) -> int:
+        """Build the index from scratch, streaming candidates in id order."""
+        started = time.perf_counter()
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_len.clear()
+            self._total_len = 0
+            self._dirty.clear()
+            self._high_water = None
+
+        indexed = 0
+        last_id = None
+        db = SessionLocal()
+        try:
+            while True:
+                q = (
+                    db.query(models.Candidate)
+                    .options(selectinload(models.Candidate.certifications))
+                    .filter(models.Candidate.merged_into_id.is_(None))
+                    .filter(models.Candidate.is_active == True)
+                )
+                if last_id is not None:
+                    q = q.filter(models.Candidate.id > last_id)
+                batch = q.order_by(models.Candidate.id.asc()).limit(self.REBUILD_BATCH_SIZE).all()
+                if not batch:
+                    break
+                for c in batch:
+                    self.index_text(c.id, candidate_document(c))
+                    with self._lock:
+                        self._advance_high_water(c.updated_at)
+                    indexed += 1
+                last_id = batch[-1].id
+                db.expunge_all()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._loaded = True
+            self._last_sync = time.monotonic()
+
+        logger.info(
+            "Candidate search index built: %s docs, %s terms in %.0f ms",
+            indexed,
+            len(self._postings),
+            (time.perf_counter() - started) * 1000,
+        )
+        return indexed
+
+    def ensure_fresh(self, db: Session, force: bool = False) -> None:
+        """
+        Build on first use, then apply pending changes.
+
+        Local commits are applied immediately via the dirty set; rows changed by
+        other workers are picked up at most every SYNC_INTERVAL_SECONDS.
+        """
+        if not self._loaded:
+            with self._build_lock:
+                if not self._loaded:
+                    self.rebuild()
+            return
+
+        with self._lock:
+            dirty = set(self._dirty)
+            self._dirty.clear()
+            since = self._high_water
+            poll = force or (time.monotonic() - self._last_sync) >= self.SYNC_INTERVAL_SECONDS
+            if poll:
+                self._last_sync = time.monotonic()
+
+        conditions = []
+        if dirty:
+            conditions.append(models.Candidate.id.in_(list(dirty)))
+        if poll and since is not None:
+            conditions.append(models.Candidate.updated_at >= since)
+        if not conditions:
+            return
+
+        try:
+            rows = (
+                db.query(models.Candidate)
+                .options(selectinload(models.Candidate.certifications))
+                .filter(or_(*conditions))
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Candidate search index sync failed: {e}")
+            self.mark_dirty(dirty)
+            return
+
+        seen = set()
+        for c in rows:
+            seen.add(c.id)
+            self.add_candidate(c)
+            with self._lock:
+                self._advance_high_water(c.updated_at)
+
+        # Dirty ids that no longer exist were deleted
+        for candidate_id in dirty - seen:
+            self.remove(candidate_id)
+
+    # --------------------------------------------------------
+    # READ PATH
+    # --------------------------------------------------------
+
+    def search(self, query_tokens: List[str], limit: Optional[int] = None) -> Dict[str, float]:
+        """
+        BM25 scores for every candidate containing at least one query term.
+        """
+        terms = list(dict.fromkeys(t for t in query_tokens or [] if t))
+        if not terms:
+            return {}
+
+        with self._lock:
+            n_docs = len(self._doc_len)
+            if not n_docs:
+                return {}
+            avg_len = self._total_len / n_docs
+            k1 = self.k1
+            b = self.b
+            doc_len = self._doc_len
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                plist = self._postings.get(term)
+                if not plist:
+                    continue
+                df = len(plist)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for candidate_id, tf in plist.items():
+                    norm = k1 * (1.0 - b + b * (doc_len[candidate_id] / avg_len))
+                    scores[candidate_id] = scores.get(candidate_id, 0.0) + idf * (tf * (k1 + 1.0)) / (tf + norm)
+
+        if limit is not None and len(scores) > limit:
+            top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+            return dict(top)
+        return scores
+
+    def keyword_scores(self, query_tokens: List[str]) -> Dict[str, float]:
+        """
+        BM25 scores rescaled to the 0-100 range used by the Resdex scorers
+        (best match for the query = 100). Candidates without any query term
+        are absent and should be treated as 0.
+        """
+        raw = self.search(query_tokens)
+        if not raw:
+            return {}
+        top = max(raw.values())
+        if top <= 0:
+            return {}
+        return {cid: float(min(100.0, (s / top) * 100.0)) for cid, s in raw.items()}
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "documents": len(self._doc_len),
+                "terms": len(self._postings),
+                "pending": len(self._dirty),
+                "high_water": self._high_water.isoformat() if self._high_water else None,
+            }
+
+
+# Global instance
+candidate_search_index = CandidateSearchIndex()
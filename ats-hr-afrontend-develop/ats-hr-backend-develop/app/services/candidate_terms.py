@@ -0,0 +1,222 @@
+"""
+Normalized candidate skill / tag / certification terms for SQL filtering.
+
+``candidates.skills`` and ``candidates.tags`` are JSON blobs, so filtering
+them means casting to text and ``ILIKE '%x%'`` — a sequential scan that also
+matches "java" inside "javascript". The ``candidate_terms`` side table holds
+one row per (candidate, kind, normalized value) with a
+``(kind, value, candidate_id)`` index, so Resdex filters become indexed
+``IN (SELECT candidate_id ...)`` predicates on SQLite and Postgres alike.
+
+Rows are rewritten inside the flush that changes the candidate (see
+``app.events.candidate_terms_listeners``) and backfilled at startup by
+``app.db.ensure_candidate_terms``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.engine import Connection
+
+from app import models
+from app.utils.resdex_search_engine import SYNONYMS
+
+SKILL = "skill"
+TAG = "tag"
+CERT = "cert"
+
+BACKFILL_BATCH_SIZE = 500
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _clean(value: Any) -> str:
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("value") or ""
+    return _WS_RE.sub(" ", str(value or "")).strip().lower()
+
+
+def normalize_term(value: Any) -> str:
+    """Lowercased, whitespace-collapsed, synonym-mapped ("k8s" -> "kubernetes")."""
+    term = _clean(value)
+    return SYNONYMS.get(term, term)
+
+
+def _as_list(value: Any) -> List[Any]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return value.split(",")
+    if isinstance(value, dict):
+        return [value]
+    try:
+        return list(value)
+    except TypeError:
+        return [value]
+
+
+def _resume_certifications(parsed_resume: Any) -> List[Any]:
+    """Certification entries the resume parser found (``certifications`` / ``certifications_text``)."""
+    if not isinstance(parsed_resume, dict):
+        return []
+    return _as_list(parsed_resume.get("certifications")) + _as_list(parsed_resume.get("certifications_text"))
+
+
+def build_terms(
+    skills: Any = None,
+    tags: Any = None,
+    cert_names: Iterable[str] = (),
+    certifications_text: Optional[str] = None,
+    parsed_resume: Any = None,
+) -> Set[Tuple[str, str]]:
+    terms: Set[Tuple[str, str]] = set()
+    certs = list(cert_names) + _as_list(certifications_text) + _resume_certifications(parsed_resume)
+    for kind, values, normalize in (
+        (SKILL, _as_list(skills), normalize_term),
+        (TAG, _as_list(tags), normalize_term),
+        # Certifications are substring-matched, so no synonym mapping
+        (CERT, certs, _clean),
+    ):
+        for value in values:
+            term = normalize(value)
+            if term:
+                terms.add((kind, term[:255]))
+    return terms
+
+
+# ============================================================
+# WRITE PATH
+# ============================================================
+
+def sync_candidate_terms(conn: Connection, candidate_ids: Iterable[str]) -> int:
+    """Recompute the term rows of the given candidates on ``conn``."""
+    ids = [i for i in dict.fromkeys(candidate_ids) if i]
+    if not ids:
+        return 0
+
+    candidates = models.Candidate.__table__
+    certifications = models.Certification.__table__
+    terms_table = models.CandidateTerm.__table__
+
+    rows = conn.execute(
+        select(
+            candidates.c.id,
+            candidates.c.skills,
+            candidates.c.tags,
+            candidates.c.certifications_text,
+            candidates.c.parsed_resume,
+        )
+        .where(candidates.c.id.in_(ids))
+    ).fetchall()
+    cert_names: Dict[str, List[str]] = {}
+    for candidate_id, name in conn.execute(
+        select(certifications.c.candidate_id, certifications.c.name)
+        .where(certifications.c.candidate_id.in_(ids))
+    ).fetchall():
+        cert_names.setdefault(candidate_id, []).append(name)
+
+    values = []
+    for candidate_id, skills, tags, certifications_text, parsed_resume in rows:
+        for kind, value in build_terms(
+            skills, tags, cert_names.get(candidate_id, []), certifications_text, parsed_resume
+        ):
+            values.append({"candidate_id": candidate_id, "kind": kind, "value": value})
+
+    conn.execute(delete(terms_table).where(terms_table.c.candidate_id.in_(ids)))
+    if values:
+        conn.execute(insert(terms_table), values)
+    return len(values)
+
+
+def delete_candidate_terms(conn: Connection, candidate_ids: Iterable[str]) -> None:
+    ids = [i for i in candidate_ids if i]
+    if ids:
+        terms_table = models.CandidateTerm.__table__
+        conn.execute(delete(terms_table).where(terms_table.c.candidate_id.in_(ids)))
+
+
+def backfill_candidate_terms(conn: Connection) -> int:
+    """Create term rows for candidates that have none (e.g. bulk inserts)."""
+    candidates = models.Candidate.__table__
+    terms_table = models.CandidateTerm.__table__
+
+    has_terms = select(terms_table.c.candidate_id).where(terms_table.c.candidate_id == candidates.c.id).exists()
+    has_values = or_(
+        candidates.c.skills.isnot(None),
+        candidates.c.tags.isnot(None),
+        candidates.c.certifications_text.isnot(None),
+        candidates.c.parsed_resume.isnot(None),
+        select(models.Certification.__table__.c.id)
+        .where(models.Certification.__table__.c.candidate_id == candidates.c.id)
+        .exists(),
+    )
+
+    written = 0
+    last_id = ""
+    while True:
+        ids = [
+            row[0]
+            for row in conn.execute(
+                select(candidates.c.id)
+                .where(and_(candidates.c.id > last_id, ~has_terms, has_values))
+                .order_by(candidates.c.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).fetchall()
+        ]
+        if not ids:
+            break
+        written += sync_candidate_terms(conn, ids)
+        last_id = ids[-1]
+    return written
+
+
+# ============================================================
+# READ PATH (SQL predicates on models.Candidate)
+# ============================================================
+
+def _candidates_with(kind: str, *conditions):
+    terms = models.CandidateTerm
+    return select(terms.candidate_id).where(terms.kind == kind, *conditions)
+
+
+def term_filter(kind: str, values: Iterable[str], logic: str = "AND"):
+    """
+    Candidates having all (AND) or any (OR) of ``values`` as exact,
+    normalized terms of ``kind``. Returns None when there is nothing to filter.
+    """
+    wanted = list(dict.fromkeys(v for v in (normalize_term(x) for x in values) if v))
+    if not wanted:
+        return None
+
+    terms = models.CandidateTerm
+    subq = _candidates_with(kind, terms.value.in_(wanted))
+    if (logic or "").strip().upper() != "OR" and len(wanted) > 1:
+        subq = subq.group_by(terms.candidate_id).having(func.count(func.distinct(terms.value)) == len(wanted))
+    return models.Candidate.id.in_(subq)
+
+
+def skills_filter(values: Iterable[str], logic: str = "AND"):
+    return term_filter(SKILL, values, logic)
+
+
+def tags_filter(values: Iterable[str], logic: str = "AND"):
+    return term_filter(TAG, values, logic)
+
+
+def certifications_filter(values: Iterable[str]):
+    """
+    Candidates holding any certification whose name contains one of
+    ``values``: ``Certification`` rows, ``certifications_text`` and the
+    certifications in ``parsed_resume``. Mentions elsewhere in the resume or
+    summary text are not matched.
+    """
+    wanted = [v for v in (_clean(x) for x in values) if v]
+    if not wanted:
+        return None
+    terms = models.CandidateTerm
+    return models.Candidate.id.in_(
+        _candidates_with(CERT, or_(*[terms.value.contains(v, autoescape=True) for v in wanted]))
+    )
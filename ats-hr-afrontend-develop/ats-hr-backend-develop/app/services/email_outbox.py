@@ -0,0 +1,340 @@
+"""
+Durable outbound-email queue.
+
+Emails are written to the ``email_outbox`` table in the caller's transaction,
+so nothing is lost if the web worker restarts before they go out. A drain
+claims due rows in batches (an UPDATE guarded by the row's status, so two
+processes never claim the same row), delivers them over the pooled SMTP
+connections of ``app.services.mail_transport`` from a few sender threads, and
+records status, attempt count and the next retry time in one bulk update.
+Candidate invites (``CandidateInvite.outbox_id``) follow their email's final
+outcome in the same transaction.
+
+Rows left in ``sending`` by a process that died are claimed again after
+``EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS``.
+
+Drained by the ``email_outbox`` job of ``setup_background_scheduler`` in
+``app.passive_requirement_monitor``; ``wake_outbox_worker()`` starts a drain
+right away after a commit instead of waiting for the next tick.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import SessionLocal
+from app.email_service import build_message, resolve_smtp_settings
+from app.services.mail_transport import MAIL_SENDER_THREADS, is_transient, mail_transport
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_POLL_SECONDS = int(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "15"))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+EMAIL_OUTBOX_MAX_BATCHES_PER_TICK = int(os.getenv("EMAIL_OUTBOX_MAX_BATCHES_PER_TICK", "20"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30"))
+EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS = int(os.getenv("EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS", "300"))
+
+EMAIL_LOG_BACKFILL_BATCH_SIZE = 500
+
+PENDING_STATUSES = ("queued", "retrying")
+
+# Final outbox status -> status of the CandidateInvite the email carries
+INVITE_STATUSES = {"sent": "job_invite_sent", "skipped": "job_invite_sent", "failed": "failed"}
+
+_RUN_LOCK = threading.Lock()
+_senders = ThreadPoolExecutor(max_workers=max(1, MAIL_SENDER_THREADS), thread_name_prefix="email-outbox")
+
+
+def enqueue_email(
+    db: Session,
+    to_email: str,
+    subject: str,
+    text: Optional[str] = None,
+    html_content: Optional[str] = None,
+    created_by: Optional[str] = None,
+) -> models.EmailOutbox:
+    """
+    Add an outbox row to ``db`` (committed by the caller). Call
+    ``wake_outbox_worker()`` after the commit for prompt delivery.
+    """
+    row = models.EmailOutbox(
+        id=models.generate_uuid(),
+        to_email=to_email,
+        subject=subject,
+        text_body=text,
+        html_body=html_content,
+        status="queued",
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+        created_by=created_by,
+    )
+    db.add(row)
+    return row
+
+
+def outbox_status(db: Session, message_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    ids = [m for m in message_ids if m]
+    if not ids:
+        return []
+    outbox = models.EmailOutbox
+    rows = {
+        r.id: r
+        for r in db.query(
+            outbox.id, outbox.status, outbox.attempts, outbox.last_error, outbox.next_attempt_at, outbox.sent_at
+        ).filter(outbox.id.in_(ids))
+    }
+    results = []
+    for message_id in ids:
+        r = rows.get(message_id)
+        if r is None:
+            results.append({"message_id": message_id, "status": "unknown"})
+            continue
+        results.append(
+            {
+                "message_id": message_id,
+                "status": r.status,
+                "attempts": r.attempts,
+                "error": r.last_error,
+                "next_attempt_at": r.next_attempt_at if r.status == "retrying" else None,
+                "sent_at": r.sent_at,
+            }
+        )
+    return results
+
+
+def candidate_email_history(db: Session, candidate_id: str, limit: int = 200) -> List[Dict[str, Any]]:
+    """Newest-first emails sent to a candidate, with their delivery status."""
+    logs = models.CandidateEmailLog
+    outbox = models.EmailOutbox
+    rows = (
+        db.query(logs.subject, logs.body, logs.sent_at, logs.sent_by, outbox.status)
+        .outerjoin(outbox, outbox.id == logs.outbox_id)
+        .filter(logs.candidate_id == candidate_id)
+        .order_by(logs.sent_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "subject": r.subject,
+            "body": r.body,
+            "sent_at": r.sent_at.isoformat() if r.sent_at else None,
+            "sent_by": r.sent_by,
+            "status": r.status or "sent",
+        }
+        for r in rows
+    ]
+
+
+def backfill_candidate_email_logs(conn: Connection) -> int:
+    """Copy legacy ``candidates.email_logs`` JSON entries into candidate_email_logs."""
+    candidates = models.Candidate.__table__
+    log_table = models.CandidateEmailLog.__table__
+    has_rows = select(log_table.c.id).where(log_table.c.candidate_id == candidates.c.id).exists()
+
+    written = 0
+    last_id = ""
+    while True:
+        batch = conn.execute(
+            select(candidates.c.id, candidates.c.email_logs)
+            .where(candidates.c.id > last_id, candidates.c.email_logs.isnot(None), ~has_rows)
+            .order_by(candidates.c.id)
+            .limit(EMAIL_LOG_BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            break
+        rows = []
+        for candidate_id, entries in batch:
+            for entry in entries if isinstance(entries, list) else []:
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    sent_at = datetime.fromisoformat(str(entry.get("sent_at")))
+                except ValueError:
+                    sent_at = None
+                rows.append(
+                    {
+                        "id": models.generate_uuid(),
+                        "candidate_id": candidate_id,
+                        "outbox_id": None,
+                        "subject": entry.get("subject"),
+                        "body": entry.get("body"),
+                        "sent_by": entry.get("sent_by"),
+                        "sent_at": sent_at,
+                    }
+                )
+        if rows:
+            conn.execute(insert(log_table), rows)
+            written += len(rows)
+        last_id = batch[-1][0]
+    return written
+
+
+# ============================================================
+# DRAIN
+# ============================================================
+
+def _claimable(now: datetime):
+    outbox = models.EmailOutbox
+    stale = now - timedelta(seconds=EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS)
+    return or_(
+        and_(outbox.status.in_(PENDING_STATUSES), outbox.next_attempt_at <= now),
+        and_(outbox.status == "sending", outbox.claimed_at < stale),
+    )
+
+
+def _claim_batch(db: Session, now: datetime, batch_size: int) -> List[Tuple[str, str, str, Optional[str], Optional[str], int]]:
+    outbox = models.EmailOutbox
+    due = [
+        row[0]
+        for row in db.execute(
+            select(outbox.id).where(_claimable(now)).order_by(outbox.next_attempt_at).limit(batch_size)
+        )
+    ]
+    if not due:
+        return []
+
+    token = uuid.uuid4().hex
+    # The claimable condition is re-checked per row, so a row another
+    # process claimed in between is left alone
+    db.execute(
+        update(outbox)
+        .where(outbox.id.in_(due), _claimable(now))
+        .values(status="sending", claim_token=token, claimed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return [
+        tuple(row)
+        for row in db.query(
+            outbox.id, outbox.to_email, outbox.subject, outbox.text_body, outbox.html_body, outbox.attempts
+        ).filter(outbox.claim_token == token, outbox.status == "sending")
+    ]
+
+
+def _send_one(settings, item) -> Optional[BaseException]:
+    _, to_email, subject, text, html_content, _ = item
+    mail_transport.bucket.acquire()
+    try:
+        mail_transport.deliver(settings, build_message(settings, to_email, subject, text, html_content), to_email)
+    except Exception as e:
+        return e
+    return None
+
+
+def drain_batch(db: Session, now: Optional[datetime] = None, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Claim and deliver up to ``batch_size`` due emails. Returns counts by outcome.
+    """
+    now = now or datetime.utcnow()
+    batch = _claim_batch(db, now, batch_size)
+    counts = {"claimed": len(batch), "sent": 0, "retrying": 0, "failed": 0, "skipped": 0}
+    if not batch:
+        return counts
+
+    settings = resolve_smtp_settings()
+    if settings.enabled:
+        errors = list(_senders.map(lambda item: _send_one(settings, item), batch))
+    else:
+        errors = [None] * len(batch)
+
+    finished = datetime.utcnow()
+    updates = []
+    for item, error in zip(batch, errors):
+        attempts = item[5] + (1 if settings.enabled else 0)
+        values = {
+            "b_id": item[0],
+            "status": "sent",
+            "attempts": attempts,
+            "last_error": None,
+            "next_attempt_at": finished,
+            "sent_at": finished,
+        }
+        if not settings.enabled:
+            values.update(status="skipped", sent_at=None)
+        elif error is not None:
+            values.update(last_error=str(error)[:1000], sent_at=None)
+            if is_transient(error) and attempts < EMAIL_OUTBOX_MAX_ATTEMPTS:
+                values.update(
+                    status="retrying",
+                    next_attempt_at=finished + timedelta(seconds=EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))),
+                )
+            else:
+                values["status"] = "failed"
+                logger.error(f"Email to {item[1]} failed after {attempts} attempt(s): {error}")
+        counts[values["status"]] += 1
+        updates.append(values)
+
+    table = models.EmailOutbox.__table__
+    # executemany: the remaining keys of each dict become the SET clause
+    db.execute(table.update().where(table.c.id == bindparam("b_id")).values(claim_token=None), updates)
+    _sync_invites(db, updates)
+    db.commit()
+    return counts
+
+
+def _sync_invites(db: Session, updates: List[Dict[str, Any]]) -> None:
+    invites = models.CandidateInvite
+    by_status: Dict[str, List[str]] = {}
+    for values in updates:
+        invite_status = INVITE_STATUSES.get(values["status"])
+        if invite_status:
+            by_status.setdefault(invite_status, []).append(values["b_id"])
+    for invite_status, outbox_ids in by_status.items():
+        db.execute(
+            update(invites)
+            .where(invites.outbox_id.in_(outbox_ids), invites.status == "queued")
+            .values(status=invite_status)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def run_email_outbox_tick() -> Dict[str, Any]:
+    """
+    Entry point for the background scheduler: drain until the queue has no
+    due rows (bounded per tick).
+    """
+    if not _RUN_LOCK.acquire(blocking=False):
+        return {"skipped": "already running"}
+    db = SessionLocal()
+    totals = {"claimed": 0, "sent": 0, "retrying": 0, "failed": 0, "skipped": 0}
+    try:
+        for _ in range(max(1, EMAIL_OUTBOX_MAX_BATCHES_PER_TICK)):
+            counts = drain_batch(db)
+            for key, value in counts.items():
+                totals[key] += value
+            if counts["claimed"] < EMAIL_OUTBOX_BATCH_SIZE:
+                break
+        if totals["claimed"]:
+            logger.info(
+                f"Email outbox: {totals['sent']} sent, {totals['retrying']} to retry, "
+                f"{totals['failed']} failed, {totals['skipped']} skipped"
+            )
+        return totals
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Email outbox tick failed: {e}")
+        return {"error": str(e)}
+    finally:
+        db.close()
+        _RUN_LOCK.release()
+
+
+def wake_outbox_worker() -> None:
+    """Start a drain in the background now (no-op if one is already running)."""
+    if _RUN_LOCK.locked():
+        return
+    threading.Thread(target=run_email_outbox_tick, name="email-outbox-wake", daemon=True).start()
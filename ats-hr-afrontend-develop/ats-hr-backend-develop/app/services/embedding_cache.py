@@ -0,0 +1,260 @@
+"""
+Bounded embedding cache shared by every embedding consumer.
+
+Entries are keyed by a SHA-256 of the model name and the normalized text:
+whitespace is collapsed, and the text is lowercased only for uncased models
+(where it does not change the vector). The in-memory tier is an LRU capped at
+``max_entries``. An opt-in SQLite tier (``EMBEDDING_CACHE_DB``, an absolute
+path) keeps vectors across restarts and refills the memory tier on a miss;
+it is capped at ``EMBEDDING_CACHE_DISK_SIZE`` rows and evicts the least
+recently used ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+# Disk tier is off unless an absolute path is configured
+EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB") or None
+EMBEDDING_CACHE_DISK_SIZE = int(os.getenv("EMBEDDING_CACHE_DISK_SIZE", "200000"))
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str, lowercase: bool = True) -> str:
+    text = _WS_RE.sub(" ", str(text or "")).strip()
+    return text.lower() if lowercase else text
+
+
+def cache_key(model_name: str, text: str, lowercase: bool = False) -> str:
+    """Cache key of ``text`` for ``model_name``; pass ``lowercase`` only for uncased models."""
+    payload = f"{model_name}\x00{normalize_text(text, lowercase)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU of key -> float32 vector, with an optional SQLite spill tier.
+    """
+
+    # Fraction of the disk cap kept after an eviction pass
+    DISK_PRUNE_TO = 0.9
+
+    def __init__(
+        self,
+        max_entries: int = EMBEDDING_CACHE_SIZE,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = EMBEDDING_CACHE_DISK_SIZE,
+    ):
+        self.max_entries = max(1, max_entries)
+        if disk_path and not os.path.isabs(disk_path):
+            logger.warning(f"Embedding disk cache disabled: EMBEDDING_CACHE_DB must be absolute ({disk_path})")
+            disk_path = None
+        self.disk_path = disk_path or None
+        self.max_disk_entries = max(1, max_disk_entries)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._stats = {
+            "hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0, "disk_errors": 0,
+        }
+
+        self._disk_lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_failed = False
+        self._disk_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --------------------------------------------------------
+    # DISK TIER
+    # --------------------------------------------------------
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.disk_path is None or self._disk_failed:
+            return None
+        if self._disk is None:
+            try:
+                directory = os.path.dirname(self.disk_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.disk_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embedding_cache "
+                    "(key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, "
+                    "used_at REAL NOT NULL DEFAULT 0)"
+                )
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(embedding_cache)")}
+                if "used_at" not in columns:
+                    conn.execute("ALTER TABLE embedding_cache ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_embedding_cache_used_at ON embedding_cache (used_at)")
+                conn.commit()
+                self._disk_rows = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+                self._disk = conn
+            except Exception as e:
+                self._disk_failed = True
+                logger.warning(f"Embedding disk cache disabled ({self.disk_path}): {e}")
+                return None
+        return self._disk
+
+    def _disk_get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return found
+            try:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" for _ in chunk)
+                    rows = conn.execute(
+                        f"SELECT key, dim, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for key, dim, blob in rows:
+                        vec = np.frombuffer(blob, dtype=np.float32)
+                        if vec.shape[0] == dim:
+                            found[key] = vec
+                if found:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE embedding_cache SET used_at = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+                    conn.commit()
+            except Exception as e:
+                self._stats["disk_errors"] += 1
+                logger.warning(f"Embedding disk cache read failed: {e}")
+        return found
+
+    def _disk_put_many(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        if not items:
+            return
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (key, dim, vector, used_at) VALUES (?, ?, ?, ?)",
+                    [(key, int(vec.shape[0]), vec.tobytes(), now) for key, vec in items],
+                )
+                conn.commit()
+                # Replacements over-count; the exact count is taken when pruning
+                self._disk_rows += len(items)
+                if self._disk_rows > self.max_disk_entries:
+                    self._prune_disk_locked(conn)
+            except Exception as e:
+                self._stats["disk_errors"] += 1
+                logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def _prune_disk_locked(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        if rows > self.max_disk_entries:
+            excess = rows - int(self.max_disk_entries * self.DISK_PRUNE_TO)
+            conn.execute(
+                "DELETE FROM embedding_cache WHERE key IN "
+                "(SELECT key FROM embedding_cache ORDER BY used_at LIMIT ?)",
+                (excess,),
+            )
+            conn.commit()
+            self._stats["disk_evictions"] += excess
+            rows -= excess
+        self._disk_rows = rows
+
+    # --------------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------------
+
+    def _remember_locked(self, key: str, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get_many(self, keys: Iterable[str], disk: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Cached vectors for whichever keys are known (memory, then disk).
+
+        With ``disk=False`` only the memory tier is probed, which never blocks
+        on I/O; stats are recorded only when every key is found, since a
+        partial probe is followed by a full lookup.
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                vec = self._entries.get(key)
+                if vec is None:
+                    missing.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = vec
+            if disk or not missing:
+                self._stats["hits"] += len(found)
+
+        if missing and disk:
+            from_disk = self._disk_get_many(missing)
+            with self._lock:
+                for key, vec in from_disk.items():
+                    self._remember_locked(key, vec)
+                found.update(from_disk)
+                self._stats["disk_hits"] += len(from_disk)
+                self._stats["misses"] += len(missing) - len(from_disk)
+        return found
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        prepared = [(key, np.ascontiguousarray(vec, dtype=np.float32).reshape(-1)) for key, vec in items]
+        with self._lock:
+            for key, vec in prepared:
+                vec.setflags(write=False)
+                self._remember_locked(key, vec)
+        self._disk_put_many(prepared)
+
+    def put(self, key: str, vector: Any) -> None:
+        self.put_many([(key, vector)])
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+        if disk:
+            with self._disk_lock:
+                conn = self._connection()
+                if conn is not None:
+                    conn.execute("DELETE FROM embedding_cache")
+                    conn.commit()
+                    self._disk_rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._entries)
+        lookups = out["hits"] + out["disk_hits"] + out["misses"]
+        out["max_entries"] = self.max_entries
+        out["hit_rate"] = round((out["hits"] + out["disk_hits"]) / lookups, 4) if lookups else 0.0
+        out["disk"] = self.disk_path if self._disk is not None else None
+        out["disk_entries"] = self._disk_rows if self._disk is not None else 0
+        out["max_disk_entries"] = self.max_disk_entries
+        return out
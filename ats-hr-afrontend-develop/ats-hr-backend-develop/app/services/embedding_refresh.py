@@ -0,0 +1,204 @@
+"""
+Background re-embedding of candidates and jobs.
+
+A row needs a (re-)embed when its vector is missing, was produced by another
+model version (``EMBEDDING_MODEL_VERSION``), or is older than the row's
+``updated_at``. Stale rows are streamed in keyset batches, encoded through
+the shared embedding service and written back with one executemany UPDATE
+per batch. A texts/second cap keeps the job from starving request traffic.
+
+Scheduled from ``setup_background_scheduler`` in
+``app.passive_requirement_monitor``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import and_, bindparam, or_
+from sqlalchemy.orm import Session
+
+from app import models
+from app.ai_core import candidate_embedding_text, job_embedding_text
+from app.db import SessionLocal
+from app.services.embedding_service import EMBEDDING_MODEL_VERSION, embedding_service
+from app.services.vector_index import candidate_vector_index, job_vector_index
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_REFRESH_INTERVAL_MINUTES = int(os.getenv("EMBEDDING_REFRESH_INTERVAL_MINUTES", "10"))
+EMBEDDING_REFRESH_BATCH_SIZE = int(os.getenv("EMBEDDING_REFRESH_BATCH_SIZE", "256"))
+EMBEDDING_REFRESH_MAX_PER_RUN = int(os.getenv("EMBEDDING_REFRESH_MAX_PER_RUN", "20000"))
+EMBEDDING_REFRESH_MAX_PER_SECOND = float(os.getenv("EMBEDDING_REFRESH_MAX_PER_SECOND", "100"))
+
+_RUN_LOCK = threading.Lock()
+
+
+def _candidate_text(row: Any) -> str:
+    return candidate_embedding_text(
+        {
+            "name": row.full_name or "",
+            "skills": row.skills or [],
+            "experience": row.experience or "",
+            "internal_notes": row.internal_notes or "",
+        }
+    )
+
+
+def _job_text(row: Any) -> str:
+    return job_embedding_text(
+        {
+            "title": row.title or "",
+            "description": row.description or "",
+            "skills": row.skills or "",
+        }
+    )
+
+
+# entity -> (text columns, text builder, vector index to notify)
+TARGETS: Dict[str, tuple] = {
+    "candidates": (
+        models.Candidate,
+        ("full_name", "skills", "experience", "internal_notes"),
+        _candidate_text,
+        candidate_vector_index,
+    ),
+    "jobs": (
+        models.Job,
+        ("title", "description", "skills"),
+        _job_text,
+        job_vector_index,
+    ),
+}
+
+
+def stale_embedding_filter(model: Any, version: str = EMBEDDING_MODEL_VERSION):
+    """Rows whose embedding is missing, from another model, or older than the row."""
+    return or_(
+        model.embedding_vector.is_(None),
+        model.embedding_model.is_(None),
+        model.embedding_model != version,
+        model.embedding_updated_at.is_(None),
+        and_(model.updated_at.isnot(None), model.updated_at > model.embedding_updated_at),
+    )
+
+
+def _searchable_filters(model: Any) -> list:
+    filters = []
+    if hasattr(model, "merged_into_id"):
+        filters.append(model.merged_into_id.is_(None))
+    if hasattr(model, "is_active"):
+        filters.append(model.is_active == True)
+    return filters
+
+
+def refresh_embeddings(
+    db: Session,
+    model: Any,
+    text_columns: tuple,
+    text_fn: Callable[[Any], str],
+    store: Any = None,
+    batch_size: int = EMBEDDING_REFRESH_BATCH_SIZE,
+    limit: int = EMBEDDING_REFRESH_MAX_PER_RUN,
+    max_per_second: float = EMBEDDING_REFRESH_MAX_PER_SECOND,
+    version: str = EMBEDDING_MODEL_VERSION,
+    encode: Optional[Callable] = None,
+) -> int:
+    """
+    Re-embed up to ``limit`` stale rows of ``model``. Returns rows written.
+    """
+    encode = encode or embedding_service.encode
+    table = model.__table__
+    vector_column = model.embedding_vector.property.columns[0].name
+
+    # updated_at is assigned to itself so the Candidate onupdate hook does not
+    # fire: re-embedding is not a profile edit and must not mark it stale again
+    stmt = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            {
+                vector_column: bindparam("b_vector"),
+                "embedding_model": version,
+                "embedding_updated_at": bindparam("b_embedded_at"),
+                "updated_at": table.c.updated_at,
+            }
+        )
+    )
+    columns = [model.id] + [getattr(model, name) for name in text_columns]
+
+    started = time.monotonic()
+    written = 0
+    last_id = None
+    while written < limit:
+        # Taken before reading, so an edit that lands while we encode keeps
+        # updated_at > embedding_updated_at and is picked up next run
+        snapshot = datetime.utcnow()
+        q = db.query(*columns).filter(stale_embedding_filter(model, version)).filter(*_searchable_filters(model))
+        if last_id is not None:
+            q = q.filter(model.id > last_id)
+        rows = q.order_by(model.id.asc()).limit(min(batch_size, limit - written)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        vectors = encode([text_fn(row) for row in rows])
+        db.execute(
+            stmt,
+            [
+                {"b_id": row.id, "b_vector": vector, "b_embedded_at": snapshot}
+                for row, vector in zip(rows, vectors)
+            ],
+        )
+        db.commit()
+        if store is not None:
+            store.mark_dirty([row.id for row in rows])
+        written += len(rows)
+
+        if max_per_second > 0:
+            delay = written / max_per_second - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+    return written
+
+
+def run_embedding_refresh() -> Dict[str, Any]:
+    """
+    Entry point for the background scheduler.
+    """
+    if not _RUN_LOCK.acquire(blocking=False):
+        return {"skipped": "already running"}
+    try:
+        if not embedding_service.available:
+            logger.warning("Embedding refresh skipped: embedding model not available")
+            return {"skipped": "model unavailable"}
+
+        result: Dict[str, Any] = {"model_version": EMBEDDING_MODEL_VERSION}
+        db = SessionLocal()
+        try:
+            for name, (model, text_columns, text_fn, store) in TARGETS.items():
+                started = time.perf_counter()
+                try:
+                    result[name] = refresh_embeddings(db, model, text_columns, text_fn, store)
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Embedding refresh failed for {name}: {e}")
+                    result[name] = 0
+                    continue
+                if result[name]:
+                    logger.info(
+                        f"Re-embedded {result[name]} {name} in "
+                        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                    )
+        finally:
+            db.close()
+        result["run_time"] = datetime.utcnow().isoformat()
+        return result
+    finally:
+        _RUN_LOCK.release()
@@ -0,0 +1,275 @@
+"""
+Shared sentence-embedding service.
+
+Owns the single ``SentenceTransformer`` instance of the process (used by
+``app.ai_core``, ``MatchingService`` and the resume parser) instead of each
+of them loading its own copy of the weights.
+
+Encode requests from any thread or coroutine are queued; a collector thread
+coalesces whatever arrives within a short ``max_wait_ms`` window into one
+micro-batch, de-duplicates identical texts, and runs ``model.encode`` on a
+small thread pool. ``encode_async`` awaits the result without blocking the
+event loop.
+
+Vectors go through the shared ``EmbeddingCache`` (bounded LRU + optional
+on-disk tier). ``submit`` only probes the memory tier, so requests that are
+fully cached in memory never touch the queue and the caller (possibly the
+event loop) never waits on SQLite; the disk tier is read by the batch worker.
+Cache keys are case-insensitive only when the model's tokenizer lowercases
+its input (``do_lower_case``) or ``EMBEDDING_MODEL_UNCASED`` says so.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.embedding_cache import EMBEDDING_CACHE_DB, EmbeddingCache, cache_key
+
+try:
+    from sentence_transformers import SentenceTransformer
+    _ST_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    _ST_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+# Stored next to every embedding; bump it to trigger a background re-embed
+EMBEDDING_MODEL_VERSION = os.getenv("EMBEDDING_MODEL_VERSION", EMBEDDING_MODEL_NAME)
+EMBEDDING_DIM = 384
+# "1"/"0" to declare the model (un)cased; unset asks the loaded tokenizer
+_UNCASED_ENV = os.getenv("EMBEDDING_MODEL_UNCASED", "").strip().lower()
+EMBEDDING_MODEL_UNCASED = None if not _UNCASED_ENV else _UNCASED_ENV in ("1", "true", "yes")
+
+
+class EmbeddingService:
+    """
+    Single model instance + micro-batching encoder.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        max_batch_size: int = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "64")),
+        max_wait_ms: float = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5")),
+        workers: int = int(os.getenv("EMBEDDING_WORKERS", "1")),
+        cache: Optional[EmbeddingCache] = None,
+        uncased: Optional[bool] = EMBEDDING_MODEL_UNCASED,
+    ):
+        self.model_name = model_name
+        self.cache = cache
+        self.uncased = uncased
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.workers = max(1, workers)
+
+        self._model = None
+        self._model_failed = False
+        self._model_lock = threading.Lock()
+
+        self._queue: "queue.Queue[Tuple[List[str], Future]]" = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._collector: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "texts": 0, "encoded": 0}
+
+    # --------------------------------------------------------
+    # MODEL
+    # --------------------------------------------------------
+
+    def get_model(self):
+        """Load the model once per process. Returns None if unavailable."""
+        if self._model is not None or self._model_failed:
+            return self._model
+        with self._model_lock:
+            if self._model is None and not self._model_failed:
+                if not _ST_AVAILABLE:
+                    self._model_failed = True
+                    logger.warning("sentence-transformers not installed; embeddings disabled")
+                    return None
+                try:
+                    started = time.perf_counter()
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info(
+                        f"Embedding model {self.model_name} loaded in "
+                        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                    )
+                except Exception as e:
+                    self._model_failed = True
+                    logger.error(f"Error loading embedding model: {e}")
+        return self._model
+
+    def _is_uncased(self) -> bool:
+        """Whether the model ignores case; asks the tokenizer once (loading the model)."""
+        if self.uncased is None:
+            tokenizer = getattr(self.get_model(), "tokenizer", None)
+            self.uncased = bool(getattr(tokenizer, "do_lower_case", False))
+        return self.uncased
+
+    @property
+    def available(self) -> bool:
+        return self.get_model() is not None
+
+    @property
+    def dim(self) -> int:
+        model = self._model
+        if model is not None:
+            try:
+                return int(model.get_sentence_embedding_dimension())
+            except Exception:
+                pass
+        return EMBEDDING_DIM
+
+    # --------------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------------
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Queue texts for encoding. The future resolves to a float32 array of
+        shape (len(texts), dim), in input order.
+        """
+        texts = [str(t or "") for t in texts]
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, self.dim), dtype=np.float32))
+            return future
+
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["texts"] += len(texts)
+
+        # Until the model's casing is known the key is too, so go through the batcher
+        if self.cache is not None and self.uncased is not None:
+            keys = [self._key(t) for t in texts]
+            cached = self.cache.get_many(keys, disk=False)
+            if len(cached) == len(set(keys)):
+                future.set_result(np.stack([cached[k] for k in keys]))
+                return future
+
+        self._ensure_started()
+        self._queue.put((texts, future))
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+    def encode_one(self, text: str) -> np.ndarray:
+        return self.encode([text])[0]
+
+    async def encode_async(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    async def encode_one_async(self, text: str) -> np.ndarray:
+        return (await self.encode_async([text]))[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            out = dict(self._stats)
+        if self.cache is not None:
+            out["cache"] = self.cache.stats()
+        out.update(
+            {
+                "model": self.model_name,
+                "loaded": self._model is not None,
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+            }
+        )
+        return out
+
+    # --------------------------------------------------------
+    # BATCHING
+    # --------------------------------------------------------
+
+    def _key(self, text: str) -> str:
+        if self.cache is None:
+            return text
+        return cache_key(self.model_name, text, lowercase=self._is_uncased())
+
+    def _ensure_started(self) -> None:
+        if self._collector is not None:
+            return
+        with self._start_lock:
+            if self._collector is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embedding")
+            collector = threading.Thread(target=self._collect_loop, name="embedding-batcher", daemon=True)
+            collector.start()
+            self._collector = collector
+
+    def _collect_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            count = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+            while count < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                count += len(item[0])
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[Tuple[List[str], Future]]) -> None:
+        # De-duplicate identical texts across every request in the batch
+        unique: Dict[str, str] = {}
+        for texts, _ in batch:
+            for text in texts:
+                unique.setdefault(self._key(text), text)
+
+        vectors: Dict[str, np.ndarray] = {}
+        if self.cache is not None:
+            vectors.update(self.cache.get_many(list(unique)))
+        pending = [key for key in unique if key not in vectors]
+
+        try:
+            if pending:
+                model = self.get_model()
+                if model is None:
+                    raise RuntimeError(f"Embedding model {self.model_name} is not available")
+                encoded = model.encode(
+                    [unique[key] for key in pending],
+                    batch_size=self.max_batch_size,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                )
+                encoded = np.asarray(encoded, dtype=np.float32)
+                vectors.update(zip(pending, encoded))
+                if self.cache is not None:
+                    self.cache.put_many(zip(pending, encoded))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["encoded"] += len(pending)
+
+        for texts, future in batch:
+            if not future.done():
+                future.set_result(np.stack([vectors[self._key(t)] for t in texts]))
+
+
+# Global instance
+embedding_service = EmbeddingService(cache=EmbeddingCache(disk_path=EMBEDDING_CACHE_DB))
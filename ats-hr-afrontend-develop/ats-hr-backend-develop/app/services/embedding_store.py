@@ -0,0 +1,331 @@
+"""
+Contiguous in-memory embedding store for vectorized semantic scoring.
+
+All vectors of an entity type are kept L2-normalized in one float32 NumPy
+matrix with an id -> row map, so a query is scored against the whole pool
+(or any subset) with a single matrix-vector product instead of a Python
+``cosine_similarity`` call per row.
+
+The store builds lazily on first use and is kept fresh the same way as the
+Resdex inverted index: committed changes mark ids dirty
+(see ``app.events.search_index_listeners``) and ``updated_at`` /
+``embedding_updated_at`` high-water marks pick up writes from other worker
+processes (including the background re-embedding job).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 384
+
+
+def to_unit_vector(value: Any, dim: int = EMBEDDING_DIM) -> Optional[np.ndarray]:
+    """
+    Convert a stored/generated embedding to a normalized float32 vector.
+    Returns None for missing, malformed or all-zero vectors.
+    """
+    if value is None:
+        return None
+    try:
+        vec = np.asarray(value, dtype=np.float32).reshape(-1)
+    except (TypeError, ValueError):
+        return None
+    if vec.shape[0] != dim:
+        return None
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+    return vec / norm
+
+
+class EmbeddingStore:
+    """
+    id -> row mapping over a pre-normalized float32 matrix.
+    """
+
+    SYNC_INTERVAL_SECONDS = 5.0
+    REBUILD_BATCH_SIZE = 2000
+
+    def __init__(self, model: Any, dim: int = EMBEDDING_DIM, initial_capacity: int = 1024):
+        self.model = model
+        self.dim = dim
+
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        self._loaded = False
+        self._dirty: Set[str] = set()
+        self._high_water: Optional[datetime] = None
+        self._embedding_high_water: Optional[datetime] = None
+        self._last_sync = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # --------------------------------------------------------
+    # WRITE PATH
+    # --------------------------------------------------------
+
+    def upsert(self, entity_id: str, vector: Any) -> bool:
+        """Insert or replace a vector. Invalid vectors remove the entry."""
+        unit = to_unit_vector(vector, self.dim)
+        with self._lock:
+            if unit is None:
+                self._remove_locked(entity_id)
+                return False
+            row = self._rows.get(entity_id)
+            if row is None:
+                row = len(self._ids)
+                if row >= self._matrix.shape[0]:
+                    grown = np.zeros((max(1024, self._matrix.shape[0] * 2), self.dim), dtype=np.float32)
+                    grown[:row] = self._matrix[:row]
+                    self._matrix = grown
+                self._ids.append(entity_id)
+                self._rows[entity_id] = row
+            self._matrix[row] = unit
+            return True
+
+    def remove(self, entity_id: str) -> None:
+        with self._lock:
+            self._remove_locked(entity_id)
+
+    def _remove_locked(self, entity_id: str) -> None:
+        row = self._rows.pop(entity_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            # Move the last row into the hole to keep the matrix contiguous
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+
+    def mark_dirty(self, entity_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._dirty.update(i for i in entity_ids if i)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._rows.clear()
+            self._loaded = False
+            self._dirty.clear()
+            self._high_water = None
+            self._embedding_high_water = None
+            self._last_sync = 0.0
+
+    # --------------------------------------------------------
+    # DB SYNC
+    # --------------------------------------------------------
+
+    def _searchable_filters(self) -> list:
+        filters = []
+        if hasattr(self.model, "merged_into_id"):
+            filters.append(self.model.merged_into_id.is_(None))
+        if hasattr(self.model, "is_active"):
+            filters.append(self.model.is_active == True)
+        return filters
+
+    def _is_searchable(self, row: Any) -> bool:
+        if getattr(row, "merged_into_id", None):
+            return False
+        return getattr(row, "is_active", True) is not False
+
+    def _columns(self) -> list:
+        cols = [self.model.id, self.model.embedding_vector, self.model.updated_at]
+        for name in ("embedding_updated_at", "is_active", "merged_into_id"):
+            if hasattr(self.model, name):
+                cols.append(getattr(self.model, name))
+        return cols
+
+    def _advance_high_water(self, row: Any) -> None:
+        updated_at = row.updated_at
+        if updated_at and (self._high_water is None or updated_at > self._high_water):
+            self._high_water = updated_at
+        embedded_at = getattr(row, "embedding_updated_at", None)
+        if embedded_at and (self._embedding_high_water is None or embedded_at > self._embedding_high_water):
+            self._embedding_high_water = embedded_at
+
+    def rebuild(self) -> int:
+        """Load every stored vector, projecting only the columns we need."""
+        started = time.perf_counter()
+        with self._lock:
+            self._ids.clear()
+            self._rows.clear()
+            self._dirty.clear()
+            self._high_water = None
+            self._embedding_high_water = None
+
+        loaded = 0
+        last_id = None
+        db = SessionLocal()
+        try:
+            while True:
+                q = (
+                    db.query(*self._columns())
+                    .filter(self.model.embedding_vector.isnot(None))
+                    .filter(*self._searchable_filters())
+                )
+                if last_id is not None:
+                    q = q.filter(self.model.id > last_id)
+                batch = q.order_by(self.model.id.asc()).limit(self.REBUILD_BATCH_SIZE).all()
+                if not batch:
+                    break
+                with self._lock:
+                    for row in batch:
+                        if self.upsert(row.id, row.embedding_vector):
+                            loaded += 1
+                        self._advance_high_water(row)
+                last_id = batch[-1].id
+        finally:
+            db.close()
+
+        with self._lock:
+            self._loaded = True
+            self._last_sync = time.monotonic()
+
+        logger.info(
+            "%s embedding store built: %s vectors in %.0f ms",
+            self.model.__name__,
+            loaded,
+            (time.perf_counter() - started) * 1000,
+        )
+        return loaded
+
+    def ensure_fresh(self, db: Session, force: bool = False) -> None:
+        """Build on first use, then apply pending changes."""
+        if not self._loaded:
+            with self._build_lock:
+                if not self._loaded:
+                    self.rebuild()
+            return
+
+        with self._lock:
+            dirty = set(self._dirty)
+            self._dirty.clear()
+            since = self._high_water
+            embedded_since = self._embedding_high_water
+            poll = force or (time.monotonic() - self._last_sync) >= self.SYNC_INTERVAL_SECONDS
+            if poll:
+                self._last_sync = time.monotonic()
+
+        conditions = []
+        if dirty:
+            conditions.append(self.model.id.in_(list(dirty)))
+        if poll and since is not None:
+            conditions.append(self.model.updated_at >= since)
+        if poll and embedded_since is not None and hasattr(self.model, "embedding_updated_at"):
+            conditions.append(self.model.embedding_updated_at >= embedded_since)
+        if not conditions:
+            return
+
+        try:
+            rows = db.query(*self._columns()).filter(or_(*conditions)).all()
+        except Exception as e:
+            logger.error(f"{self.model.__name__} embedding store sync failed: {e}")
+            self.mark_dirty(dirty)
+            return
+
+        seen = set()
+        with self._lock:
+            for row in rows:
+                seen.add(row.id)
+                if self._is_searchable(row):
+                    self.upsert(row.id, row.embedding_vector)
+                else:
+                    self._remove_locked(row.id)
+                self._advance_high_water(row)
+            for entity_id in dirty - seen:
+                self._remove_locked(entity_id)
+
+    # --------------------------------------------------------
+    # READ PATH
+    # --------------------------------------------------------
+
+    def get(self, entity_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(entity_id)
+            return None if row is None else self._matrix[row].copy()
+
+    def similarities(self, query_vector: Any, entity_ids: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Cosine similarity of the query against every stored vector, or only
+        against ``entity_ids`` when given. Ids without a vector are omitted.
+        """
+        q = to_unit_vector(query_vector, self.dim)
+        if q is None:
+            return {}
+
+        with self._lock:
+            if entity_ids is None:
+                ids = list(self._ids)
+                scores = self._matrix[: len(ids)] @ q
+            else:
+                pairs = [(i, self._rows[i]) for i in entity_ids if i in self._rows]
+                if not pairs:
+                    return {}
+                ids = [p[0] for p in pairs]
+                rows = np.fromiter((p[1] for p in pairs), dtype=np.int64, count=len(pairs))
+                scores = self._matrix[rows] @ q
+
+        return dict(zip(ids, scores.tolist()))
+
+    def top_k(
+        self,
+        query_vector: Any,
+        k: int,
+        entity_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Best ``k`` (id, similarity) pairs, highest first, via argpartition."""
+        q = to_unit_vector(query_vector, self.dim)
+        if q is None or k <= 0:
+            return []
+
+        with self._lock:
+            if entity_ids is None:
+                ids = list(self._ids)
+                scores = self._matrix[: len(ids)] @ q
+            else:
+                pairs = [(i, self._rows[i]) for i in entity_ids if i in self._rows]
+                ids = [p[0] for p in pairs]
+                rows = np.fromiter((p[1] for p in pairs), dtype=np.int64, count=len(pairs))
+                scores = self._matrix[rows] @ q
+
+        n = scores.shape[0]
+        if n == 0:
+            return []
+        if k < n:
+            part = np.argpartition(-scores, k - 1)[:k]
+        else:
+            part = np.arange(n)
+        order = part[np.argsort(-scores[part])]
+        return [(ids[i], float(scores[i])) for i in order]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "vectors": len(self._ids),
+                "dim": self.dim,
+                "capacity": int(self._matrix.shape[0]),
+                "bytes": int(self._matrix.nbytes),
+                "pending": len(self._dirty),
+            }
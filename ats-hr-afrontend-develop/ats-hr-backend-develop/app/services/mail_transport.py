@@ -0,0 +1,224 @@
+"""
+Pooled, rate-limited SMTP transport.
+
+``send_email`` used to open a new SMTP connection (TCP + STARTTLS + login)
+for every message, and bulk senders slept on the event loop to throttle.
+This module keeps authenticated connections open for reuse and rate-limits
+senders with a token bucket. Queueing, retries and per-message status live
+in the durable outbox (``app.services.email_outbox``), whose sender threads
+deliver through ``mail_transport.deliver``.
+
+Settings are resolved by the caller (``app.email_service``) and travel with
+each message, so a batch reads them once.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from email.message import Message
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAIL_SENDER_THREADS = int(os.getenv("MAIL_SENDER_THREADS", "2"))
+MAIL_RATE_PER_SECOND = float(os.getenv("MAIL_RATE_PER_SECOND", "5"))
+MAIL_RATE_BURST = int(os.getenv("MAIL_RATE_BURST", "10"))
+MAIL_SMTP_POOL_SIZE = int(os.getenv("MAIL_SMTP_POOL_SIZE", "4"))
+MAIL_SMTP_IDLE_SECONDS = float(os.getenv("MAIL_SMTP_IDLE_SECONDS", "60"))
+MAIL_SMTP_TIMEOUT_SECONDS = float(os.getenv("MAIL_SMTP_TIMEOUT_SECONDS", "30"))
+
+# Connections idle for longer than this are NOOP-probed before reuse
+_PROBE_AFTER_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class SMTPSettings:
+    server: str
+    port: int
+    username: str
+    password: str
+    sender_address: str
+    sender_name: str = "ATS-HR"
+    enabled: bool = True
+
+    @property
+    def pool_key(self) -> Tuple[str, int, str]:
+        return (self.server, self.port, self.username)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Connection problems and 4xx replies are worth retrying; 5xx are not."""
+    if isinstance(exc, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)):
+        return False
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, socket.timeout, OSError))
+
+
+# ============================================================
+# CONNECTION POOL
+# ============================================================
+
+class SMTPConnectionPool:
+    """
+    Idle authenticated connections per (server, port, username).
+    """
+
+    def __init__(self, max_idle: int = MAIL_SMTP_POOL_SIZE, idle_seconds: float = MAIL_SMTP_IDLE_SECONDS):
+        self.max_idle = max_idle
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, int, str], List[Tuple[smtplib.SMTP, float]]] = {}
+        self._stats = {"opened": 0, "reused": 0, "discarded": 0}
+
+    def _open(self, settings: SMTPSettings) -> smtplib.SMTP:
+        conn = smtplib.SMTP(settings.server, settings.port, timeout=MAIL_SMTP_TIMEOUT_SECONDS)
+        try:
+            conn.starttls()
+            conn.login(settings.username, settings.password)
+        except Exception:
+            self._close(conn)
+            raise
+        with self._lock:
+            self._stats["opened"] += 1
+        return conn
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def acquire(self, settings: SMTPSettings) -> smtplib.SMTP:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                idle = self._idle.get(settings.pool_key) or []
+                if not idle:
+                    break
+                conn, last_used = idle.pop()
+            if now - last_used > self.idle_seconds:
+                self._discard(conn)
+                continue
+            if now - last_used > _PROBE_AFTER_SECONDS:
+                try:
+                    if conn.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected("NOOP failed")
+                except Exception:
+                    self._discard(conn)
+                    continue
+            with self._lock:
+                self._stats["reused"] += 1
+            return conn
+        return self._open(settings)
+
+    def release(self, settings: SMTPSettings, conn: smtplib.SMTP, healthy: bool = True) -> None:
+        if not healthy:
+            self._discard(conn)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(settings.pool_key, [])
+            if len(idle) < self.max_idle:
+                idle.append((conn, time.monotonic()))
+                return
+        self._discard(conn)
+
+    def _discard(self, conn: smtplib.SMTP) -> None:
+        self._close(conn)
+        with self._lock:
+            self._stats["discarded"] += 1
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                self._close(conn)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["idle"] = sum(len(v) for v in self._idle.values())
+        return out
+
+
+# ============================================================
+# RATE LIMIT
+# ============================================================
+
+class TokenBucket:
+    def __init__(self, rate: float = MAIL_RATE_PER_SECOND, capacity: int = MAIL_RATE_BURST):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until one token is available (no-op when rate <= 0)."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# ============================================================
+# TRANSPORT
+# ============================================================
+
+class MailTransport:
+    """
+    Shared connection pool and send-rate limit for every sender thread.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = MAIL_RATE_PER_SECOND,
+        burst: int = MAIL_RATE_BURST,
+        pool: Optional[SMTPConnectionPool] = None,
+    ):
+        self.pool = pool or SMTPConnectionPool()
+        self.bucket = TokenBucket(rate_per_second, burst)
+
+    def deliver(self, settings: SMTPSettings, message: Message, to_email: str) -> None:
+        """Send one message now on a pooled connection (raises on failure)."""
+        conn = self.pool.acquire(settings)
+        try:
+            conn.sendmail(settings.sender_address, to_email, message.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # A pooled connection may have been dropped by the server: retry once on a fresh one
+            self.pool.release(settings, conn, healthy=False)
+            conn = self.pool.acquire(settings)
+            try:
+                conn.sendmail(settings.sender_address, to_email, message.as_string())
+            except Exception as e:
+                self.pool.release(settings, conn, healthy=not is_transient(e))
+                raise
+        except Exception as e:
+            self.pool.release(settings, conn, healthy=not is_transient(e))
+            raise
+        self.pool.release(settings, conn)
+
+    def stats(self) -> Dict[str, object]:
+        return {"pool": self.pool.stats()}
+
+
+mail_transport = MailTransport()
@@ -0,0 +1,254 @@
+"""
+Process-wide registry of NLP models.
+
+Resume parsing used several private loaders (``NameExtractor`` per
+``ResumeParser()``, plus an ``lru_cache`` per extractor module), so the same
+spaCy pipeline was loaded several times per process and once per request by
+the parse endpoints. Every model now goes through ``model_registry``:
+
+- each model is loaded at most once per process, under a per-model lock
+- a failed load is remembered, so callers fall back without retrying
+- ``warm_up()`` loads a list of models and runs one inference on each, so
+  the first resume does not pay for lazy initialisation
+- ``stats()`` reports load time and resident-memory growth per model
+
+spaCy pipelines are keyed by package name, so callers with different
+preference orders (``trf`` > ``lg`` > ``sm``) still share whatever package
+is installed. Loaded pipelines and HF pipelines are used read-only and are
+shared across threads.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated model names to load (and warm up) at startup, e.g.
+# "spacy,minilm,resume_parser". Empty: everything loads on first use.
+NLP_WARMUP_MODELS = os.getenv("NLP_WARMUP_MODELS", "")
+
+SPACY_PREFERENCE = ("en_core_web_trf", "en_core_web_lg", "en_core_web_sm")
+SPACY_NAME_PREFERENCE = ("en_core_web_lg", "en_core_web_sm")
+
+_WARMUP_TEXT = "John Smith worked as a Python developer at Infosys in Bangalore from 2019 to 2023."
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, if it can be read."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    try:
+        import psutil
+
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        return None
+
+
+@dataclass
+class ModelInfo:
+    name: str
+    status: str = "not_loaded"  # not_loaded | loaded | unavailable
+    load_ms: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+    warmed_up: bool = False
+    error: Optional[str] = None
+
+
+class _Entry:
+    __slots__ = ("loader", "warmup", "value", "info", "lock")
+
+    def __init__(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]]):
+        self.loader = loader
+        self.warmup = warmup
+        self.value: Any = None
+        self.info = ModelInfo(name)
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]] = None) -> None:
+        """Declare a model. ``loader`` returns the model or None / raises when unavailable."""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _Entry(name, loader, warmup)
+
+    def _entry(self, name: str) -> _Entry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown model: {name}")
+        return entry
+
+    def get(self, name: str) -> Any:
+        """The shared instance of ``name`` (loaded on first use), or None if unavailable."""
+        entry = self._entry(name)
+        if entry.info.status != "not_loaded":
+            return entry.value
+        with entry.lock:
+            if entry.info.status == "not_loaded":
+                rss_before = _rss_bytes()
+                started = time.perf_counter()
+                try:
+                    value = entry.loader()
+                except Exception as e:
+                    value = None
+                    entry.info.error = str(e)
+                entry.info.load_ms = round((time.perf_counter() - started) * 1000, 1)
+                rss_after = _rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    entry.info.rss_delta_mb = round((rss_after - rss_before) / (1024 * 1024), 1)
+                entry.value = value
+                entry.info.status = "loaded" if value is not None else "unavailable"
+                if value is not None:
+                    logger.info(f"Model {name} loaded in {entry.info.load_ms:.0f} ms (+{entry.info.rss_delta_mb} MB RSS)")
+                else:
+                    logger.warning(f"Model {name} unavailable{': ' + entry.info.error if entry.info.error else ''}")
+        return entry.value
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Load ``names`` (default: all registered) and run one inference on each."""
+        for name in list(names if names is not None else self._entries):
+            name = name.strip()
+            if not name or name not in self._entries:
+                continue
+            entry = self._entries[name]
+            value = self.get(name)
+            if value is None or entry.warmup is None or entry.info.warmed_up:
+                continue
+            try:
+                entry.warmup(value)
+                entry.info.warmed_up = True
+            except Exception as e:
+                logger.warning(f"Warm-up of {name} failed: {e}")
+        return self.stats()
+
+    def loaded(self, prefix: str = "") -> List[str]:
+        return [name for name, entry in self._entries.items() if name.startswith(prefix) and entry.info.status == "loaded"]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: asdict(entry.info) for name, entry in self._entries.items()}
+
+
+model_registry = ModelRegistry()
+
+
+# ============================================================
+# MODELS
+# ============================================================
+
+def _load_spacy(package: str):
+    import spacy
+
+    return spacy.load(package)
+
+
+def _warm_spacy(nlp) -> None:
+    nlp(_WARMUP_TEXT)
+
+
+for _package in SPACY_PREFERENCE:
+    model_registry.register(f"spacy:{_package}", lambda _package=_package: _load_spacy(_package), _warm_spacy)
+
+
+def get_spacy(preference: Iterable[str] = SPACY_PREFERENCE):
+    """First installed spaCy pipeline in ``preference`` order (shared), or None."""
+    for package in preference:
+        key = f"spacy:{package}"
+        model_registry.register(key, lambda package=package: _load_spacy(package), _warm_spacy)
+        nlp = model_registry.get(key)
+        if nlp is not None:
+            return nlp
+    return None
+
+
+def _load_hf_pipeline(task: str, model: str, **kwargs):
+    from transformers import pipeline
+
+    return pipeline(task, model=model, **kwargs)
+
+
+model_registry.register(
+    "hf:ner",
+    lambda: _load_hf_pipeline("ner", "dslim/bert-base-NER", aggregation_strategy="simple"),
+    lambda ner: ner(_WARMUP_TEXT),
+)
+model_registry.register(
+    "hf:zero_shot",
+    lambda: _load_hf_pipeline("zero-shot-classification", "facebook/bart-large-mnli"),
+    lambda clf: clf(_WARMUP_TEXT, ["work experience", "education"], multi_label=False),
+)
+
+
+def _load_minilm():
+    from app.services.embedding_service import embedding_service
+
+    return embedding_service.get_model()
+
+
+model_registry.register("minilm", _load_minilm, lambda model: model.encode([_WARMUP_TEXT]))
+
+
+def _load_skillextractor(preference: Iterable[str]):
+    from skillextractor.base import SKILL_DB
+    from skillextractor.named_entity_recognition_scorer import SkillExtractor
+    from spacy.matcher import PhraseMatcher
+
+    nlp = get_spacy(preference)
+    if nlp is None:
+        return None
+    return SkillExtractor(nlp, SKILL_DB, PhraseMatcher)
+
+
+def get_skill_extractor(preference: Iterable[str] = SPACY_NAME_PREFERENCE):
+    """Shared ``skillextractor`` annotator on the first installed pipeline of ``preference``."""
+    preference = tuple(preference)
+    key = "skillextractor:" + ",".join(preference)
+    model_registry.register(key, lambda: _load_skillextractor(preference))
+    return model_registry.get(key)
+
+
+def _load_resume_parser():
+    from app.resume_parser.parser import ResumeParser
+
+    return ResumeParser()
+
+
+model_registry.register(
+    "resume_parser",
+    _load_resume_parser,
+    lambda parser: parser.parse(_WARMUP_TEXT + "\nEmail: john.smith@example.com\nSkills: Python, SQL"),
+)
+
+# Friendly aliases for NLP_WARMUP_MODELS
+_WARMUP_ALIASES = {
+    "spacy": lambda: get_spacy(SPACY_NAME_PREFERENCE),
+}
+
+
+def warm_up_from_env(value: str = NLP_WARMUP_MODELS) -> Dict[str, Dict[str, Any]]:
+    """Warm up the models listed in ``NLP_WARMUP_MODELS`` (run at startup)."""
+    names: List[str] = []
+    for name in (value or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        alias = _WARMUP_ALIASES.get(name)
+        if alias is not None:
+            alias()
+            names.extend(model_registry.loaded("spacy:"))
+        else:
+            names.append(name)
+    return model_registry.warm_up(names)
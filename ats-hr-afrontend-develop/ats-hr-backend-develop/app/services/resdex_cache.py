@@ -0,0 +1,105 @@
+"""
+Per-process cache of Resdex ranking state.
+
+Paging and coming back from a profile re-run the same search. The expensive
+part — counting the filtered set, embedding the query, BM25 and vector
+recall, per-candidate component scores — depends only on the normalized
+query, the filters, the sort and the caller scope, so the ranked window is
+cached as a ``RankingState`` (ordered ids plus a score matrix) and every
+offset/limit inside it is served from it, re-reading only the page's rows.
+
+Entries are keyed with a candidate-data version that commits touching
+candidates, certifications or skills bump (``app.events.search_index_listeners``),
+so a change makes every older entry unreachable at once. Writes made by other
+worker processes are bounded by the TTL.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from app.services.embedding_cache import normalize_text
+from app.services.resdex_facets import facet_signature
+from app.utils.ttl_cache import TTLCache
+
+RESDEX_RESULT_CACHE_SIZE = int(os.getenv("RESDEX_RESULT_CACHE_SIZE", "32"))
+RESDEX_RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESDEX_RESULT_CACHE_TTL_SECONDS", "120"))
+
+_version_lock = threading.Lock()
+_candidate_version = 0
+
+
+def candidate_data_version() -> int:
+    return _candidate_version
+
+
+def bump_candidate_version() -> None:
+    global _candidate_version
+    with _version_lock:
+        _candidate_version += 1
+
+
+# Columns of ``RankingState.scores``, in order; also the score_breakdown keys
+SCORE_FIELDS = (
+    "semantic",
+    "keyword",
+    "structured",
+    "relevance",
+    "skills",
+    "experience",
+    "location",
+    "certification",
+    "recency",
+    "completeness",
+    "availability",
+    "final_score",
+)
+
+
+class RankingState:
+    """
+    The ranked window of a search: candidate ids in final order with one row
+    of ``SCORE_FIELDS`` each, plus the size of the whole filtered set.
+
+    No ORM rows are held, so an entry costs a few KB however wide the
+    candidate rows are; the requested page is re-read by id.
+    """
+
+    __slots__ = ("ids", "scores", "total", "exhausted")
+
+    def __init__(
+        self,
+        ids: List[str],
+        breakdowns: List[Dict[str, float]],
+        total: int,
+        exhausted: bool = False,
+    ):
+        self.ids = list(ids)
+        self.scores = np.array(
+            [[b[f] for f in SCORE_FIELDS] for b in breakdowns], dtype=np.float64
+        ).reshape(len(self.ids), len(SCORE_FIELDS))
+        self.total = total
+        # True when the window already holds every rankable row
+        self.exhausted = exhausted
+
+    def covers(self, depth: int) -> bool:
+        return self.exhausted or len(self.ids) >= depth
+
+    def breakdown(self, position: int) -> Dict[str, float]:
+        return dict(zip(SCORE_FIELDS, self.scores[position].tolist()))
+
+
+resdex_ranking_cache = TTLCache(RESDEX_RESULT_CACHE_SIZE, RESDEX_RESULT_CACHE_TTL_SECONDS)
+
+
+def ranking_cache_key(
+    q: Optional[str],
+    filters: Dict[str, Any],
+    scope: Any = None,
+    sort: str = "relevance",
+) -> Hashable:
+    return (candidate_data_version(), normalize_text(q or ""), scope, sort, facet_signature(filters))
@@ -0,0 +1,175 @@
+"""
+Resdex search enrichments: did-you-mean, suggestions, related searches, facets.
+
+None of these change the ranked results, so they run on a small worker pool
+(DB-bound ones on their own sessions) instead of one after another on the
+request path. ``compute_enrichments`` runs them concurrently and waits for
+them; it backs the default, single-response ``/v1/resdex/search``.
+
+``start_enrichments`` (``include_enrichments=false``) returns a search id
+straight away and the client fetches
+``GET /v1/resdex/search/{search_id}/enrichments`` later. Pending results live
+in a per-process TTL map, so that mode only suits a single worker process or
+sticky sessions: a fetch landing on another process gets a 404.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy.orm import Query
+
+from app.db import SessionLocal
+from app.services.resdex_facets import get_facets
+from app.utils.resdex_search_engine import facets, related_searches, search_suggestions, spell_check_query
+
+logger = logging.getLogger(__name__)
+
+RESDEX_ENRICHMENT_WORKERS = int(os.getenv("RESDEX_ENRICHMENT_WORKERS", "4"))
+RESDEX_ENRICHMENT_TTL_SECONDS = int(os.getenv("RESDEX_ENRICHMENT_TTL_SECONDS", "300"))
+RESDEX_ENRICHMENT_MAX_PENDING = int(os.getenv("RESDEX_ENRICHMENT_MAX_PENDING", "1000"))
+
+# related_searches() reads the first 10 results; facets() (used when no
+# filter query is given) summarises the first 300
+ENRICHMENT_WINDOW = 300
+
+# Returned for a task that failed, so one bad enrichment never hides the others
+_DEFAULTS: Dict[str, Any] = {
+    "did_you_mean": None,
+    "suggestions": [],
+    "related_searches": [],
+    "facets": {},
+}
+
+_executor = ThreadPoolExecutor(max_workers=RESDEX_ENRICHMENT_WORKERS, thread_name_prefix="resdex-enrich")
+
+
+def _with_session(fn: Callable, *args) -> Any:
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+def _facets(db, query: Query, signature: Optional[Hashable]) -> Dict[str, Any]:
+    return get_facets(db, query.with_session(db), signature)
+
+
+def _submit_all(
+    q: str,
+    scored: List[Dict[str, Any]],
+    current_user: Dict[str, Any],
+    facet_query: Optional[Query] = None,
+    facet_signature: Optional[Hashable] = None,
+) -> Dict[str, Future]:
+    window = list(scored[:ENRICHMENT_WINDOW])
+    if facet_query is not None:
+        # Exact counts over the whole filtered set, on the task's own session
+        facet_future = _executor.submit(_with_session, _facets, facet_query, facet_signature)
+    else:
+        facet_future = _executor.submit(facets, window)
+    return {
+        "did_you_mean": _executor.submit(_with_session, spell_check_query, q),
+        "suggestions": _executor.submit(_with_session, search_suggestions, q, current_user),
+        "related_searches": _executor.submit(related_searches, q, window[:10]),
+        "facets": facet_future,
+    }
+
+
+def _result(name: str, future: Future) -> Any:
+    try:
+        return future.result()
+    except Exception as e:
+        logger.warning(f"Resdex enrichment {name} failed: {e}")
+        return _DEFAULTS[name]
+
+
+async def _gather(futures: Dict[str, Future]) -> Dict[str, Any]:
+    await asyncio.gather(*(asyncio.wrap_future(f) for f in futures.values()), return_exceptions=True)
+    return {name: _result(name, f) for name, f in futures.items()}
+
+
+async def compute_enrichments(
+    q: str,
+    scored: List[Dict[str, Any]],
+    current_user: Dict[str, Any],
+    facet_query: Optional[Query] = None,
+    facet_signature: Optional[Hashable] = None,
+) -> Dict[str, Any]:
+    """Run every enrichment concurrently and wait for all of them."""
+    return await _gather(_submit_all(q or "", scored, current_user, facet_query, facet_signature))
+
+
+class _PendingEnrichments:
+    __slots__ = ("user_id", "expires_at", "futures")
+
+    def __init__(self, user_id: Optional[str], futures: Dict[str, Future]):
+        self.user_id = user_id
+        self.expires_at = time.monotonic() + RESDEX_ENRICHMENT_TTL_SECONDS
+        self.futures = futures
+
+
+_lock = threading.Lock()
+_pending: "OrderedDict[str, _PendingEnrichments]" = OrderedDict()
+
+
+def _user_id(current_user: Dict[str, Any]) -> Optional[str]:
+    return current_user.get("id") if isinstance(current_user, dict) else None
+
+
+def _evict_locked(now: float) -> None:
+    while _pending:
+        entry = next(iter(_pending.values()))
+        if entry.expires_at > now and len(_pending) <= RESDEX_ENRICHMENT_MAX_PENDING:
+            break
+        _pending.popitem(last=False)
+
+
+def start_enrichments(
+    q: str,
+    scored: List[Dict[str, Any]],
+    current_user: Dict[str, Any],
+    facet_query: Optional[Query] = None,
+    facet_signature: Optional[Hashable] = None,
+) -> str:
+    """Schedule the enrichments in the background and return their search id."""
+    search_id = uuid.uuid4().hex
+    futures = _submit_all(q or "", scored, current_user, facet_query, facet_signature)
+    entry = _PendingEnrichments(_user_id(current_user), futures)
+    with _lock:
+        _pending[search_id] = entry
+        _evict_locked(time.monotonic())
+    return search_id
+
+
+async def get_enrichments(search_id: str, current_user: Dict[str, Any], wait: float = 0.0) -> Optional[Dict[str, Any]]:
+    """
+    Enrichments for ``search_id``, waiting up to ``wait`` seconds for tasks
+    still running. None when the id is unknown, expired or someone else's.
+    """
+    with _lock:
+        _evict_locked(time.monotonic())
+        entry = _pending.get(search_id)
+    if entry is None or entry.user_id != _user_id(current_user):
+        return None
+
+    if wait > 0:
+        try:
+            await asyncio.wait_for(_gather(entry.futures), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+
+    ready = all(f.done() for f in entry.futures.values())
+    out: Dict[str, Any] = {"search_id": search_id, "status": "ready" if ready else "pending"}
+    for name, future in entry.futures.items():
+        out[name] = _result(name, future) if future.done() else None
+    return out
@@ -0,0 +1,192 @@
+"""
+Exact Resdex facet counts over the whole filtered candidate set.
+
+Every facet is a grouped aggregate over the same filtered query, and all of
+them are sent as one ``UNION ALL`` statement:
+- skills from the normalized ``candidate_terms`` table
+- certifications from ``certifications``
+- location / experience range / availability / qualification from
+  ``candidates`` columns
+- for candidates without a ``qualification``, a label taken from the
+  ``education`` JSON (``_education_label_sql``, per dialect)
+
+Results are cached per normalized filter signature; the free-text query
+only affects ranking, never the match set, so it is not part of the key.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Hashable, List, Optional
+
+from sqlalchemy import String, case, cast, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Query, Session
+
+from app import models
+from app.services.candidate_terms import SKILL
+from app.services.skill_vocabulary import skill_vocabulary
+from app.utils.resdex_search_engine import availability_bucket_sql
+from app.utils.ttl_cache import TTLCache
+
+RESDEX_FACET_CACHE_SIZE = int(os.getenv("RESDEX_FACET_CACHE_SIZE", "512"))
+RESDEX_FACET_CACHE_TTL_SECONDS = float(os.getenv("RESDEX_FACET_CACHE_TTL_SECONDS", "60"))
+
+FACET_LIMITS = {"skills": 20, "locations": 15, "certifications": 10, "education_levels": 10}
+EXPERIENCE_RANGES = ("0-2", "2-5", "5-10", "10+")
+
+facet_cache = TTLCache(RESDEX_FACET_CACHE_SIZE, RESDEX_FACET_CACHE_TTL_SECONDS)
+
+
+def facet_signature(filters: Dict[str, Any]) -> Hashable:
+    """
+    Order- and case-insensitive key for a set of Resdex filters. Today's date
+    is included because availability and last-active buckets depend on it.
+    """
+
+    def _norm(value: Any) -> Any:
+        if isinstance(value, str):
+            return value.strip().lower()
+        if isinstance(value, (list, tuple, set)):
+            return tuple(sorted({_norm(v) for v in value if v not in (None, "")}))
+        return value
+
+    return (date.today().isoformat(),) + tuple(sorted((k, _norm(v)) for k, v in filters.items()))
+
+
+def _education_label_sql(dialect: str):
+    """
+    Education facet label of a candidate, from the ``education`` JSON: the
+    first entry of a list, or the degree (else qualification, else "Other")
+    of an object, also applied to an object first entry. NULL when empty.
+    """
+    education = models.Candidate.education
+
+    if dialect == "sqlite":
+        def _kind(path: str):
+            return func.json_type(education, path)
+
+        def _at(path: str):
+            return func.json_extract(education, path)
+
+        def _empty(path: str):
+            return _at(path) == "{}"
+    else:
+        doc = cast(education, JSONB)
+
+        def _node(path: str):
+            return doc if path == "$" else doc.op("->")(0)
+
+        def _kind(path: str):
+            return func.jsonb_typeof(_node(path))
+
+        def _empty(path: str):
+            return _node(path) == cast(literal("{}"), JSONB)
+
+        def _at(path: str):
+            if path == "$[0]":
+                return doc.op("->>", return_type=String)(0)
+            key = path.rsplit(".", 1)[1]
+            return _node(path.rsplit(".", 1)[0]).op("->>", return_type=String)(key)
+
+    def _object_label(path: str):
+        return case(
+            (_empty(path), None),
+            else_=func.coalesce(
+                func.nullif(_at(f"{path}.degree"), ""),
+                func.nullif(_at(f"{path}.qualification"), ""),
+                "Other",
+            ),
+        )
+
+    label = case(
+        (_kind("$") == "array", case((_kind("$[0]") == "object", _object_label("$[0]")), else_=_at("$[0]"))),
+        (_kind("$") == "object", _object_label("$")),
+    )
+    return func.trim(cast(label, String))
+
+
+def compute_facets(db: Session, query: Query) -> Dict[str, Any]:
+    """
+    Facet counts for every candidate matched by ``query`` (a filtered
+    ``db.query(models.Candidate)``), in the shape ``facets()`` returns.
+    """
+    query = query.order_by(None)
+    Candidate = models.Candidate
+    ids = query.with_entities(Candidate.id).subquery()
+
+    years = func.coalesce(Candidate.experience_years, 0)
+    experience_range = case(
+        (years < 2, "0-2"),
+        (years < 5, "2-5"),
+        (years < 10, "5-10"),
+        else_="10+",
+    )
+    location = func.trim(Candidate.current_location)
+    qualification = func.trim(Candidate.qualification)
+    availability = availability_bucket_sql()
+
+    def _grouped(name: str, value, q: Query):
+        return q.with_entities(literal(name).label("facet"), value.label("value"), func.count().label("n")).group_by(value).statement
+
+    terms = models.CandidateTerm
+    certs = models.Certification
+    statements = [
+        select(literal("skills").label("facet"), terms.value.label("value"), func.count().label("n"))
+        .where(terms.kind == SKILL, terms.candidate_id.in_(select(ids.c.id)))
+        .group_by(terms.value),
+        select(literal("certifications").label("facet"), func.trim(certs.name).label("value"), func.count().label("n"))
+        .where(certs.candidate_id.in_(select(ids.c.id)), certs.name.isnot(None), certs.name != "")
+        .group_by(func.trim(certs.name)),
+        _grouped("locations", location, query.filter(Candidate.current_location.isnot(None), Candidate.current_location != "")),
+        _grouped("experience_ranges", experience_range, query),
+        _grouped("availability", availability, query),
+        _grouped("education_levels", qualification, query.filter(Candidate.qualification.isnot(None), Candidate.qualification != "")),
+        _grouped(
+            "education_levels",
+            _education_label_sql(db.get_bind().dialect.name),
+            query.filter(or_(Candidate.qualification.is_(None), Candidate.qualification == ""), Candidate.education.isnot(None)),
+        ),
+    ]
+
+    counters: Dict[str, Counter] = {name: Counter() for name in ("skills", "locations", "certifications", "education_levels")}
+    experience = {name: 0 for name in EXPERIENCE_RANGES}
+    availability_counts: Dict[str, int] = {}
+    for facet, value, n in db.execute(union_all(*statements)).all():
+        if facet == "experience_ranges":
+            experience[value] = int(n)
+        elif facet == "availability":
+            key = value or "unknown"
+            availability_counts[key] = availability_counts.get(key, 0) + int(n)
+        elif value:
+            counters[facet][value] += int(n)
+
+    def _top(name: str) -> List[Dict[str, Any]]:
+        ranked = sorted(counters[name].items(), key=lambda kv: (-kv[1], kv[0]))[: FACET_LIMITS[name]]
+        return [{"value": k, "count": v} for k, v in ranked]
+
+    skills = _top("skills")
+    for item in skills:
+        item["value"] = skill_vocabulary.display_name(item["value"], db=db)
+
+    return {
+        "skills": skills,
+        "locations": _top("locations"),
+        "experience_ranges": experience,
+        "certifications": _top("certifications"),
+        "availability": availability_counts,
+        "education_levels": _top("education_levels"),
+    }
+
+
+def get_facets(db: Session, query: Query, signature: Optional[Hashable] = None) -> Dict[str, Any]:
+    """``compute_facets`` memoized per filter signature."""
+    if signature is None:
+        return compute_facets(db, query)
+    cached = facet_cache.get(signature)
+    if cached is None:
+        cached = compute_facets(db, query)
+        facet_cache.set(signature, cached)
+    return cached
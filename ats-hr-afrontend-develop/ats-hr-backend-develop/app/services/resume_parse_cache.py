@@ -0,0 +1,158 @@
+"""
+Content-addressed cache of resume parse results.
+
+The same resume is often uploaded several times (bulk batches, re-uploads,
+reparse). A successful ``parse_resume`` result is stored in
+``resume_parse_cache`` under the SHA-256 of the file bytes and
+``PARSER_VERSION``, so an identical file skips text extraction, OCR and
+skill normalization. Bumping ``PARSER_VERSION`` retires old entries.
+
+Parse output depends on the date only through the current year (roles
+ending "Present" and first-role-to-now durations), so an entry is served only
+in the calendar year it was written and is re-parsed after that.
+
+Cache reads and writes use their own short session on the caller's engine:
+a failed or racing cache write (two workers storing the same file) never
+touches the caller's transaction. Failed parses are not cached. Batch
+callers use ``get_cached_parses`` / ``store_parses``, one round-trip each.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.resume_parser import parse_resume
+from app.resume_parser.rule_based_parser import PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+RESUME_PARSE_CACHE_ENABLED = os.getenv("RESUME_PARSE_CACHE_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+
+_CHUNK_SIZE = 1024 * 1024
+_LOOKUP_BATCH_SIZE = 500
+
+
+def content_sha256(content: bytes) -> str:
+    return hashlib.sha256(content or b"").hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_session(db: Session) -> Session:
+    return Session(bind=db.get_bind())
+
+
+def _fresh_since(now: datetime) -> datetime:
+    return datetime(now.year, 1, 1)
+
+
+def get_cached_parses(db: Session, digests: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Cached ``parse_resume`` results by file hash, for whichever hashes are known."""
+    wanted = [d for d in dict.fromkeys(digests) if d]
+    if not RESUME_PARSE_CACHE_ENABLED or not wanted:
+        return {}
+    session = _cache_session(db)
+    try:
+        C = models.ResumeParseCache
+        now = datetime.utcnow()
+        found: Dict[str, Dict[str, Any]] = {}
+        hit_ids = []
+        for start in range(0, len(wanted), _LOOKUP_BATCH_SIZE):
+            rows = session.query(C.id, C.content_hash, C.result).filter(
+                C.content_hash.in_(wanted[start:start + _LOOKUP_BATCH_SIZE]),
+                C.parser_version == PARSER_VERSION,
+                C.created_at >= _fresh_since(now),
+            )
+            for row in rows:
+                found[row.content_hash] = row.result
+                hit_ids.append(row.id)
+        if hit_ids:
+            session.execute(update(C).where(C.id.in_(hit_ids)).values(hits=C.hits + 1, last_hit_at=now))
+            session.commit()
+        return found
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Resume parse cache lookup failed: {e}")
+        return {}
+    finally:
+        session.close()
+
+
+def get_cached_parse(db: Session, digest: str) -> Optional[Dict[str, Any]]:
+    """Cached ``parse_resume`` result for a file hash, or None."""
+    return get_cached_parses(db, [digest]).get(digest)
+
+
+def store_parses(db: Session, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+    """Cache successful parse results (replacing any entry for the same file and version)."""
+    if not RESUME_PARSE_CACHE_ENABLED:
+        return
+    results = {
+        digest: parsed
+        for digest, parsed in items
+        if digest and isinstance(parsed, dict) and parsed.get("success")
+    }
+    if not results:
+        return
+    session = _cache_session(db)
+    try:
+        C = models.ResumeParseCache
+        now = datetime.utcnow()
+        existing = {
+            row.content_hash: row
+            for row in session.query(C).filter(C.content_hash.in_(list(results)), C.parser_version == PARSER_VERSION)
+        }
+        for digest, parsed in results.items():
+            row = existing.get(digest)
+            if row is None:
+                session.add(C(content_hash=digest, parser_version=PARSER_VERSION, result=parsed, created_at=now))
+            else:
+                row.result = parsed
+                row.created_at = now
+        session.commit()
+    except Exception as e:
+        # Usually another worker stored the same file first
+        session.rollback()
+        logger.warning(f"Resume parse cache write skipped: {e}")
+    finally:
+        session.close()
+
+
+def store_parse(db: Session, digest: str, parsed: Dict[str, Any]) -> None:
+    """Cache a successful parse result (replacing any entry for the same file and version)."""
+    store_parses(db, [(digest, parsed)])
+
+
+def parse_resume_cached(db: Session, path: str, force: bool = False, digest: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ``parse_resume(path)``, served from the cache when the same file was parsed
+    before. ``force`` re-parses and refreshes the cached entry.
+    """
+    if not RESUME_PARSE_CACHE_ENABLED:
+        return parse_resume(path) or {}
+    try:
+        digest = digest or file_sha256(path)
+    except OSError:
+        digest = None
+    if digest and not force:
+        cached = get_cached_parse(db, digest)
+        if cached is not None:
+            return cached
+    parsed = parse_resume(path) or {}
+    if digest:
+        store_parse(db, digest, parsed)
+    return parsed
@@ -0,0 +1,144 @@
+"""
+Multi-process resume parsing for bulk uploads.
+
+Parsing is CPU bound (text extraction, OCR, skill matching, MiniLM), so
+calling it inline from an ``async`` task blocks the event loop for the
+whole batch. ``parse_stream`` instead runs ``app.resume_parser.parse_resume``
+on a ``ProcessPoolExecutor`` and yields each result as soon as its file is
+done, keeping at most ``RESUME_PARSE_MAX_IN_FLIGHT`` files submitted.
+
+Each worker process preloads the models in ``RESUME_PARSE_PRELOAD_MODELS``
+(see ``app.services.model_registry``) when it starts, so no file pays the
+model-load cost, and OCRs one PDF page at a time (``OCR_WORKERS=1``) so page
+pipelines do not multiply with the processes. Workers are started with
+``spawn`` by default: forking a web process that already runs scheduler and
+sender threads is not safe.
+
+``RESUME_PARSE_WORKERS=0`` parses on a thread instead (no extra processes,
+the event loop still stays free).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+RESUME_PARSE_MAX_IN_FLIGHT = int(os.getenv("RESUME_PARSE_MAX_IN_FLIGHT", str(max(1, RESUME_PARSE_WORKERS) * 2)))
+RESUME_PARSE_START_METHOD = os.getenv("RESUME_PARSE_START_METHOD", "spawn")
+RESUME_PARSE_PRELOAD_MODELS = os.getenv("RESUME_PARSE_PRELOAD_MODELS", "minilm,spacy")
+
+
+def _init_worker(preload: str) -> None:
+    from app.resume_parser.extractors import ocr_extractor
+    from app.services.model_registry import warm_up_from_env
+
+    # One OCR pipeline per process: the pool already runs a file per core
+    ocr_extractor.OCR_WORKERS = 1
+
+    try:
+        warm_up_from_env(preload)
+    except Exception as e:  # a worker without warm models still parses
+        logger.warning(f"Resume parse worker warm-up failed: {e}")
+
+
+def parse_resume_path(path: str) -> Dict[str, Any]:
+    """Worker entry point (module-level so it can be pickled)."""
+    from app.resume_parser import parse_resume
+
+    return parse_resume(path) or {}
+
+
+class ResumeParsePool:
+    def __init__(
+        self,
+        workers: int = RESUME_PARSE_WORKERS,
+        max_in_flight: int = RESUME_PARSE_MAX_IN_FLIGHT,
+        start_method: str = RESUME_PARSE_START_METHOD,
+        preload: str = RESUME_PARSE_PRELOAD_MODELS,
+    ):
+        self.workers = max(0, workers)
+        self.max_in_flight = max(1, max_in_flight)
+        self.start_method = start_method
+        self.preload = preload
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(self.preload,),
+                )
+            return self._executor
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def _parse_one(self, path: str) -> Dict[str, Any]:
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(parse_resume_path, path)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, parse_resume_path, path)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge scan): start a fresh pool and retry once
+            logger.warning(f"Resume parse pool broken while parsing {path}; restarting")
+            self._reset(executor)
+            return await loop.run_in_executor(self._get_executor(), parse_resume_path, path)
+
+    async def parse_stream(
+        self, items: Iterable[Tuple[Hashable, str]]
+    ) -> AsyncIterator[Tuple[Hashable, Optional[Dict[str, Any]], Optional[BaseException]]]:
+        """
+        Parse ``(key, path)`` items; yield ``(key, parsed, error)`` in completion order.
+        """
+        pending_items = iter(items)
+        running: Dict[asyncio.Task, Hashable] = {}
+
+        def _fill() -> None:
+            while len(running) < self.max_in_flight:
+                try:
+                    key, path = next(pending_items)
+                except StopIteration:
+                    return
+                running[asyncio.ensure_future(self._parse_one(path))] = key
+
+        _fill()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = running.pop(task)
+                    error = task.exception()
+                    yield key, (None if error else task.result()), error
+                _fill()
+        finally:
+            for task in running:
+                task.cancel()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+resume_parse_pool = ResumeParsePool()
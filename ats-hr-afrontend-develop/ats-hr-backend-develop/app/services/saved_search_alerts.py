@@ -0,0 +1,243 @@
+"""
+Saved-search alerts: notify owners when new candidates match their searches.
+
+Each tick loads only the candidates created/updated since the oldest alert
+mark of the active saved searches (one projected, streamed query), evaluates
+every search's filters against that delta in memory, and writes one
+``SystemNotification`` per search with new matches in a single bulk insert.
+Cost is (changed candidates x searches), independent of the pool size.
+
+A candidate is announced once per search: matches are recorded in
+``saved_search_alerted_candidates`` and later edits of an already announced
+candidate are skipped. Searches are claimed with a conditional UPDATE of
+``last_alerted_at`` in the tick's transaction, so two processes running the
+tick at once never alert the same search twice.
+
+Scheduled from ``setup_background_scheduler`` in
+``app.passive_requirement_monitor``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SAVED_SEARCH_ALERT_INTERVAL_MINUTES = int(os.getenv("SAVED_SEARCH_ALERT_INTERVAL_MINUTES", "15"))
+# A search never alerts on changes older than this (e.g. right after enabling)
+SAVED_SEARCH_ALERT_MAX_LOOKBACK_HOURS = int(os.getenv("SAVED_SEARCH_ALERT_MAX_LOOKBACK_HOURS", "24"))
+SAVED_SEARCH_ALERT_BATCH_SIZE = 1000
+
+NOTIFICATION_TYPE = "saved_search_alert"
+
+_RUN_LOCK = threading.Lock()
+
+_DELTA_COLUMNS = (
+    "id",
+    "full_name",
+    "skills",
+    "current_location",
+    "experience_years",
+    "merged_into_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def changed_since(since: datetime):
+    """Candidates created or updated after ``since`` (uses idx_candidates_updated_at)."""
+    return or_(
+        models.Candidate.updated_at > since,
+        and_(models.Candidate.updated_at.is_(None), models.Candidate.created_at > since),
+    )
+
+
+def _filter_skills(filters: Dict[str, Any]) -> List[str]:
+    skills = filters.get("skills") or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",") if s.strip()]
+    return [str(s).lower() for s in skills if s]
+
+
+def compile_filters(filters: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    In-memory predicate equivalent to ``searches._build_candidate_query``:
+    any skill as a case-insensitive substring of the skills JSON, location
+    substring, and the experience bounds.
+    """
+    skills = _filter_skills(filters)
+    location = (filters.get("location") or "").strip().lower()
+    exp_min = filters.get("experience_min")
+    exp_max = filters.get("experience_max")
+
+    def _matches(row: Any) -> bool:
+        if getattr(row, "merged_into_id", None):
+            return False
+        if skills:
+            text = json.dumps(row.skills or [], ensure_ascii=False).lower() if row.skills is not None else ""
+            if not any(s in text for s in skills):
+                return False
+        if location and location not in (row.current_location or "").lower():
+            return False
+        if exp_min is not None and (row.experience_years is None or row.experience_years < exp_min):
+            return False
+        if exp_max is not None and (row.experience_years is None or row.experience_years > exp_max):
+            return False
+        return True
+
+    return _matches
+
+
+def _row_changed_at(row: Any) -> Optional[datetime]:
+    return row.updated_at or row.created_at
+
+
+def _claim_searches(db: Session, searches: List[Any], mark: datetime) -> List[Any]:
+    """
+    Move each search's ``last_alerted_at`` to ``mark``, guarded by the value
+    it was read with. A search another process claimed in the meantime
+    matches no row and is left to that process; the row locks are held
+    until this tick commits.
+    """
+    saved_searches = models.SavedSearch.__table__
+    claimed = []
+    for s in searches:
+        column = saved_searches.c.last_alerted_at
+        unchanged = column.is_(None) if s.last_alerted_at is None else column == s.last_alerted_at
+        result = db.execute(
+            saved_searches.update()
+            .where(saved_searches.c.id == s.id, unchanged)
+            # updated_at kept as is: "recent searches" ordering follows user edits
+            .values(last_alerted_at=mark, updated_at=saved_searches.c.updated_at)
+        )
+        if result.rowcount:
+            claimed.append(s)
+    return claimed
+
+
+def _already_alerted(db: Session, compiled: List[Any]) -> Set[Tuple[str, str]]:
+    alerted = models.SavedSearchAlertedCandidate
+    search_ids = [s.id for s, _, _, hits in compiled if hits]
+    candidate_ids = list({h.id for _, _, _, hits in compiled for h in hits})
+    found: Set[Tuple[str, str]] = set()
+    for start in range(0, len(candidate_ids), SAVED_SEARCH_ALERT_BATCH_SIZE):
+        chunk = candidate_ids[start:start + SAVED_SEARCH_ALERT_BATCH_SIZE]
+        found.update(
+            (row.saved_search_id, row.candidate_id)
+            for row in db.query(alerted.saved_search_id, alerted.candidate_id).filter(
+                alerted.saved_search_id.in_(search_ids), alerted.candidate_id.in_(chunk)
+            )
+        )
+    return found
+
+
+def run_saved_search_alerts(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    One alert tick on ``db``. Returns counts for logging.
+    """
+    now = now or datetime.utcnow()
+    floor = now - timedelta(hours=SAVED_SEARCH_ALERT_MAX_LOOKBACK_HOURS)
+
+    searches = (
+        db.query(models.SavedSearch)
+        .filter(models.SavedSearch.is_active == True)
+        .all()
+    )
+    if not searches:
+        return {"searches": 0, "candidates": 0, "notifications": 0}
+
+    # Taken before reading the delta: rows changed while we scan are newer
+    # than the new marks and are picked up next tick
+    high_water = db.query(func.max(models.Candidate.updated_at)).scalar()
+
+    mark = high_water or now
+    compiled = []
+    for s in _claim_searches(db, searches, mark):
+        # Never earlier than the search itself, whatever the last mark says
+        since = max(d for d in (s.last_alerted_at, s.created_at, floor) if d is not None)
+        compiled.append((s, since, compile_filters(s.filters or {}), []))
+    if not compiled:
+        db.rollback()
+        return {"searches": 0, "candidates": 0, "notifications": 0}
+    oldest = min(since for _, since, _, _ in compiled)
+
+    query = db.query(*[getattr(models.Candidate, name) for name in _DELTA_COLUMNS]).filter(changed_since(oldest))
+    if high_water is not None:
+        query = query.filter(
+            or_(models.Candidate.updated_at <= high_water, models.Candidate.updated_at.is_(None))
+        )
+
+    scanned = 0
+    for row in query.yield_per(SAVED_SEARCH_ALERT_BATCH_SIZE):
+        scanned += 1
+        changed_at = _row_changed_at(row)
+        for _, since, matches, hits in compiled:
+            if changed_at is not None and changed_at > since and matches(row):
+                hits.append(row)
+
+    alerted = _already_alerted(db, compiled)
+    notifications = []
+    new_matches = []
+    for s, _, _, hits in compiled:
+        hits[:] = [h for h in hits if (s.id, h.id) not in alerted]
+        if not hits:
+            continue
+        new_matches.extend({"saved_search_id": s.id, "candidate_id": h.id, "alerted_at": now} for h in hits)
+        names = ", ".join(h.full_name or "Unnamed" for h in hits[:3])
+        more = f" and {len(hits) - 3} more" if len(hits) > 3 else ""
+        notifications.append(
+            {
+                "id": models.generate_uuid(),
+                "user_id": s.user_id,
+                "notification_type": NOTIFICATION_TYPE,
+                "title": f"{len(hits)} new candidate{'s' if len(hits) != 1 else ''} for '{s.name}'",
+                "message": f"New matches for saved search '{s.name}': {names}{more}.",
+                "reference_id": s.id,
+                "priority": "normal",
+                "is_read": False,
+                "created_at": now,
+                "expires_at": now + timedelta(days=7),
+            }
+        )
+
+    if notifications:
+        db.execute(insert(models.SystemNotification.__table__), notifications)
+        db.execute(insert(models.SavedSearchAlertedCandidate.__table__), new_matches)
+    db.commit()
+
+    return {"searches": len(compiled), "candidates": scanned, "notifications": len(notifications)}
+
+
+def run_saved_search_alert_tick() -> Dict[str, Any]:
+    """
+    Entry point for the background scheduler.
+    """
+    if not _RUN_LOCK.acquire(blocking=False):
+        return {"skipped": "already running"}
+    db = SessionLocal()
+    try:
+        result = run_saved_search_alerts(db)
+        if result.get("notifications"):
+            logger.info(
+                f"Saved-search alerts: {result['notifications']} notifications from "
+                f"{result['candidates']} changed candidates x {result['searches']} searches"
+            )
+        return result
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Saved-search alert tick failed: {e}")
+        return {"error": str(e)}
+    finally:
+        db.close()
+        _RUN_LOCK.release()
@@ -0,0 +1,192 @@
+"""
+Process-wide cache of ``system_settings``.
+
+The table is small and read on hot paths (every email, uploads, the
+maintenance guard), so it is loaded once into an immutable key -> value map
+and served from memory. The map is rebuilt when a commit touches
+``SystemSettings`` (see ``app.events.settings_listeners``). That commit also
+touches ``SETTINGS_SIGNAL_FILE``, whose mtime every worker on the host checks
+on each lookup (one ``stat``), so e.g. turning maintenance mode on takes
+effect everywhere at once. Writes from other hosts or raw SQL are picked up
+by a cheap ``count/max(updated_at)`` probe run at most every
+``SYNC_INTERVAL_SECONDS``.
+
+Keys resolve like the old per-call queries: a row matches on its ``key``
+column or on ``module_name.setting_key``; the most recently updated match
+wins, and its ``value_json`` is preferred over ``setting_value``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_CACHE_SYNC_SECONDS = float(os.getenv("SETTINGS_CACHE_SYNC_SECONDS", "30"))
+SETTINGS_SIGNAL_FILE = os.getenv("SETTINGS_SIGNAL_FILE", os.path.join(tempfile.gettempdir(), "ats_hr_settings.signal"))
+
+_TRUE_STRINGS = {"true", "1", "t", "yes", "y", "on", '"true"'}
+_FALSE_STRINGS = {"false", "0", "f", "no", "n", "off", '"false"', ""}
+
+
+def as_bool(value: Any, default: bool = False) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+    return default
+
+
+class SystemSettingsCache:
+    """
+    Lazily loaded, atomically swapped settings map.
+    """
+
+    SYNC_INTERVAL_SECONDS = SETTINGS_CACHE_SYNC_SECONDS
+
+    def __init__(self, signal_file: Optional[str] = SETTINGS_SIGNAL_FILE):
+        self._values: Optional[Dict[str, Any]] = None
+        self._signature: Optional[tuple] = None
+        self._dirty = True
+        self._last_sync = 0.0
+        self._build_lock = threading.Lock()
+        self.signal_file = signal_file
+        self._signal_mtime = self._read_signal()
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def notify_changed(self) -> None:
+        """Reload here and tell the other workers on this host to reload."""
+        self._dirty = True
+        if not self.signal_file:
+            return
+        try:
+            with open(self.signal_file, "a"):
+                pass
+            os.utime(self.signal_file, None)
+            # Our own touch needs no second reload
+            self._signal_mtime = self._read_signal()
+        except OSError as e:
+            logger.warning(f"Could not touch settings signal file {self.signal_file}: {e}")
+
+    def _read_signal(self) -> Optional[int]:
+        if not self.signal_file:
+            return None
+        try:
+            return os.stat(self.signal_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_signal(self) -> None:
+        mtime = self._read_signal()
+        if mtime != self._signal_mtime:
+            self._signal_mtime = mtime
+            self._dirty = True
+
+    # --------------------------------------------------------
+    # LOADING
+    # --------------------------------------------------------
+
+    @staticmethod
+    def _probe(db: Session) -> tuple:
+        count, newest = db.query(func.count(models.SystemSettings.id), func.max(models.SystemSettings.updated_at)).one()
+        return (count, newest)
+
+    def _rebuild(self, db: Session, signature: Optional[tuple] = None) -> None:
+        S = models.SystemSettings
+        rows = db.query(S.config_key, S.module_name, S.setting_key, S.value_json, S.setting_value, S.updated_at).all()
+        # Oldest first, so the most recently updated row for a key wins
+        rows.sort(key=lambda r: r.updated_at or datetime.min)
+        values: Dict[str, Any] = {}
+        for row in rows:
+            value = row.value_json if row.value_json is not None else row.setting_value
+            if row.config_key:
+                values[row.config_key] = value
+            if row.module_name and row.setting_key:
+                values[f"{row.module_name}.{row.setting_key}"] = value
+        self._values = values
+        self._signature = signature if signature is not None else self._probe(db)
+
+    def _ensure(self, db: Optional[Session] = None) -> Dict[str, Any]:
+        self._check_signal()
+        values = self._values
+        if values is not None and not self._dirty and time.monotonic() - self._last_sync < self.SYNC_INTERVAL_SECONDS:
+            return values
+
+        with self._build_lock:
+            if self._values is not None and not self._dirty and time.monotonic() - self._last_sync < self.SYNC_INTERVAL_SECONDS:
+                return self._values
+
+            own_session = db is None
+            session = SessionLocal() if own_session else db
+            try:
+                # Clear the flag first so a commit that lands mid-rebuild re-marks it
+                dirty, self._dirty = self._dirty, False
+                if self._values is None or dirty:
+                    self._rebuild(session)
+                else:
+                    signature = self._probe(session)
+                    if signature != self._signature:
+                        self._rebuild(session, signature)
+                self._last_sync = time.monotonic()
+            except Exception as e:
+                self._dirty = True
+                logger.warning(f"System settings refresh failed: {e}")
+                if self._values is None:
+                    return {}
+            finally:
+                if own_session:
+                    session.close()
+            return self._values
+
+    # --------------------------------------------------------
+    # GETTERS
+    # --------------------------------------------------------
+
+    def get(self, key: str, default: Any = None, db: Optional[Session] = None) -> Any:
+        value = self._ensure(db).get(key)
+        return default if value is None else value
+
+    def get_bool(self, key: str, default: bool = False, db: Optional[Session] = None) -> bool:
+        return as_bool(self.get(key, None, db), default)
+
+    def get_int(self, key: str, default: int = 0, db: Optional[Session] = None) -> int:
+        try:
+            return int(self.get(key, default, db))
+        except (TypeError, ValueError):
+            return default
+
+    def get_str(self, key: str, default: str = "", db: Optional[Session] = None) -> str:
+        value = self.get(key, None, db)
+        if value is None:
+            return default
+        text = str(value).strip()
+        return text or default
+
+    def get_dict(self, key: str, default: Optional[Dict[str, Any]] = None, db: Optional[Session] = None) -> Dict[str, Any]:
+        value = self.get(key, None, db)
+        return value if isinstance(value, dict) else dict(default or {})
+
+
+system_settings_cache = SystemSettingsCache()
@@ -0,0 +1,284 @@
+"""
+Process-wide skill vocabulary for autocomplete and "did you mean".
+
+The ``skills`` table is loaded once into an immutable snapshot holding
+- a character trie over ``normalized_name`` for prefix autocomplete
+- a BK-tree (Levenshtein metric) for fuzzy spell correction
+
+so keystroke-level lookups never touch the database. The snapshot is rebuilt
+when a commit touches ``Skill`` (see ``app.events.search_index_listeners``)
+and when a cheap ``count/max(created_at)`` probe, run at most every
+``SYNC_INTERVAL_SECONDS``, shows rows written by another worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def levenshtein(a: str, b: str) -> int:
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terminal = False
+
+
+class SkillTrie:
+    """Prefix tree over normalized skill names."""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root = _TrieNode()
+        for word in words:
+            self.insert(word)
+
+    def insert(self, word: str) -> None:
+        node = self.root
+        for ch in word:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.terminal = True
+
+    def starts_with(self, prefix: str, limit: int = 10) -> List[str]:
+        """Words beginning with ``prefix``, in sorted order."""
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+
+        out: List[str] = []
+        # Iterative DFS with children visited in character order -> sorted output
+        stack: List[Tuple[_TrieNode, str]] = [(node, prefix)]
+        while stack and len(out) < limit:
+            current, word = stack.pop()
+            if current.terminal:
+                out.append(word)
+            for ch in sorted(current.children, reverse=True):
+                stack.append((current.children[ch], word + ch))
+        return out
+
+
+class BKTree:
+    """Burkhard-Keller tree: words within an edit distance of a query."""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node_word, children = self.root
+        while True:
+            d = levenshtein(word, node_word)
+            if d == 0:
+                return
+            child = children.get(d)
+            if child is None:
+                children[d] = (word, {})
+                return
+            node_word, children = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        if self.root is None:
+            return []
+        out: List[Tuple[int, str]] = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            # Exact distance: the triangle-inequality pruning below needs it
+            d = levenshtein(word, node_word)
+            if d <= max_distance:
+                out.append((d, node_word))
+            lo, hi = d - max_distance, d + max_distance
+            for edge, child in children.items():
+                if lo <= edge <= hi:
+                    stack.append(child)
+        return out
+
+
+class _Snapshot:
+    __slots__ = ("names", "sorted_words", "word_set", "trie", "bk_tree")
+
+    def __init__(self, names: Dict[str, str]):
+        self.names = names  # normalized_name -> display name
+        self.sorted_words = sorted(names)
+        self.word_set = frozenset(names)
+        self.trie = SkillTrie(self.sorted_words)
+        self.bk_tree = BKTree(self.sorted_words)
+
+
+class SkillVocabulary:
+    """
+    Lazily loaded, atomically swapped skill vocabulary.
+    """
+
+    SYNC_INTERVAL_SECONDS = 30.0
+
+    def __init__(self):
+        self._snapshot: Optional[_Snapshot] = None
+        self._signature: Optional[tuple] = None
+        self._dirty = True
+        self._last_sync = 0.0
+        self._build_lock = threading.Lock()
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    # --------------------------------------------------------
+    # LOADING
+    # --------------------------------------------------------
+
+    @staticmethod
+    def _probe(db: Session) -> tuple:
+        count, newest = db.query(func.count(models.Skill.id), func.max(models.Skill.created_at)).one()
+        return (count, newest)
+
+    def _rebuild(self, db: Session, signature: Optional[tuple] = None) -> None:
+        started = time.perf_counter()
+        rows = db.query(models.Skill.normalized_name, models.Skill.name).all()
+        names: Dict[str, str] = {}
+        for normalized, name in rows:
+            key = (normalized or "").strip().lower()
+            if key:
+                names.setdefault(key, name or normalized)
+        self._snapshot = _Snapshot(names)
+        self._signature = signature if signature is not None else self._probe(db)
+        logger.info(f"Skill vocabulary loaded: {len(names)} skills in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _ensure(self, db: Optional[Session] = None) -> _Snapshot:
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and not self._dirty and now - self._last_sync < self.SYNC_INTERVAL_SECONDS:
+            return snapshot
+
+        with self._build_lock:
+            if self._snapshot is not None and not self._dirty and time.monotonic() - self._last_sync < self.SYNC_INTERVAL_SECONDS:
+                return self._snapshot
+
+            own_session = db is None
+            session = SessionLocal() if own_session else db
+            try:
+                # Clear the flag first so a commit that lands mid-rebuild re-marks it
+                dirty, self._dirty = self._dirty, False
+                if self._snapshot is None or dirty:
+                    self._rebuild(session)
+                else:
+                    signature = self._probe(session)
+                    if signature != self._signature:
+                        self._rebuild(session, signature)
+                self._last_sync = time.monotonic()
+            except Exception as e:
+                self._dirty = True
+                logger.warning(f"Skill vocabulary refresh failed: {e}")
+                if self._snapshot is None:
+                    return _Snapshot({})
+            finally:
+                if own_session:
+                    session.close()
+            return self._snapshot
+
+    # --------------------------------------------------------
+    # LOOKUPS
+    # --------------------------------------------------------
+
+    def contains(self, word: str, db: Optional[Session] = None) -> bool:
+        return (word or "").strip().lower() in self._ensure(db).word_set
+
+    def display_name(self, normalized: str, db: Optional[Session] = None) -> str:
+        """Display name for a normalized skill, or the input when unknown."""
+        return self._ensure(db).names.get((normalized or "").strip().lower(), normalized)
+
+    def autocomplete(self, prefix: str, limit: int = 10, db: Optional[Session] = None) -> List[str]:
+        """Display names starting with ``prefix``, sorted by normalized name."""
+        key = (prefix or "").strip().lower()
+        if not key or limit <= 0:
+            return []
+        snapshot = self._ensure(db)
+        return [snapshot.names[w] for w in snapshot.trie.starts_with(key, limit)]
+
+    def search(self, keyword: str, limit: int = 10, db: Optional[Session] = None) -> List[str]:
+        """
+        Autocomplete that keeps partial matches: prefix hits first, then names
+        containing ``keyword`` elsewhere, each group in name order.
+        """
+        key = (keyword or "").strip().lower()
+        if not key or limit <= 0:
+            return []
+        snapshot = self._ensure(db)
+        prefixed = snapshot.trie.starts_with(key, limit)
+        out = sorted((snapshot.names[w] for w in prefixed), key=str.lower)
+        if len(out) < limit:
+            seen = set(prefixed)
+            infix = [snapshot.names[w] for w in snapshot.sorted_words if key in w and w not in seen]
+            out.extend(sorted(infix, key=str.lower)[: limit - len(out)])
+        return out
+
+    def closest(self, word: str, cutoff: float = 0.88, db: Optional[Session] = None) -> Optional[str]:
+        """
+        Best normalized skill name with a ``difflib`` similarity ratio of at
+        least ``cutoff`` (same result as ``get_close_matches(word, vocab, 1, cutoff)``).
+        """
+        word = (word or "").strip().lower()
+        if not word:
+            return None
+        snapshot = self._ensure(db)
+        if word in snapshot.word_set:
+            return word
+
+        # ratio = 2M / (|a| + |b|) >= cutoff bounds both the other word's length
+        # and the insert/delete distance, which is >= Levenshtein distance
+        max_len = len(word) * (2.0 / cutoff - 1.0) if cutoff > 0 else float("inf")
+        radius = int((1.0 - cutoff) * (len(word) + max_len) + 1e-9) if cutoff > 0 else len(word) * 2
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        best: Optional[Tuple[float, str]] = None
+        for _, candidate in snapshot.bk_tree.search(word, radius):
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= cutoff and (best is None or (score, candidate) > best):
+                best = (score, candidate)
+        return best[1] if best else None
+
+    def stats(self) -> Dict[str, object]:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "skills": len(snapshot.names) if snapshot else 0,
+            "dirty": self._dirty,
+        }
+
+
+skill_vocabulary = SkillVocabulary()
@@ -0,0 +1,452 @@
+"""
+Approximate nearest-neighbour index for candidate and job embeddings.
+
+An inverted-file (IVF) index on top of ``EmbeddingStore``: vectors stay in
+the store's contiguous normalized matrix, k-means centroids partition them
+into lists, and a query only scores the ``nprobe`` closest lists, so top-k
+lookups are sub-linear in the pool size. Small pools (or untrained indexes)
+fall back to an exact scan.
+
+FAISS is used for k-means training when installed; everything else is
+NumPy. Snapshots are written to ``VECTOR_INDEX_DIR`` and reloaded at startup
+as copy-on-write memory maps, so a restart never re-encodes or re-reads
+every embedding from the database. Each snapshot is a generation directory
+published by atomically replacing one ``<name>.current`` pointer file, so
+concurrent savers can never leave a mix of files from different processes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app import models
+from app.services.embedding_store import EmbeddingStore, to_unit_vector
+
+try:
+    import faiss  # type: ignore
+    _FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    _FAISS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", os.path.join("data", "vector_index"))
+
+
+def _kmeans(data: np.ndarray, nlist: int, iterations: int = 12, seed: int = 42) -> np.ndarray:
+    """Spherical k-means (cosine) returning normalized centroids."""
+    if _FAISS_AVAILABLE:
+        km = faiss.Kmeans(data.shape[1], nlist, niter=iterations, spherical=True, seed=seed, verbose=False)
+        km.train(np.ascontiguousarray(data, dtype=np.float32))
+        return km.centroids.astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(data.shape[0], nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty lists with random points
+            sums[empty] = data[rng.choice(data.shape[0], int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class VectorIndex(EmbeddingStore):
+    """
+    IVF index keyed by entity id with add/update/delete and disk snapshots.
+    """
+
+    # Below this many vectors an exact scan is as fast as probing lists
+    MIN_TRAIN_SIZE = 4096
+    TRAIN_SAMPLE_SIZE = 50000
+    DEFAULT_NPROBE = 8
+
+    def __init__(self, model: Any, name: str, snapshot_dir: Optional[str] = None, **kwargs):
+        super().__init__(model, **kwargs)
+        self.name = name
+        self.snapshot_dir = snapshot_dir or VECTOR_INDEX_DIR
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[Set[str]] = []
+        self._assign: Dict[str, int] = {}
+        self._trained_size = 0
+        self._train_lock = threading.Lock()
+        # Ids restored from a snapshot, checked once against the DB for hard deletes
+        self._snapshot_ids: Optional[Set[str]] = None
+
+    # --------------------------------------------------------
+    # WRITE PATH (keeps IVF lists in step with the matrix)
+    # --------------------------------------------------------
+
+    def upsert(self, entity_id: str, vector: Any) -> bool:
+        with self._lock:
+            ok = super().upsert(entity_id, vector)
+            if ok and self._centroids is not None:
+                self._assign_locked(entity_id, self._matrix[self._rows[entity_id]])
+            return ok
+
+    def _remove_locked(self, entity_id: str) -> None:
+        super()._remove_locked(entity_id)
+        lst = self._assign.pop(entity_id, None)
+        if lst is not None:
+            self._lists[lst].discard(entity_id)
+
+    def _assign_locked(self, entity_id: str, unit: np.ndarray) -> None:
+        lst = int(np.argmax(self._centroids @ unit))
+        previous = self._assign.get(entity_id)
+        if previous is not None and previous != lst:
+            self._lists[previous].discard(entity_id)
+        self._assign[entity_id] = lst
+        self._lists[lst].add(entity_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._reset_ivf_locked()
+            self._snapshot_ids = None
+
+    def _reset_ivf_locked(self) -> None:
+        self._centroids = None
+        self._lists = []
+        self._assign = {}
+        self._trained_size = 0
+
+    # --------------------------------------------------------
+    # TRAINING
+    # --------------------------------------------------------
+
+    def train(self) -> bool:
+        """(Re)partition the current vectors. No-op for small pools."""
+        with self._train_lock:
+            with self._lock:
+                n = len(self._ids)
+                if n < self.MIN_TRAIN_SIZE:
+                    self._reset_ivf_locked()
+                    return False
+                rng = np.random.default_rng(n)
+                sample_rows = rng.choice(n, min(n, self.TRAIN_SAMPLE_SIZE), replace=False)
+                sample = np.array(self._matrix[sample_rows], dtype=np.float32)
+
+            nlist = max(16, min(4096, int(math.sqrt(n))))
+            centroids = _kmeans(sample, nlist)
+
+            with self._lock:
+                n = len(self._ids)
+                assign = np.empty(n, dtype=np.int64)
+                for start in range(0, n, 65536):
+                    block = self._matrix[start : min(n, start + 65536)]
+                    assign[start : start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+                self._centroids = centroids
+                self._lists = [set() for _ in range(centroids.shape[0])]
+                self._assign = {}
+                for entity_id, lst in zip(self._ids, assign.tolist()):
+                    self._assign[entity_id] = lst
+                    self._lists[lst].add(entity_id)
+                self._trained_size = n
+
+        logger.info(f"{self.name} vector index trained: {n} vectors, {nlist} lists")
+        return True
+
+    def _needs_training(self) -> bool:
+        n = len(self._ids)
+        if n < self.MIN_TRAIN_SIZE:
+            return False
+        return self._centroids is None or n >= 2 * self._trained_size
+
+    def rebuild(self) -> int:
+        with self._lock:
+            self._reset_ivf_locked()
+            self._snapshot_ids = None
+        loaded = super().rebuild()
+        self.train()
+        self.save()
+        return loaded
+
+    def ensure_fresh(self, db, force: bool = False) -> None:
+        super().ensure_fresh(db, force=force)
+        if self._snapshot_ids is not None:
+            self._reconcile_snapshot(db)
+        if self._needs_training():
+            self.train()
+
+    def _reconcile_snapshot(self, db) -> None:
+        """
+        Drop snapshot entries whose row was hard-deleted (or stopped being
+        searchable) while no process held the index. Those never show up in
+        the updated_at sync, so compare the restored ids with the live ones.
+        """
+        try:
+            live = {
+                row[0]
+                for row in db.query(self.model.id)
+                .filter(self.model.embedding_vector.isnot(None))
+                .filter(*self._searchable_filters())
+            }
+        except Exception as e:
+            logger.error(f"{self.name} vector index reconcile failed: {e}")
+            return
+
+        with self._lock:
+            restored, self._snapshot_ids = self._snapshot_ids or set(), None
+            stale = [entity_id for entity_id in restored - live if entity_id in self._rows]
+            for entity_id in stale:
+                self._remove_locked(entity_id)
+        if stale:
+            logger.info(f"{self.name} vector index dropped {len(stale)} vectors deleted since the snapshot")
+
+    # --------------------------------------------------------
+    # SEARCH
+    # --------------------------------------------------------
+
+    def search(
+        self,
+        query_vector: Any,
+        k: int,
+        nprobe: Optional[int] = None,
+        allowed_ids: Optional[Set[str]] = None,
+        exclude_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k (id, cosine similarity), highest first.
+        """
+        q = to_unit_vector(query_vector, self.dim)
+        if q is None or k <= 0:
+            return []
+        excluded = set(exclude_ids or [])
+
+        with self._lock:
+            if self._centroids is None:
+                pool: Iterable[str] = self._ids
+            else:
+                nlist = self._centroids.shape[0]
+                probes = min(nlist, nprobe or self.DEFAULT_NPROBE)
+                centroid_scores = self._centroids @ q
+                nearest = np.argpartition(-centroid_scores, probes - 1)[:probes]
+                pool = [i for lst in nearest.tolist() for i in self._lists[lst]]
+
+            ids = [
+                i for i in pool
+                if i not in excluded and (allowed_ids is None or i in allowed_ids)
+            ]
+            if not ids:
+                return []
+            rows = np.fromiter((self._rows[i] for i in ids), dtype=np.int64, count=len(ids))
+            scores = self._matrix[rows] @ q
+
+        n = scores.shape[0]
+        if k < n:
+            part = np.argpartition(-scores, k - 1)[:k]
+        else:
+            part = np.arange(n)
+        order = part[np.argsort(-scores[part])]
+        return [(ids[i], float(scores[i])) for i in order]
+
+    # --------------------------------------------------------
+    # PERSISTENCE
+    # --------------------------------------------------------
+
+    # Generation directories kept on disk besides the current one
+    SNAPSHOT_GENERATIONS_KEPT = 2
+
+    def _pointer_path(self) -> str:
+        return os.path.join(self.snapshot_dir, f"{self.name}.current")
+
+    def _generation_dir(self, generation: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{self.name}.{generation}")
+
+    def _read_pointer(self) -> Optional[str]:
+        try:
+            with open(self._pointer_path(), "r", encoding="utf-8") as fh:
+                return fh.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _atomic_write(path: str, writer) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                writer(fh)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def save(self) -> bool:
+        """
+        Snapshot vectors, ids, centroids and list assignments as a new
+        generation directory, then publish it by replacing the pointer file.
+        """
+        tmp_dir = None
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            generation = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+            with self._lock:
+                n = len(self._ids)
+                vectors = np.array(self._matrix[:n], dtype=np.float32)
+                ids = list(self._ids)
+                centroids = None if self._centroids is None else self._centroids.copy()
+                assign = np.fromiter((self._assign.get(i, -1) for i in ids), dtype=np.int32, count=n)
+                meta = {
+                    "name": self.name,
+                    "generation": generation,
+                    "dim": self.dim,
+                    "count": n,
+                    "trained_size": self._trained_size,
+                    "high_water": self._high_water.isoformat() if self._high_water else None,
+                    "embedding_high_water": (
+                        self._embedding_high_water.isoformat() if self._embedding_high_water else None
+                    ),
+                    "saved_at": datetime.utcnow().isoformat(),
+                }
+
+            tmp_dir = tempfile.mkdtemp(dir=self.snapshot_dir, prefix=f".tmp-{self.name}-")
+            np.save(os.path.join(tmp_dir, "vectors.npy"), vectors)
+            np.save(os.path.join(tmp_dir, "assign.npy"), assign)
+            if centroids is not None:
+                np.save(os.path.join(tmp_dir, "centroids.npy"), centroids)
+            with open(os.path.join(tmp_dir, "ids.json"), "w", encoding="utf-8") as fh:
+                json.dump(ids, fh)
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as fh:
+                json.dump(meta, fh)
+            os.rename(tmp_dir, self._generation_dir(generation))
+            tmp_dir = None
+
+            # The single atomic step: readers see the old or the new generation
+            self._atomic_write(self._pointer_path(), lambda fh: fh.write(generation.encode("utf-8")))
+            self._prune_generations()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save {self.name} vector index: {e}")
+            return False
+        finally:
+            if tmp_dir is not None:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _prune_generations(self) -> None:
+        current = self._read_pointer()
+        prefix = f"{self.name}."
+        generations = sorted(
+            entry[len(prefix):]
+            for entry in os.listdir(self.snapshot_dir)
+            if entry.startswith(prefix) and os.path.isdir(os.path.join(self.snapshot_dir, entry))
+        )
+        for generation in generations[: -self.SNAPSHOT_GENERATIONS_KEPT]:
+            if generation != current:
+                shutil.rmtree(self._generation_dir(generation), ignore_errors=True)
+
+    def load(self) -> bool:
+        """
+        Reload the current snapshot. Vectors are memory-mapped copy-on-write,
+        so pages are only read when touched and updates never modify the
+        snapshot. Rows deleted since the snapshot are dropped on first sync.
+        """
+        generation = self._read_pointer()
+        if generation is None:
+            return False
+        directory = self._generation_dir(generation)
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            if meta.get("generation") != generation or int(meta.get("dim") or 0) != self.dim:
+                return False
+            with open(os.path.join(directory, "ids.json"), "r", encoding="utf-8") as fh:
+                ids = json.load(fh)
+            vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="c")
+            assign = np.load(os.path.join(directory, "assign.npy"))
+            centroids = None
+            if os.path.exists(os.path.join(directory, "centroids.npy")):
+                centroids = np.load(os.path.join(directory, "centroids.npy")).astype(np.float32)
+            if (
+                len(ids) != int(meta.get("count", -1))
+                or vectors.shape != (len(ids), self.dim)
+                or assign.shape[0] != len(ids)
+            ):
+                return False
+        except Exception as e:
+            logger.error(f"Failed to load {self.name} vector index: {e}")
+            return False
+
+        with self._lock:
+            self._matrix = vectors if len(ids) else np.zeros((1024, self.dim), dtype=np.float32)
+            self._ids = list(ids)
+            self._rows = {entity_id: row for row, entity_id in enumerate(ids)}
+            self._reset_ivf_locked()
+            if centroids is not None:
+                self._centroids = centroids
+                self._lists = [set() for _ in range(centroids.shape[0])]
+                for entity_id, lst in zip(ids, assign.tolist()):
+                    if lst >= 0:
+                        self._assign[entity_id] = lst
+                        self._lists[lst].add(entity_id)
+                self._trained_size = int(meta.get("trained_size") or len(ids))
+            high_water = meta.get("high_water")
+            self._high_water = datetime.fromisoformat(high_water) if high_water else None
+            embedded = meta.get("embedding_high_water")
+            self._embedding_high_water = datetime.fromisoformat(embedded) if embedded else None
+            self._dirty.clear()
+            self._snapshot_ids = set(ids)
+            self._loaded = True
+            # Force a sync on first use to pick up changes made since the snapshot
+            self._last_sync = 0.0
+
+        logger.info(f"{self.name} vector index loaded from snapshot {generation}: {len(ids)} vectors")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        out = super().stats()
+        with self._lock:
+            out.update(
+                {
+                    "name": self.name,
+                    "backend": "ivf-faiss-kmeans" if _FAISS_AVAILABLE else "ivf-numpy",
+                    "lists": 0 if self._centroids is None else int(self._centroids.shape[0]),
+                    "trained_size": self._trained_size,
+                }
+            )
+        return out
+
+
+# Global instances
+candidate_vector_index = VectorIndex(models.Candidate, name="candidates")
+job_vector_index = VectorIndex(models.Job, name="jobs")
+
+
+def index_for_metadata(metadata: Dict[str, Any]) -> Tuple[Optional[VectorIndex], Optional[str]]:
+    """Resolve the target index and key from add_to_faiss_index metadata."""
+    if metadata.get("candidate_id"):
+        return candidate_vector_index, str(metadata["candidate_id"])
+    if metadata.get("job_id"):
+        return job_vector_index, str(metadata["job_id"])
+    return None, None
+
+
+def load_vector_indexes() -> None:
+    for index in (candidate_vector_index, job_vector_index):
+        index.load()
+
+
+def save_vector_indexes() -> None:
+    for index in (candidate_vector_index, job_vector_index):
+        if index.stats()["loaded"]:
+            index.save()
@@ -0,0 +1,67 @@
+"""
+Compact binary storage for embedding vectors.
+
+Vectors are stored as little-endian float32 bytes (1.5 KB for a 384-d
+MiniLM vector, versus ~8 KB of JSON text) and read back with
+``np.frombuffer`` — no per-float parsing and no Python list.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def pack_embedding(value: Any) -> Optional[bytes]:
+    """list / ndarray / JSON text -> float32 bytes (None for empty input)."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value) or None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+        if value is None:
+            return None
+    try:
+        vec = np.asarray(value, dtype=EMBEDDING_DTYPE).reshape(-1)
+    except (TypeError, ValueError):
+        return None
+    if vec.size == 0:
+        return None
+    return vec.tobytes()
+
+
+def unpack_embedding(value: Any) -> Optional[np.ndarray]:
+    """float32 bytes -> read-only ndarray view over the same buffer."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if len(value) == 0 or len(value) % EMBEDDING_DTYPE.itemsize:
+            return None
+        return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
+    # Legacy JSON value that has not been backfilled yet
+    packed = pack_embedding(value)
+    return None if packed is None else np.frombuffer(packed, dtype=EMBEDDING_DTYPE)
+
+
+class EmbeddingVector(TypeDecorator):
+    """
+    Column type for embeddings: accepts lists/arrays, returns float32 arrays.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return pack_embedding(value)
+
+    def process_result_value(self, value, dialect):
+        return unpack_embedding(value)
@@ -2,15 +2,16 @@ from __future__ import annotations
 
 from collections import Counter
 from datetime import date, datetime, timedelta
-from difflib import get_close_matches
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import heapq
 import json
 import re
 
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import Session
 
 from app import models
+from app.services.skill_vocabulary import skill_vocabulary
 
 STOPWORDS = {
     "a",
@@ -362,6 +363,32 @@ def availability_bucket(c: models.Candidate) -> Optional[str]:
     return None
 
 
+def availability_bucket_sql(today: Optional[date] = None):
+    """
+    SQL CASE equivalent of availability_bucket(), so availability filters
+    run in the database instead of on hydrated rows.
+    """
+    today = today or date.today()
+    join_date = models.Candidate.availability_to_join
+    np_days = models.Candidate.notice_period_days
+    np_str = func.lower(func.coalesce(models.Candidate.notice_period, ""))
+
+    return case(
+        (and_(join_date.isnot(None), join_date <= today), "immediate"),
+        (and_(join_date.isnot(None), join_date <= today + timedelta(days=14)), "2weeks"),
+        (and_(join_date.isnot(None), join_date <= today + timedelta(days=30)), "1month"),
+        (join_date.isnot(None), "not_available"),
+        (and_(np_days.isnot(None), np_days <= 7), "immediate"),
+        (and_(np_days.isnot(None), np_days <= 14), "2weeks"),
+        (and_(np_days.isnot(None), np_days <= 30), "1month"),
+        (np_days.isnot(None), "not_available"),
+        (np_str.like("%immediate%"), "immediate"),
+        (or_(np_str.like("%15%"), np_str.like("%2 week%"), np_str.like("%two week%")), "2weeks"),
+        (or_(np_str.like("%30%"), np_str.like("%1 month%"), np_str.like("%one month%")), "1month"),
+        else_=None,
+    )
+
+
 def availability_score(c: models.Candidate) -> float:
     weights = {
         "immediate": 100.0,
@@ -511,6 +538,45 @@ def structured_score(filters_used: Dict[str, Any], c: models.Candidate) -> float
     return float((sum(1 for x in checks if x) / len(checks)) * 100.0)
 
 
+def bounded_top_k(
+    upper_bounds: Sequence[float],
+    score_batch: Callable[[List[int]], List[float]],
+    k: int,
+    batch_size: int = 100,
+) -> List[Tuple[int, float]]:
+    """
+    Exact top-k without scoring every item.
+
+    Items are visited in descending ``upper_bounds`` order and scored in
+    batches; the scan stops as soon as no remaining bound can beat the k-th
+    best exact score. Ties keep input order, like a stable sort.
+
+    Returns (index, score) pairs, best first.
+    """
+    if k <= 0:
+        return []
+
+    pending = [(-b, i) for i, b in enumerate(upper_bounds)]
+    heapq.heapify(pending)
+    best: List[Tuple[float, int]] = []  # min-heap of (score, -index)
+
+    def _done() -> bool:
+        return len(best) >= k and -pending[0][0] < best[0][0]
+
+    while pending and not _done():
+        batch: List[int] = []
+        while pending and len(batch) < batch_size and not _done():
+            batch.append(heapq.heappop(pending)[1])
+        for i, score in zip(batch, score_batch(batch)):
+            entry = (score, -i)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+    return [(-neg_i, score) for score, neg_i in sorted(best, reverse=True)]
+
+
 def confidence(scores: Dict[str, float]) -> str:
     final = scores.get("final_score", 0.0)
     if final >= 80 and scores.get("skills", 0.0) >= 70 and scores.get("experience", 0.0) >= 60:
@@ -598,19 +664,15 @@ def spell_check_query(db: Session, query: str) -> Optional[str]:
     if not tokens:
         return None
 
-    skills = db.query(models.Skill.normalized_name).limit(5000).all()
-    vocab = [s[0] for s in skills if s and s[0]]
-    vocab_set = set(vocab)
-
     corrected: List[str] = []
     changed = False
     for t in tokens:
-        if t in vocab_set or len(t) < 4 or t.isdigit():
+        if len(t) < 4 or t.isdigit() or skill_vocabulary.contains(t, db=db):
             corrected.append(t)
             continue
-        match = get_close_matches(t, vocab, n=1, cutoff=0.88)
+        match = skill_vocabulary.closest(t, cutoff=0.88, db=db)
         if match:
-            corrected.append(match[0])
+            corrected.append(match)
             changed = True
         else:
             corrected.append(t)
@@ -664,14 +726,7 @@ def search_suggestions(db: Session, query: str, current_user: Dict[str, Any]) ->
         toks = tokenize(q)
         keyword = toks[-1] if toks else ""
         if keyword:
-            skills = (
-                db.query(models.Skill.name)
-                .filter(models.Skill.normalized_name.ilike(f"%{keyword.lower()}%"))
-                .order_by(models.Skill.name.asc())
-                .limit(5)
-                .all()
-            )
-            out.extend([f"{q} {s[0]}" for s in skills if s and s[0]])
+            out.extend([f"{q} {name}" for name in skill_vocabulary.search(keyword, limit=5, db=db)])
     except Exception:
         pass
 
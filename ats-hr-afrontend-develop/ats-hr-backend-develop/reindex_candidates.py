@@ -1,6 +1,7 @@
 
 import os
 import sys
+from datetime import datetime
 
 # Add current directory to path so we can import app
 sys.path.append(os.getcwd())
@@ -9,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.db import SessionLocal
 from app import models
 from app.ai_core import generate_candidate_embedding
+from app.services.embedding_service import EMBEDDING_MODEL_VERSION
 
 def reindex_all():
     db: Session = SessionLocal()
@@ -27,7 +29,12 @@ def reindex_all():
                 }
                 
                 embedding = generate_candidate_embedding(candidate_data)
+                # All-zero fallback vector means the model was unavailable; leave it
+                # untagged so the background refresh embeds the candidate later
+                embedded = any(embedding)
                 c.embedding_vector = embedding
+                c.embedding_model = EMBEDDING_MODEL_VERSION if embedded else None
+                c.embedding_updated_at = datetime.utcnow() if embedded else None
                 
                 if (i + 1) % 10 == 0:
                     db.commit()
@@ -0,0 +1,84 @@
+"""
+Shared pytest fixtures.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import smtplib
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.services import mail_transport
+
+SMTP_SETTINGS = mail_transport.SMTPSettings("smtp.test", 587, "user", "pw", "noreply@test")
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Session bound to a fresh file-backed SQLite database with every table created."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+class FakeSMTPServer:
+    """
+    In-memory SMTP server. ``fail_next`` drops the next N sends with a
+    disconnect; recipients in ``refuse`` get a transient 451.
+    """
+
+    def __init__(self):
+        self.opened = 0
+        self.fail_next = 0
+        self.refuse = set()
+        self.sent = []
+
+    def connect(self, server, port, timeout=None):
+        self.opened += 1
+        return _FakeSMTPConnection(self)
+
+
+class _FakeSMTPConnection:
+    def __init__(self, server: FakeSMTPServer):
+        self.server = server
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        return (250, b"ok")
+
+    def sendmail(self, sender, to, body):
+        if self.server.fail_next:
+            self.server.fail_next -= 1
+            raise smtplib.SMTPServerDisconnected("gone")
+        if to in self.server.refuse:
+            raise smtplib.SMTPResponseException(451, b"try later")
+        self.server.sent.append(to)
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    """A ``FakeSMTPServer`` that every ``smtplib.SMTP`` connection in the mail transport talks to."""
+    server = FakeSMTPServer()
+    monkeypatch.setattr(mail_transport.smtplib, "SMTP", server.connect)
+    return server
@@ -0,0 +1,45 @@
+"""
+Tests for column-projected candidate rows.
+"""
+
+import pytest
+
+from app import models
+from app.services.candidate_rows import MATCHING_FIELDS, load_candidate_rows, prefetch_certifications
+
+
+@pytest.fixture
+def db(db_session):
+    db_session.add_all(
+        [
+            models.Candidate(id="c1", full_name="Ann", skills=["Python"], experience_years=4),
+            models.Candidate(id="c2", full_name="Bob", skills=["Java"]),
+            models.Certification(id="x1", candidate_id="c1", name="AWS Developer", organization="Amazon"),
+            models.Certification(id="x2", candidate_id="c1", name="CKA", organization="CNCF"),
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+def test_projection_keeps_query_filters_and_ordering(db):
+    query = db.query(models.Candidate).order_by(models.Candidate.id.desc())
+    rows = load_candidate_rows(query, MATCHING_FIELDS)
+    assert [r.id for r in rows] == ["c2", "c1"]
+    assert rows[1].skills == ["Python"] and rows[1].experience_years == 4
+    # Columns outside the projection read as None instead of lazy-loading
+    assert rows[1].current_location is None and rows[1].certifications is None
+
+    limited = load_candidate_rows(query.filter(models.Candidate.full_name == "Ann"))
+    assert [r.full_name for r in limited] == ["Ann"]
+
+
+def test_prefetch_certifications_fills_only_missing(db):
+    rows = load_candidate_rows(db.query(models.Candidate).order_by(models.Candidate.id))
+    prefetch_certifications(db, rows)
+    assert sorted(c.name for c in rows[0].certifications) == ["AWS Developer", "CKA"]
+    assert rows[1].certifications == []
+
+    rows[1].certifications = ["kept"]
+    prefetch_certifications(db, rows)
+    assert rows[1].certifications == ["kept"]
@@ -0,0 +1,53 @@
+"""
+Tests for the Resdex BM25 inverted index.
+"""
+
+from app.services.candidate_search_index import CandidateSearchIndex
+
+
+def _index():
+    idx = CandidateSearchIndex()
+    idx.index_text("c1", "python django postgresql aws")
+    idx.index_text("c2", "java spring kubernetes")
+    idx.index_text("c3", "python python machine learning pytorch")
+    return idx
+
+
+def test_only_documents_with_query_terms_are_scored():
+    idx = _index()
+    scores = idx.search(["python"])
+    assert set(scores) == {"c1", "c3"}
+
+
+def test_term_frequency_ranks_higher():
+    idx = _index()
+    scores = idx.search(["python"])
+    assert scores["c3"] > scores["c1"]
+
+
+def test_synonyms_applied_to_documents_and_queries():
+    idx = CandidateSearchIndex()
+    idx.index_text("c1", "k8s docker")
+    assert "c1" in idx.search(["kubernetes"])
+
+
+def test_reindex_replaces_previous_document():
+    idx = _index()
+    idx.index_text("c2", "golang")
+    assert "c2" not in idx.search(["java"])
+    assert "c2" in idx.search(["golang"])
+
+
+def test_remove_drops_postings():
+    idx = _index()
+    idx.remove("c1")
+    assert set(idx.search(["python"])) == {"c3"}
+    assert idx.search(["django"]) == {}
+    assert idx.stats()["documents"] == 2
+
+
+def test_keyword_scores_are_scaled_to_100():
+    idx = _index()
+    scores = idx.keyword_scores(["python", "pytorch"])
+    assert max(scores.values()) == 100.0
+    assert 0.0 < scores["c1"] < 100.0
@@ -0,0 +1,91 @@
+"""
+Tests for the candidate_terms side table and the SQL Resdex filters.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app import models
+from app.events.candidate_terms_listeners import register_candidate_terms_listeners
+from app.services.candidate_terms import certifications_filter, skills_filter, tags_filter
+from app.utils.resdex_search_engine import availability_bucket, availability_bucket_sql
+
+
+@pytest.fixture
+def db(db_session):
+    register_candidate_terms_listeners()
+    db_session.add_all(
+        [
+            models.Candidate(id="c1", skills=["Python", "K8s"], tags=["Hot"]),
+            models.Candidate(id="c2", skills=["JavaScript"], tags=["hot", "remote"]),
+            models.Candidate(id="c3", skills=["Java", "python"], certifications_text="AWS Solutions Architect"),
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+def _ids(db, predicate):
+    return {c.id for c in db.query(models.Candidate).filter(predicate).all()}
+
+
+def test_skills_match_exactly_and_case_insensitively(db):
+    assert _ids(db, skills_filter(["java"])) == {"c3"}
+    assert _ids(db, skills_filter(["kubernetes"])) == {"c1"}
+    assert _ids(db, skills_filter(["python", "java"], "AND")) == {"c3"}
+    assert _ids(db, skills_filter(["javascript", "java"], "OR")) == {"c2", "c3"}
+
+
+def test_terms_follow_updates_and_certifications(db):
+    assert _ids(db, tags_filter(["hot", "remote"])) == {"c2"}
+    assert _ids(db, certifications_filter(["aws"])) == {"c3"}
+
+    c1 = db.get(models.Candidate, "c1")
+    c1.tags = ["remote", "hot"]
+    db.add(models.Certification(id="x", candidate_id="c1", name="AWS Developer", organization="Amazon"))
+    db.commit()
+    assert _ids(db, tags_filter(["hot", "remote"])) == {"c1", "c2"}
+    assert _ids(db, certifications_filter(["aws"])) == {"c1", "c3"}
+
+
+def test_parsed_resume_certifications_are_indexed(db):
+    db.add(
+        models.Candidate(
+            id="c4",
+            parsed_resume={"certifications": [{"name": "Certified Kubernetes Administrator"}], "summary": "PMP"},
+        )
+    )
+    db.commit()
+    assert _ids(db, certifications_filter(["kubernetes"])) == {"c4"}
+    assert _ids(db, certifications_filter(["pmp"])) == set()
+
+    c4 = db.get(models.Candidate, "c4")
+    c4.parsed_resume = {"certifications_text": "PMP, CKA"}
+    db.commit()
+    assert _ids(db, certifications_filter(["kubernetes"])) == set()
+    assert _ids(db, certifications_filter(["pmp"])) == {"c4"}
+
+
+def test_availability_sql_matches_python_buckets(db):
+    today = date.today()
+    profiles = [
+        {"availability_to_join": today - timedelta(days=1)},
+        {"availability_to_join": today + timedelta(days=10)},
+        {"availability_to_join": today + timedelta(days=25)},
+        {"availability_to_join": today + timedelta(days=60)},
+        {"notice_period_days": 0},
+        {"notice_period_days": 14},
+        {"notice_period_days": 90},
+        {"notice_period": "Immediate joiner"},
+        {"notice_period": "2 weeks"},
+        {"notice_period": "30 days"},
+        {"notice_period": "negotiable"},
+    ]
+    for i, profile in enumerate(profiles):
+        db.add(models.Candidate(id=f"a{i}", **profile))
+    db.commit()
+
+    bucket = availability_bucket_sql(today)
+    for c, sql_bucket in db.query(models.Candidate, bucket).filter(models.Candidate.id.like("a%")).all():
+        assert sql_bucket == availability_bucket(c), c.id
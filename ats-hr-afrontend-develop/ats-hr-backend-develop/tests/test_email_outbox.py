@@ -0,0 +1,114 @@
+"""
+Tests for the durable outbound-email queue.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.routes.candidates import bulk_email
+from app.services import email_outbox
+from app.services import mail_transport as mt
+from tests.conftest import SMTP_SETTINGS
+
+USER = {"id": "u1", "role": "admin", "type": "user"}
+
+
+@pytest.fixture
+def db(db_session, fake_smtp, monkeypatch):
+    monkeypatch.setattr(email_outbox, "mail_transport", mt.MailTransport(rate_per_second=0))
+    monkeypatch.setattr(email_outbox, "resolve_smtp_settings", lambda: SMTP_SETTINGS)
+    return db_session
+
+
+def test_drain_sends_and_tracks_retries(db, fake_smtp):
+    ok = email_outbox.enqueue_email(db, "a@x.io", "hi", text="body").id
+    later = email_outbox.enqueue_email(db, "b@x.io", "hi", text="body").id
+    db.commit()
+    fake_smtp.refuse = {"b@x.io"}
+
+    counts = email_outbox.drain_batch(db)
+    assert counts["sent"] == 1 and counts["retrying"] == 1
+    assert fake_smtp.sent == ["a@x.io"]
+
+    db.expire_all()
+    sent, retrying = db.get(models.EmailOutbox, ok), db.get(models.EmailOutbox, later)
+    assert (sent.status, sent.attempts, sent.claim_token) == ("sent", 1, None)
+    assert retrying.status == "retrying" and retrying.attempts == 1 and "try later" in retrying.last_error
+
+    # Not due yet; once it is, it is delivered
+    assert email_outbox.drain_batch(db)["claimed"] == 0
+    fake_smtp.refuse = set()
+    counts = email_outbox.drain_batch(db, now=retrying.next_attempt_at + timedelta(seconds=1))
+    assert counts["sent"] == 1 and fake_smtp.sent == ["a@x.io", "b@x.io"]
+    assert email_outbox.outbox_status(db, [later])[0]["attempts"] == 2
+
+
+def test_stale_claims_are_picked_up_again(db):
+    row = email_outbox.enqueue_email(db, "a@x.io", "hi")
+    row.status = "sending"
+    row.claimed_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+    assert email_outbox.drain_batch(db)["sent"] == 1
+
+
+def test_bulk_email_writes_outbox_and_log_rows(db, monkeypatch):
+    monkeypatch.setattr("app.routes.candidates.wake_outbox_worker", lambda: None)
+    db.add(models.Candidate(id="c1", email="c1@x.io", email_logs=[{"subject": "old", "sent_at": "2024-01-01T00:00:00"}]))
+    db.add(models.Candidate(id="c2", email="c2@x.io"))
+    db.commit()
+
+    with db.get_bind().begin() as conn:
+        assert email_outbox.backfill_candidate_email_logs(conn) == 1
+
+    result = asyncio.run(
+        bulk_email.__wrapped__(subject="Hello", message_body="Body", candidate_ids=["c1", "c2"], db=db, current_user=USER)
+    )
+    assert sorted(result["sent_to"]) == ["c1@x.io", "c2@x.io"]
+    assert db.query(models.EmailOutbox).count() == 2
+
+    history = email_outbox.candidate_email_history(db, "c1")
+    assert [h["subject"] for h in history] == ["Hello", "old"]
+    assert history[0]["status"] == "queued"
+
+    email_outbox.drain_batch(db)
+    assert email_outbox.candidate_email_history(db, "c2")[0]["status"] == "sent"
+
+
+def test_job_invites_follow_their_outbox_email(db, fake_smtp, monkeypatch):
+    from app.routes.nvite import JobInviteRequest, invite_message_status, send_job_invites
+
+    monkeypatch.setattr("app.routes.nvite.wake_outbox_worker", lambda: None)
+    db.add(models.Candidate(id="c1", full_name="Asha", email="c1@x.io"))
+    db.add(models.Candidate(id="c2", full_name="Ravi", email="c2@x.io"))
+    db.commit()
+    payload = JobInviteRequest(
+        candidate_ids=["c1", "c2"], job_id="j1", job_title="Dev", job_location="Pune",
+        apply_link="https://x.io/apply", recruiter_name="R", company_name="Acme",
+    )
+
+    result = asyncio.run(send_job_invites.__wrapped__(payload=payload, db=db, current_user=USER))
+    assert (result["sent"], result["queued"], result["failed"]) == (0, 2, 0)
+    ids = ",".join(d["message_id"] for d in result["details"])
+    invites = db.query(models.CandidateInvite).all()
+    assert {i.status for i in invites} == {"queued"} and all(i.outbox_id for i in invites)
+
+    fake_smtp.refuse = {"c2@x.io"}
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_MAX_ATTEMPTS", 1)
+    email_outbox.drain_batch(db)
+    db.expire_all()
+    assert {i.candidate_id: i.status for i in db.query(models.CandidateInvite)} == {
+        "c1": "job_invite_sent",
+        "c2": "failed",
+    }
+    status = asyncio.run(invite_message_status.__wrapped__(message_ids=ids, db=db, current_user=USER))
+    assert sorted(r["status"] for r in status["results"]) == ["failed", "sent"]
+
+    # Only the delivered invite blocks a repeat; a queued one without an
+    # outbox row (never durably queued) does not
+    db.add(models.CandidateInvite(candidate_id="c2", recruiter_id="u1", job_id="j1", status="queued"))
+    db.commit()
+    again = asyncio.run(send_job_invites.__wrapped__(payload=payload, db=db, current_user=USER))
+    assert again["queued"] == 1 and again["failed"] == 1
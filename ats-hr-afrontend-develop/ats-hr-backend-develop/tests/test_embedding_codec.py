@@ -0,0 +1,25 @@
+"""
+Tests for the binary embedding column codec.
+"""
+
+import json
+
+import numpy as np
+
+from app.utils.embedding_codec import pack_embedding, unpack_embedding
+
+
+def test_round_trip_is_float32_view():
+    packed = pack_embedding([0.25, -1.5, 3.0])
+    assert len(packed) == 12
+    vec = unpack_embedding(packed)
+    assert vec.dtype == np.float32
+    assert vec.tolist() == [0.25, -1.5, 3.0]
+    assert not vec.flags.writeable
+
+
+def test_legacy_json_values_are_accepted():
+    assert unpack_embedding(json.dumps([1.0, 2.0])).tolist() == [1.0, 2.0]
+    assert pack_embedding("null") is None
+    assert pack_embedding([]) is None
+    assert unpack_embedding(b"\x00\x01\x02") is None
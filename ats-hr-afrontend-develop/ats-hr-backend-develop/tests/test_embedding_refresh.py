@@ -0,0 +1,56 @@
+"""
+Tests for the background re-embedding job.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app import models
+from app.services.embedding_refresh import TARGETS, refresh_embeddings
+
+
+def _encode(texts):
+    return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def _refresh(db, **kwargs):
+    model, columns, text_fn, _ = TARGETS["candidates"]
+    return refresh_embeddings(db, model, columns, text_fn, encode=_encode, max_per_second=0, **kwargs)
+
+
+def test_missing_and_outdated_embeddings_are_refreshed(db_session):
+    edited = datetime.utcnow() - timedelta(hours=1)
+    db_session.add_all(
+        [
+            models.Candidate(id="missing", full_name="A", skills=["python"]),
+            models.Candidate(
+                id="old-model", full_name="B", embedding_vector=[0.5] * 4,
+                embedding_model="old", embedding_updated_at=edited,
+            ),
+            models.Candidate(
+                id="fresh", full_name="C", embedding_vector=[0.5] * 4,
+                embedding_model="v2", embedding_updated_at=datetime.utcnow() + timedelta(hours=1),
+            ),
+        ]
+    )
+    db_session.commit()
+    before = db_session.get(models.Candidate, "missing").updated_at
+
+    assert _refresh(db_session, version="v2") == 2
+    db_session.expire_all()
+    row = db_session.get(models.Candidate, "missing")
+    assert row.embedding_model == "v2"
+    assert row.embedding_vector.tolist() == [1.0] * 4
+    # Re-embedding is not a profile edit
+    assert row.updated_at == before
+    assert db_session.get(models.Candidate, "fresh").embedding_vector.tolist() == [0.5] * 4
+
+    assert _refresh(db_session, version="v2") == 0
+
+
+def test_limit_caps_rows_per_run(db_session):
+    db_session.add_all([models.Candidate(id=f"c{i}", full_name=str(i)) for i in range(5)])
+    db_session.commit()
+    assert _refresh(db_session, version="v1", batch_size=2, limit=3) == 3
+    assert _refresh(db_session, version="v1", batch_size=2, limit=10) == 2
@@ -0,0 +1,155 @@
+"""
+Tests for the shared micro-batching embedding service.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache, cache_key
+from app.services.embedding_service import EmbeddingService
+
+
+class FakeModel:
+    def __init__(self, uncased=False):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.tokenizer = SimpleNamespace(do_lower_case=uncased)
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, **kwargs):
+        with self.lock:
+            self.calls.append(list(texts))
+        return np.array([[len(t), 1.0, 0.0, 0.0] for t in texts], dtype=np.float64)
+
+
+def _service(uncased_model=False, **kwargs):
+    service = EmbeddingService(**kwargs)
+    service._model = FakeModel(uncased_model)
+    return service
+
+
+def test_encode_preserves_order_and_duplicates():
+    service = _service(max_wait_ms=0)
+    vectors = service.encode(["aa", "b", "aa"])
+    assert vectors.dtype == np.float32
+    assert vectors[:, 0].tolist() == [2.0, 1.0, 2.0]
+    assert service._model.calls == [["aa", "b"]]
+
+
+def test_concurrent_requests_are_coalesced():
+    service = _service(max_wait_ms=200, max_batch_size=64)
+    futures = [service.submit(["same", f"text-{i}"]) for i in range(10)]
+    results = [f.result(timeout=5) for f in futures]
+    assert all(r.shape == (2, 4) for r in results)
+    encoded = [t for call in service._model.calls for t in call]
+    assert encoded.count("same") == len(service._model.calls)
+    assert len(service._model.calls) < 10
+
+
+def test_encode_async():
+    service = _service(max_wait_ms=0)
+    vector = asyncio.run(service.encode_one_async("abc"))
+    assert vector[0] == 3.0
+
+
+def test_model_failure_propagates():
+    service = EmbeddingService(max_wait_ms=0)
+    service._model_failed = True
+    future = service.submit(["x"])
+    try:
+        future.result(timeout=5)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+
+
+def test_cache_serves_repeat_requests_without_encoding():
+    service = _service(uncased_model=True, max_wait_ms=0, cache=EmbeddingCache(max_entries=10))
+    service.encode(["Python Developer"])
+    vector = service.encode(["python   developer"])[0]
+    assert vector[0] == 16.0
+    assert service._model.calls == [["Python Developer"]]
+    assert service.cache.stats()["hits"] == 1
+
+
+def test_cache_keys_keep_case_for_cased_models():
+    service = _service(max_wait_ms=0, cache=EmbeddingCache(max_entries=10))
+    service.encode(["Python Developer"])
+    service.encode(["Python   Developer"])
+    service.encode(["python developer"])
+    assert service._model.calls == [["Python Developer"], ["python developer"]]
+    assert service.uncased is False
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    key = cache_key("model", "text")
+    EmbeddingCache(disk_path=path).put(key, [1.0, 2.0])
+    reloaded = EmbeddingCache(disk_path=path)
+    assert reloaded.get(key).tolist() == [1.0, 2.0]
+    assert reloaded.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_is_capped_and_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache(max_entries=1, disk_path=str(tmp_path / "cache.sqlite3"), max_disk_entries=3)
+    cache.put_many([("a", [1.0]), ("b", [2.0]), ("c", [3.0])])
+    cache.clear()
+    cache._disk.execute("UPDATE embedding_cache SET used_at = 0 WHERE key = 'b'")
+    cache.put("d", [4.0])
+    stats = cache.stats()
+    assert stats["disk_entries"] <= 3 and stats["disk_evictions"] >= 1
+    cache.clear()
+    assert cache.get("b") is None
+    assert cache.get("d") is not None
+
+
+def test_relative_disk_path_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = EmbeddingCache(disk_path="embeddings.sqlite3")
+    cache.put("a", [1.0])
+    assert cache.disk_path is None
+    assert not (tmp_path / "embeddings.sqlite3").exists()
+
+
+def test_submit_does_not_read_the_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    EmbeddingCache(disk_path=path).put(cache_key("fake", "abc"), [9.0, 0.0, 0.0, 0.0])
+    service = _service(model_name="fake", max_wait_ms=0, cache=EmbeddingCache(disk_path=path))
+    calls = []
+    real = service.cache._disk_get_many
+    service.cache._disk_get_many = lambda keys: calls.append(threading.current_thread().name) or real(keys)
+
+    assert service.encode(["abc"])[0][0] == 9.0
+    assert calls and all(name.startswith("embedding") for name in calls)
+    assert service._model.calls == []
+
+
+def test_async_semantic_similarities_match_sync(monkeypatch):
+    import app.matching_service as ms
+
+    service = _service(max_wait_ms=0)
+    monkeypatch.setattr(ms, "embedding_service", service)
+    matcher = ms.MatchingService.__new__(ms.MatchingService)
+    summaries = ["python dev", "", "java"]
+
+    expected = matcher.calculate_semantic_similarities("backend job", summaries)
+    got = asyncio.run(matcher.calculate_semantic_similarities_async("backend job", summaries))
+    assert got == expected and got[1] == 0.0
+    assert asyncio.run(matcher.calculate_semantic_similarity_async("backend job", "java")) == expected[2]
@@ -0,0 +1,56 @@
+"""
+Tests for the contiguous candidate embedding store.
+"""
+
+import numpy as np
+
+from app import models
+from app.services.embedding_store import EmbeddingStore
+
+
+def _vec(*head):
+    v = np.zeros(384, dtype=np.float32)
+    v[: len(head)] = head
+    return v.tolist()
+
+
+def _store():
+    store = EmbeddingStore(models.Candidate, initial_capacity=2)
+    store.upsert("a", _vec(1, 0))
+    store.upsert("b", _vec(0, 1))
+    store.upsert("c", _vec(1, 1))
+    return store
+
+
+def test_similarities_match_cosine():
+    store = _store()
+    sims = store.similarities(_vec(2, 0))
+    assert sims["a"] == 1.0
+    assert abs(sims["b"]) < 1e-6
+    assert abs(sims["c"] - (1 / np.sqrt(2))) < 1e-6
+
+
+def test_similarities_restricted_to_ids():
+    store = _store()
+    assert set(store.similarities(_vec(1, 0), ["b", "missing"])) == {"b"}
+
+
+def test_top_k_orders_best_first():
+    store = _store()
+    assert [i for i, _ in store.top_k(_vec(1, 0.1), 2)] == ["a", "c"]
+
+
+def test_remove_keeps_rows_consistent():
+    store = _store()
+    store.remove("a")
+    assert len(store) == 2
+    assert store.similarities(_vec(0, 1))["b"] == 1.0
+    assert store.top_k(_vec(1, 1), 1)[0][0] == "c"
+
+
+def test_zero_and_malformed_vectors_are_ignored():
+    store = _store()
+    assert store.upsert("z", [0.0] * 384) is False
+    assert store.upsert("m", [1.0, 2.0]) is False
+    assert store.similarities([0.0] * 384) == {}
+    assert len(store) == 3
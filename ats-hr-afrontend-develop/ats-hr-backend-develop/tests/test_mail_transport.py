@@ -0,0 +1,42 @@
+"""
+Tests for the pooled, rate-limited mail transport.
+"""
+
+import smtplib
+from email.message import Message
+
+import pytest
+
+from app.services import mail_transport as mt
+from tests.conftest import SMTP_SETTINGS
+
+
+def _transport():
+    return mt.MailTransport(rate_per_second=0)
+
+
+def test_deliveries_reuse_one_pooled_connection(fake_smtp):
+    transport = _transport()
+    for to in ["a@x.io", "b@x.io", "c@x.io"]:
+        transport.deliver(SMTP_SETTINGS, Message(), to)
+    assert fake_smtp.sent == ["a@x.io", "b@x.io", "c@x.io"]
+    assert fake_smtp.opened == 1
+    assert transport.stats()["pool"] == {"opened": 1, "reused": 2, "discarded": 0, "idle": 1}
+
+
+def test_a_dropped_connection_is_replaced_once(fake_smtp):
+    transport = _transport()
+    transport.deliver(SMTP_SETTINGS, Message(), "a@x.io")
+    fake_smtp.fail_next = 1
+    transport.deliver(SMTP_SETTINGS, Message(), "b@x.io")
+    assert fake_smtp.sent == ["a@x.io", "b@x.io"]
+    assert fake_smtp.opened == 2 and transport.pool.stats()["discarded"] == 1
+
+
+def test_delivery_fails_when_the_fresh_connection_also_drops(fake_smtp):
+    transport = _transport()
+    fake_smtp.fail_next = 2
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        transport.deliver(SMTP_SETTINGS, Message(), "a@x.io")
+    # Neither broken connection goes back to the pool
+    assert transport.pool.stats()["idle"] == 0 and fake_smtp.sent == []
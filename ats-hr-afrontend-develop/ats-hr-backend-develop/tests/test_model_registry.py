@@ -0,0 +1,44 @@
+"""
+Tests for the process-wide NLP model registry.
+"""
+
+import threading
+
+from app.resume_parser.parser import get_resume_parser
+from app.services.model_registry import ModelRegistry
+
+
+def test_models_load_once_and_failures_are_remembered():
+    registry = ModelRegistry()
+    calls = {"ok": 0, "bad": 0}
+    warmed = []
+
+    def _load_ok():
+        calls["ok"] += 1
+        return object()
+
+    def _load_bad():
+        calls["bad"] += 1
+        raise OSError("model not installed")
+
+    registry.register("ok", _load_ok, warmed.append)
+    registry.register("bad", _load_bad)
+
+    threads = [threading.Thread(target=registry.get, args=("ok",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls["ok"] == 1
+
+    assert registry.get("bad") is None and registry.get("bad") is None
+    assert calls["bad"] == 1
+
+    stats = registry.warm_up(["ok", "bad", "unknown"])
+    assert len(warmed) == 1 and stats["ok"]["warmed_up"] is True
+    assert stats["ok"]["status"] == "loaded" and stats["ok"]["load_ms"] is not None
+    assert stats["bad"]["status"] == "unavailable" and "not installed" in stats["bad"]["error"]
+
+
+def test_resume_parser_instance_is_shared():
+    assert get_resume_parser() is get_resume_parser()
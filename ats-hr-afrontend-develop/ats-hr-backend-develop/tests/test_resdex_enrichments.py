@@ -0,0 +1,136 @@
+"""
+Tests for the concurrent / background Resdex search enrichments.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.events.candidate_terms_listeners import register_candidate_terms_listeners
+from app.routes import resdex
+from app.services import resdex_enrichments as enrich
+from app.services.resdex_cache import resdex_ranking_cache
+from app.services.resdex_facets import compute_facets, facet_cache
+from app.utils.resdex_search_engine import related_searches, search_suggestions, spell_check_query
+
+USER = {"id": "u1", "role": "admin", "type": "user"}
+OTHER = {"id": "u2", "role": "admin", "type": "user"}
+
+
+class _NoSession:
+    def close(self):
+        pass
+
+
+class _NoKeywordIndex:
+    def ensure_fresh(self, db):
+        pass
+
+    def keyword_scores(self, tokens):
+        return {}
+
+
+@pytest.fixture
+def stub_tasks(monkeypatch):
+    """Replace every task with a cheap one so only the plumbing is exercised."""
+    monkeypatch.setattr(enrich, "SessionLocal", _NoSession)
+    monkeypatch.setattr(enrich, "spell_check_query", lambda db, q: f"fix {q}")
+    monkeypatch.setattr(enrich, "search_suggestions", lambda db, q, user: [q])
+    monkeypatch.setattr(enrich, "related_searches", lambda q, window: [f"{q} more"])
+    monkeypatch.setattr(enrich, "facets", lambda window: {"n": len(window)})
+    with enrich._lock:
+        enrich._pending.clear()
+    yield
+    with enrich._lock:
+        enrich._pending.clear()
+
+
+def test_a_failing_task_falls_back_to_its_default(stub_tasks, monkeypatch):
+    def broken(db, q):
+        raise RuntimeError("vocabulary unavailable")
+
+    monkeypatch.setattr(enrich, "spell_check_query", broken)
+    out = asyncio.run(enrich.compute_enrichments("java", [], USER))
+    assert out == {
+        "did_you_mean": enrich._DEFAULTS["did_you_mean"],
+        "suggestions": ["java"],
+        "related_searches": ["java more"],
+        "facets": {"n": 0},
+    }
+
+
+def test_only_the_owner_can_fetch(stub_tasks):
+    search_id = enrich.start_enrichments("java", [], USER)
+    assert asyncio.run(enrich.get_enrichments(search_id, OTHER)) is None
+    assert asyncio.run(enrich.get_enrichments(search_id, USER, wait=5))["status"] == "ready"
+    assert asyncio.run(enrich.get_enrichments("unknown", USER)) is None
+
+
+def test_expired_and_overflowing_entries_are_evicted(stub_tasks, monkeypatch):
+    monkeypatch.setattr(enrich, "RESDEX_ENRICHMENT_TTL_SECONDS", 0)
+    expired = enrich.start_enrichments("java", [], USER)
+    assert asyncio.run(enrich.get_enrichments(expired, USER)) is None
+
+    monkeypatch.setattr(enrich, "RESDEX_ENRICHMENT_TTL_SECONDS", 300)
+    monkeypatch.setattr(enrich, "RESDEX_ENRICHMENT_MAX_PENDING", 2)
+    ids = [enrich.start_enrichments("java", [], USER) for _ in range(3)]
+    assert list(enrich._pending) == ids[1:]
+    assert asyncio.run(enrich.get_enrichments(ids[0], USER)) is None
+
+
+def test_wait_long_polls_for_running_tasks(stub_tasks, monkeypatch):
+    release = threading.Event()
+
+    def slow(db, q):
+        release.wait(5)
+        return "slow"
+
+    monkeypatch.setattr(enrich, "spell_check_query", slow)
+    search_id = enrich.start_enrichments("java", [], USER)
+
+    early = asyncio.run(enrich.get_enrichments(search_id, USER))
+    assert early["status"] == "pending" and early["did_you_mean"] is None
+
+    threading.Timer(0.05, release.set).start()
+    done = asyncio.run(enrich.get_enrichments(search_id, USER, wait=5))
+    assert done["status"] == "ready" and done["did_you_mean"] == "slow"
+
+
+@pytest.fixture
+def search_db(db_session, monkeypatch):
+    async def no_embedding(text):
+        return None
+
+    register_candidate_terms_listeners()
+    monkeypatch.setattr(resdex, "generate_embedding_async", no_embedding)
+    monkeypatch.setattr(resdex, "candidate_search_index", _NoKeywordIndex())
+    monkeypatch.setattr(enrich, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    resdex_ranking_cache.clear()
+    facet_cache.clear()
+    db_session.add_all(
+        [
+            models.Candidate(
+                id=f"c{i}", full_name=f"N{i}", skills=["Python", "Django" if i % 2 else "Flask"],
+                experience_years=i, current_location="Pune",
+            )
+            for i in range(12)
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+def test_search_returns_the_inline_enrichments_by_default(search_db):
+    page = asyncio.run(resdex.resdex_search.__wrapped__(q="pythn", db=search_db, current_user=USER, limit=20))
+    meta = page["metadata"]
+    assert "search_id" not in meta and meta["related_searches"]
+
+    head = {c.id: c for c in search_db.query(models.Candidate)}
+    ranked = [{"_candidate_obj": head[r["id"]]} for r in page["results"][:10]]
+    assert meta["did_you_mean"] == spell_check_query(search_db, "pythn")
+    assert meta["suggestions"] == search_suggestions(search_db, "pythn", USER)
+    assert meta["related_searches"] == related_searches("pythn", ranked)
+    assert meta["facets"] == compute_facets(search_db, search_db.query(models.Candidate))
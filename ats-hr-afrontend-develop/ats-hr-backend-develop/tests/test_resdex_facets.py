@@ -0,0 +1,71 @@
+"""
+Tests for exact SQL Resdex facets.
+"""
+
+import pytest
+
+from app import models
+from app.events.candidate_terms_listeners import register_candidate_terms_listeners
+from app.services.resdex_facets import compute_facets, facet_signature
+
+
+@pytest.fixture
+def db(db_session):
+    register_candidate_terms_listeners()
+    db_session.add_all(
+        [
+            models.Candidate(id="c1", skills=["Python", "SQL"], current_location="Pune", experience_years=1,
+                             qualification="B.Tech", notice_period_days=0),
+            models.Candidate(id="c2", skills=["python"], current_location="Pune ", experience_years=6,
+                             education=[{"degree": "MCA"}]),
+            models.Candidate(id="c3", skills=["Java"], current_location="Delhi", experience_years=12,
+                             education={"degree": "MBA"}, notice_period_days=60),
+            models.Certification(id="x1", candidate_id="c1", name="AWS SA", organization="Amazon"),
+            models.Certification(id="x2", candidate_id="c3", name="AWS SA", organization="Amazon"),
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+def test_facets_count_the_whole_filtered_set(db):
+    out = compute_facets(db, db.query(models.Candidate))
+    assert out["skills"][0] == {"value": "python", "count": 2}
+    assert out["locations"] == [{"value": "Pune", "count": 2}, {"value": "Delhi", "count": 1}]
+    assert out["experience_ranges"] == {"0-2": 1, "2-5": 0, "5-10": 1, "10+": 1}
+    assert out["certifications"] == [{"value": "AWS SA", "count": 2}]
+    assert out["availability"] == {"immediate": 1, "not_available": 1, "unknown": 1}
+    assert {e["value"] for e in out["education_levels"]} == {"B.Tech", "MBA", "MCA"}
+
+    filtered = compute_facets(db, db.query(models.Candidate).filter(models.Candidate.experience_years > 5))
+    assert filtered["locations"] == [{"value": "Delhi", "count": 1}, {"value": "Pune", "count": 1}]
+    assert filtered["certifications"] == [{"value": "AWS SA", "count": 1}]
+
+
+def test_signature_ignores_order_and_case():
+    a = facet_signature({"skills": ["Python", "sql"], "location": "Pune"})
+    b = facet_signature({"location": " pune", "skills": ["SQL", "python"]})
+    assert a == b
+    assert a != facet_signature({"skills": ["python"], "location": "pune"})
+
+
+def test_education_labels_are_read_in_sql(db_session):
+    db_session.add_all(
+        [
+            models.Candidate(id="e1", education=["B.Sc Physics", "M.Sc"]),
+            models.Candidate(id="e2", education={"qualification": "Diploma"}),
+            models.Candidate(id="e3", education={"school": "X"}),
+            models.Candidate(id="e4", education={}),
+            models.Candidate(id="e5", education=[]),
+            models.Candidate(id="e6", education=[{"degree": " B.Sc Physics "}], qualification=""),
+            models.Candidate(id="e7", education=["ignored"], qualification="PhD"),
+        ]
+    )
+    db_session.commit()
+    out = compute_facets(db_session, db_session.query(models.Candidate))
+    assert out["education_levels"] == [
+        {"value": "B.Sc Physics", "count": 2},
+        {"value": "Diploma", "count": 1},
+        {"value": "Other", "count": 1},
+        {"value": "PhD", "count": 1},
+    ]
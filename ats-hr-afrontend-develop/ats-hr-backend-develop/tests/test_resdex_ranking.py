@@ -0,0 +1,51 @@
+"""
+Tests for the bounded top-k re-rank used by Resdex search.
+"""
+
+import random
+
+from app.utils.resdex_search_engine import bounded_top_k
+
+
+def _reference(scores, k):
+    order = sorted(range(len(scores)), key=lambda i: -scores[i])
+    return [(i, scores[i]) for i in order[:k]]
+
+
+def test_matches_stable_full_sort_and_skips_work():
+    rng = random.Random(7)
+    cheap = [round(rng.uniform(0, 90), 2) for _ in range(2000)]
+    extra = [round(rng.choice([0.0, 5.0, 10.0]), 2) for _ in range(2000)]
+    exact = [round(a + b, 2) for a, b in zip(cheap, extra)]
+    bounds = [round(a + 10.0, 2) for a in cheap]
+
+    scored = []
+
+    def score_batch(indices):
+        scored.extend(indices)
+        return [exact[i] for i in indices]
+
+    assert bounded_top_k(bounds, score_batch, 50, batch_size=25) == _reference(exact, 50)
+    assert len(scored) < len(exact) // 2
+
+
+def test_ties_keep_input_order():
+    exact = [5.0, 7.0, 5.0, 7.0, 5.0]
+    result = bounded_top_k(exact, lambda idx: [exact[i] for i in idx], 3)
+    assert [i for i, _ in result] == [1, 3, 0]
+
+
+def test_k_larger_than_input():
+    exact = [1.0, 3.0, 2.0]
+    assert bounded_top_k(exact, lambda idx: [exact[i] for i in idx], 10) == [(1, 3.0), (2, 2.0), (0, 1.0)]
+
+
+def test_ranking_cache_key_normalizes_and_follows_data_version():
+    from app.services.resdex_cache import bump_candidate_version, ranking_cache_key
+
+    key = ranking_cache_key("  Python   AWS ", {"skills": ["b", "a"]}, scope="admin")
+    assert key == ranking_cache_key("python aws", {"skills": ["A", "B"]}, scope="admin")
+    assert key != ranking_cache_key("python aws", {"skills": ["a", "b"]}, scope="recruiter")
+
+    bump_candidate_version()
+    assert key != ranking_cache_key("python aws", {"skills": ["a", "b"]}, scope="admin")
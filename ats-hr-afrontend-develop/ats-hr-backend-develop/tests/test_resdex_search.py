@@ -0,0 +1,120 @@
+"""
+Tests for the bounded two-stage Resdex search.
+"""
+
+import asyncio
+
+import pytest
+
+from app import models
+from app.routes import resdex
+from app.services.resdex_cache import resdex_ranking_cache
+
+USER = {"id": "u1", "role": "admin", "type": "user"}
+
+
+class FakeKeywordIndex:
+    def __init__(self, hits):
+        self.hits = hits
+
+    def ensure_fresh(self, db):
+        pass
+
+    def keyword_scores(self, tokens):
+        return dict(self.hits)
+
+
+async def _no_embedding(text):
+    return None
+
+
+async def _no_enrichments(*args):
+    return {"did_you_mean": None, "suggestions": [], "related_searches": [], "facets": {}}
+
+
+@pytest.fixture
+def db(db_session, monkeypatch):
+    monkeypatch.setattr(resdex, "generate_embedding_async", _no_embedding)
+    monkeypatch.setattr(resdex, "start_enrichments", lambda *args: "sid")
+    monkeypatch.setattr(resdex, "compute_enrichments", _no_enrichments)
+    resdex_ranking_cache.clear()
+    db_session.add_all(
+        [
+            models.Candidate(
+                id=f"c{i:02d}", full_name=f"N{i}", skills=["Python"], experience_years=i,
+                profile_completion=i, current_location="Pune" if i % 2 else "Delhi",
+            )
+            for i in range(30)
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+def _search(db, **kwargs):
+    return asyncio.run(resdex.resdex_search.__wrapped__(db=db, current_user=USER, **kwargs))
+
+
+def _loaded(monkeypatch):
+    sizes = []
+    real = resdex._load_rows
+
+    def counting(db, ids, *args):
+        sizes.append(len(ids))
+        return real(db, ids, *args)
+
+    monkeypatch.setattr(resdex, "_load_rows", counting)
+    return sizes
+
+
+def test_column_sort_is_exact_and_hydrates_only_the_window(db, monkeypatch):
+    monkeypatch.setattr(resdex, "RERANK_WINDOW", 5)
+    sizes = _loaded(monkeypatch)
+
+    page = _search(db, location="pune", sort="experience_desc", limit=3)
+    assert page["total"] == 15
+    assert [r["id"] for r in page["results"]] == ["c29", "c27", "c25"]
+    assert sizes == [5]
+
+    deeper = _search(db, location="pune", sort="experience_desc", limit=3, offset=6)
+    assert [r["id"] for r in deeper["results"]] == ["c17", "c15", "c13"]
+    assert sizes == [5, 9]
+
+
+def test_large_sets_rank_a_bounded_recall_pool(db, monkeypatch):
+    monkeypatch.setattr(resdex, "EXACT_POOL_LIMIT", 10)
+    monkeypatch.setattr(resdex, "RECALL_SIZE", 4)
+    monkeypatch.setattr(resdex, "RERANK_WINDOW", 4)
+    monkeypatch.setattr(resdex, "candidate_search_index", FakeKeywordIndex({"c03": 100.0, "c05": 90.0, "c02": 80.0}))
+    sizes = _loaded(monkeypatch)
+
+    page = _search(db, q="python", location="pune", limit=4)
+    assert page["total"] == 15
+    # Keyword hits that pass the filters, topped up by the most complete profiles
+    assert sizes == [6]
+    ids = [r["id"] for r in page["results"]]
+    assert ids[:2] == ["c03", "c05"] and "c02" not in ids
+    assert {r["id"] for r in page["results"]} <= {"c03", "c05", "c29", "c27", "c25", "c23"}
+
+
+def test_small_sets_are_ranked_exactly(db, monkeypatch):
+    monkeypatch.setattr(resdex, "candidate_search_index", FakeKeywordIndex({"c04": 100.0}))
+    sizes = _loaded(monkeypatch)
+
+    page = _search(db, q="python", limit=2)
+    assert page["total"] == 30 and sizes == [30]
+    assert page["results"][0]["id"] == "c04"
+
+
+def test_cached_pages_rehydrate_only_the_page_and_head(db, monkeypatch):
+    monkeypatch.setattr(resdex, "RERANK_WINDOW", 30)
+    first = _search(db, sort="experience_desc", limit=5)
+    sizes = _loaded(monkeypatch)
+
+    page = _search(db, sort="experience_desc", limit=5, offset=20)
+    assert [r["id"] for r in page["results"]] == ["c09", "c08", "c07", "c06", "c05"]
+    # The 5 page rows plus the 10 rows related searches read
+    assert sizes == [15]
+    again = _search(db, sort="experience_desc", limit=5)
+    assert again["results"] == first["results"]
+    assert sizes == [15, 10]
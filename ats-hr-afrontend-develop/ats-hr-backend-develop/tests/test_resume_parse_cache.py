@@ -0,0 +1,72 @@
+"""
+Tests for the content-hash resume parse cache.
+"""
+
+from datetime import datetime
+
+from app import models
+from app.services import resume_parse_cache as rpc
+
+
+def test_identical_files_are_parsed_once(db_session, tmp_path, monkeypatch):
+    calls = []
+    real_parse = rpc.parse_resume
+
+    def counting_parse(path):
+        calls.append(path)
+        return real_parse(path)
+
+    monkeypatch.setattr(rpc, "parse_resume", counting_parse)
+
+    content = b"Jane Doe\njane.doe@example.com\nSkills: Python, SQL\n"
+    first, second = tmp_path / "a.txt", tmp_path / "copy_of_a.txt"
+    first.write_bytes(content)
+    second.write_bytes(content)
+
+    parsed = rpc.parse_resume_cached(db_session, str(first))
+    assert parsed["data"]["email"] == "jane.doe@example.com"
+    assert rpc.parse_resume_cached(db_session, str(second)) == parsed
+    assert len(calls) == 1
+
+    row = db_session.query(models.ResumeParseCache).one()
+    assert row.content_hash == rpc.content_sha256(content) and row.hits == 1
+
+    rpc.parse_resume_cached(db_session, str(second), force=True)
+    assert len(calls) == 2
+
+
+def test_failed_parses_are_not_cached(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(rpc, "parse_resume", lambda path: {"success": False, "data": {}})
+    resume = tmp_path / "broken.pdf"
+    resume.write_bytes(b"not a pdf")
+
+    assert rpc.parse_resume_cached(db_session, str(resume)) == {"success": False, "data": {}}
+    assert db_session.query(models.ResumeParseCache).count() == 0
+
+
+def test_batch_lookup_and_store(db_session):
+    parsed = {"success": True, "data": {"email": "a@x.io"}}
+    rpc.store_parses(db_session, [("h1", parsed), ("h2", parsed), ("h3", {"success": False})])
+    assert db_session.query(models.ResumeParseCache).count() == 2
+
+    found = rpc.get_cached_parses(db_session, ["h1", "h2", "h3", "h1"])
+    assert set(found) == {"h1", "h2"} and found["h1"] == parsed
+    db_session.expire_all()
+    assert {r.hits for r in db_session.query(models.ResumeParseCache)} == {1}
+
+
+def test_entries_from_an_earlier_year_are_reparsed(db_session, tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(rpc, "parse_resume", lambda path: calls.append(path) or {"success": True, "data": {}})
+    resume = tmp_path / "cv.txt"
+    resume.write_bytes(b"Engineer, 2019 - Present")
+
+    rpc.parse_resume_cached(db_session, str(resume))
+    row = db_session.query(models.ResumeParseCache).one()
+    row.created_at = datetime(datetime.utcnow().year - 1, 12, 31)
+    db_session.commit()
+
+    rpc.parse_resume_cached(db_session, str(resume))
+    assert len(calls) == 2
+    db_session.expire_all()
+    assert db_session.query(models.ResumeParseCache).one().created_at.year == datetime.utcnow().year
@@ -0,0 +1,62 @@
+"""
+Tests for the bulk resume parsing pool.
+"""
+
+import asyncio
+import threading
+import time
+
+from app.services import resume_parse_pool as rpp
+
+
+def _collect(pool, items):
+    async def run():
+        return [item async for item in pool.parse_stream(items)]
+
+    return asyncio.run(run())
+
+
+def test_parses_in_worker_processes(tmp_path):
+    resume = tmp_path / "resume.txt"
+    resume.write_text("John Smith\njohn.smith@example.com\nSkills: Python, SQL\n")
+
+    pool = rpp.ResumeParsePool(workers=2, preload="")
+    try:
+        [(key, parsed, error)] = _collect(pool, [("r1", str(resume))])
+    finally:
+        pool.shutdown()
+    assert key == "r1" and error is None
+    assert parsed["data"]["email"] == "john.smith@example.com"
+
+
+def test_streams_in_completion_order_with_bounded_concurrency(monkeypatch):
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def fake_parse(path):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.2 if path == "slow" else 0.01)
+        with lock:
+            running["now"] -= 1
+        if path == "bad":
+            raise ValueError("corrupt file")
+        return {"data": {"path": path}}
+
+    monkeypatch.setattr(rpp, "parse_resume_path", fake_parse)
+    pool = rpp.ResumeParsePool(workers=0, max_in_flight=2)
+    results = _collect(pool, [(0, "slow"), (1, "a"), (2, "bad"), (3, "b")])
+
+    assert [key for key, _, _ in results][-1] == 0
+    assert running["peak"] <= 2
+    errors = {key: error for key, _, error in results}
+    assert isinstance(errors[2], ValueError) and errors[1] is None
+
+
+def test_worker_processes_ocr_one_page_at_a_time(monkeypatch):
+    from app.resume_parser.extractors import ocr_extractor
+
+    monkeypatch.setattr(ocr_extractor, "OCR_WORKERS", 4)
+    rpp._init_worker("")
+    assert ocr_extractor.OCR_WORKERS == 1
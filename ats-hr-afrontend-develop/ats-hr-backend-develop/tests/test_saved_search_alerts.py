@@ -0,0 +1,91 @@
+"""
+Tests for the batched saved-search alert tick.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.services.saved_search_alerts import (
+    NOTIFICATION_TYPE,
+    _claim_searches,
+    compile_filters,
+    run_saved_search_alerts,
+)
+
+
+def _notifications(db):
+    return (
+        db.query(models.SystemNotification)
+        .filter(models.SystemNotification.notification_type == NOTIFICATION_TYPE)
+        .order_by(models.SystemNotification.reference_id)
+        .all()
+    )
+
+
+def test_compile_filters_matches_query_semantics():
+    class Row:
+        merged_into_id = None
+        skills = ["Python", "Django"]
+        current_location = "Pune, India"
+        experience_years = 4
+
+    assert compile_filters({"skills": "java, django", "location": "pune"})(Row)
+    assert not compile_filters({"skills": ["java"]})(Row)
+    assert not compile_filters({"experience_min": 5})(Row)
+    assert compile_filters({})(Row)
+
+
+def test_tick_alerts_only_on_new_matches(db_session):
+    start = datetime.utcnow() - timedelta(hours=1)
+    db_session.add_all(
+        [
+            models.SavedSearch(id="s1", name="python", user_id="u1", query="-", filters={"skills": ["python"]},
+                               created_at=start),
+            models.SavedSearch(id="s2", name="delhi", user_id="u2", query="-", filters={"location": "delhi"},
+                               created_at=start),
+            models.Candidate(id="old", skills=["Python"], created_at=start - timedelta(days=1),
+                             updated_at=start - timedelta(days=1)),
+            models.Candidate(id="c1", full_name="Ann", skills=["Python"], current_location="Pune"),
+            models.Candidate(id="c2", full_name="Bob", skills=["Java"], current_location="Delhi"),
+        ]
+    )
+    db_session.commit()
+
+    result = run_saved_search_alerts(db_session)
+    assert result == {"searches": 2, "candidates": 2, "notifications": 2}
+    notes = _notifications(db_session)
+    assert [(n.reference_id, n.user_id) for n in notes] == [("s1", "u1"), ("s2", "u2")]
+    assert "Ann" in notes[0].message
+
+    # Nothing changed since the last tick
+    assert run_saved_search_alerts(db_session)["notifications"] == 0
+
+    # c2 newly matches s1; s2 already announced it, so the edit is not news there
+    c2 = db_session.get(models.Candidate, "c2")
+    c2.skills = ["Python"]
+    c2.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db_session.commit()
+    assert run_saved_search_alerts(db_session) == {"searches": 2, "candidates": 1, "notifications": 1}
+    assert [n.reference_id for n in _notifications(db_session)] == ["s1", "s1", "s2"]
+
+    c1 = db_session.get(models.Candidate, "c1")
+    c1.full_name = "Ann Lee"
+    c1.updated_at = datetime.utcnow() + timedelta(seconds=2)
+    db_session.commit()
+    assert run_saved_search_alerts(db_session)["notifications"] == 0
+
+
+def test_a_search_claimed_by_another_run_is_skipped(db_session):
+    db_session.add(models.SavedSearch(id="s1", name="any", user_id="u1", query="-", filters={}))
+    db_session.commit()
+    other = sessionmaker(bind=db_session.get_bind())()
+    # Both runs read the searches before either claims them
+    mine, theirs = db_session.query(models.SavedSearch).all(), other.query(models.SavedSearch).all()
+
+    mark = datetime.utcnow()
+    assert [s.id for s in _claim_searches(db_session, mine, mark)] == ["s1"]
+    db_session.commit()
+    assert _claim_searches(other, theirs, mark) == []
+    other.close()
@@ -0,0 +1,55 @@
+"""
+Tests for paginated and incremental saved-search runs.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.routes.searches import run_search
+
+USER = {"id": "u1", "role": "admin", "type": "user"}
+
+
+@pytest.fixture
+def db(db_session):
+    old = datetime.utcnow() - timedelta(days=2)
+    for i in range(5):
+        db_session.add(models.Candidate(id=f"c{i}", full_name=f"N{i}", current_location="Pune",
+                                        created_at=old + timedelta(minutes=i), updated_at=old))
+    db_session.add(models.Candidate(id="other", current_location="Delhi", created_at=old, updated_at=old))
+    db_session.add(models.SavedSearch(id="s1", name="pune", user_id="u1", query="-", filters={"location": "pune"}))
+    db_session.commit()
+    return db_session
+
+
+def _run(db, **kwargs):
+    return asyncio.run(run_search.__wrapped__("s1", db=db, current_user=USER, **kwargs))
+
+
+def test_run_paginates_with_count_total(db):
+    page = _run(db, limit=2, offset=2)
+    assert page["result_count"] == 5
+    assert [c["id"] for c in page["candidates"]] == ["c2", "c1"]
+    assert db.get(models.SavedSearch, "s1").result_count == 5
+
+
+def test_new_mode_returns_only_changes_since_last_run(db):
+    first = _run(db, mode="new")
+    assert first["result_count"] == 5  # no high-water mark yet
+
+    assert _run(db, mode="new")["result_count"] == 0
+
+    c3 = db.get(models.Candidate, "c3")
+    c3.full_name = "Updated"
+    c3.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.add(models.Candidate(id="c9", current_location="Pune", updated_at=datetime.utcnow() + timedelta(seconds=1)))
+    db.commit()
+
+    delta = _run(db, mode="new", limit=1)
+    assert delta["result_count"] == 2
+    page2 = _run(db, mode="new", limit=1, offset=1, since=delta["since"])
+    assert {delta["candidates"][0]["id"], page2["candidates"][0]["id"]} == {"c3", "c9"}
+    assert db.get(models.SavedSearch, "s1").result_count == 5
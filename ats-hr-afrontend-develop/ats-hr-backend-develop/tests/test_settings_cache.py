@@ -0,0 +1,70 @@
+"""
+Tests for the in-memory system settings cache.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app import models
+from app.events.settings_listeners import register_settings_listeners
+from app.services.settings_cache import SystemSettingsCache, system_settings_cache
+
+
+def test_resolves_keys_like_the_settings_queries(db_session):
+    old = datetime.utcnow() - timedelta(days=1)
+    db_session.add_all([
+        models.SystemSettings(module_name="email", setting_key="from_name", setting_value="Old", updated_at=old),
+        models.SystemSettings(config_key="email.from_name", value_json="New", setting_value="Legacy", updated_at=datetime.utcnow()),
+        models.SystemSettings(config_key="notify.enable_system_emails", value_json="false"),
+        models.SystemSettings(config_key="uploads.max_file_size_mb", value_json="25"),
+        models.SystemSettings(config_key="email.smtp_config", value_json={"server": "smtp.x"}),
+    ])
+    db_session.commit()
+
+    cache = SystemSettingsCache()
+    assert cache.get("email.from_name", db=db_session) == "New"
+    assert cache.get_bool("notify.enable_system_emails", True, db=db_session) is False
+    assert cache.get_int("uploads.max_file_size_mb", 10, db=db_session) == 25
+    assert cache.get_dict("email.smtp_config", db=db_session) == {"server": "smtp.x"}
+    assert cache.get("missing.key", "d", db=db_session) == "d"
+
+
+def test_reloads_on_commit_and_on_probe(db_session):
+    register_settings_listeners()
+    db_session.add(models.SystemSettings(config_key="maintenance.enabled", value_json=False, updated_at=datetime.utcnow()))
+    db_session.commit()
+
+    system_settings_cache._values = None
+    assert system_settings_cache.get_bool("maintenance.enabled", db=db_session) is False
+
+    # ORM write through a route: the commit listener drops the snapshot
+    row = db_session.query(models.SystemSettings).one()
+    row.value_json = True
+    row.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db_session.commit()
+    assert system_settings_cache.get_bool("maintenance.enabled", db=db_session) is True
+
+    # Write by another worker: seen once the sync interval has passed
+    cache = SystemSettingsCache()
+    cache.SYNC_INTERVAL_SECONDS = 0
+    assert cache.get_bool("maintenance.enabled", db=db_session) is True
+    db_session.execute(text("UPDATE system_settings SET value_json = 'false', updated_at = :ts"), {"ts": datetime.utcnow() + timedelta(seconds=5)})
+    db_session.commit()
+    assert cache.get_bool("maintenance.enabled", db=db_session) is False
+
+
+def test_signal_file_reaches_other_workers(db_session, tmp_path):
+    db_session.add(models.SystemSettings(config_key="maintenance.enabled", value_json=False))
+    db_session.commit()
+
+    signal = str(tmp_path / "settings.signal")
+    writer, reader = SystemSettingsCache(signal), SystemSettingsCache(signal)
+    assert reader.get_bool("maintenance.enabled", db=db_session) is False
+
+    db_session.execute(text("UPDATE system_settings SET value_json = 'true'"))
+    db_session.commit()
+    assert reader.get_bool("maintenance.enabled", db=db_session) is False  # within the sync interval
+
+    writer.notify_changed()
+    assert reader.get_bool("maintenance.enabled", db=db_session) is True
@@ -0,0 +1,61 @@
+"""
+Tests for the in-memory skill vocabulary (trie autocomplete + BK-tree spell check).
+"""
+
+import random
+import string
+from difflib import get_close_matches
+
+import pytest
+
+from app import models
+from app.events.search_index_listeners import register_search_index_listeners
+from app.services.skill_vocabulary import BKTree, SkillTrie, SkillVocabulary, levenshtein
+
+SKILLS = ["Python", "PySpark", "Java", "JavaScript", "Kubernetes", "PostgreSQL", "React", "React Native", "TypeScript"]
+
+
+@pytest.fixture
+def db(db_session):
+    db_session.add_all([models.Skill(name=name, normalized_name=name.lower()) for name in SKILLS])
+    db_session.commit()
+    return db_session
+
+
+def test_trie_and_bk_tree_primitives():
+    trie = SkillTrie(["java", "javascript", "jax", "python"])
+    assert trie.starts_with("ja") == ["java", "javascript", "jax"]
+    assert trie.starts_with("ja", limit=2) == ["java", "javascript"]
+    assert trie.starts_with("rust") == []
+
+    assert levenshtein("kitten", "sitting") == 3
+    tree = BKTree(["kubernetes", "kubeflow", "python", "pytorch"])
+    assert sorted(w for _, w in tree.search("kubernets", 1)) == ["kubernetes"]
+
+
+def test_closest_matches_difflib(db):
+    vocab = SkillVocabulary()
+    words = [s.lower() for s in SKILLS]
+    rng = random.Random(7)
+    probes = ["pyhton", "kubernets", "javscript", "postgresq", "reactt", "typescrpt", "golang"]
+    for _ in range(300):
+        word = rng.choice(words)
+        i = rng.randrange(len(word))
+        probes.append(word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:])
+    for probe in probes:
+        expected = get_close_matches(probe, words, n=1, cutoff=0.88)
+        assert vocab.closest(probe, db=db) == (expected[0] if expected else None), probe
+
+
+def test_search_prefix_first_and_refresh_on_commit(db):
+    register_search_index_listeners()
+    from app.services.skill_vocabulary import skill_vocabulary
+
+    skill_vocabulary.mark_dirty()
+    assert skill_vocabulary.search("java", db=db) == ["Java", "JavaScript"]
+    assert skill_vocabulary.search("script", db=db) == ["JavaScript", "TypeScript"]
+    assert skill_vocabulary.search("react", limit=1, db=db) == ["React"]
+
+    db.add(models.Skill(name="Scripting", normalized_name="scripting"))
+    db.commit()
+    assert skill_vocabulary.search("script", db=db) == ["Scripting", "JavaScript", "TypeScript"]
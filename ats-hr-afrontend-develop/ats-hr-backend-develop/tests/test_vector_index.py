@@ -0,0 +1,109 @@
+"""
+Tests for the IVF vector index and its disk snapshots.
+"""
+
+import os
+
+import numpy as np
+
+from app import models
+from app.services.vector_index import VectorIndex
+
+
+def _random_index(tmp_path, n=600, dim=384):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    index = VectorIndex(models.Candidate, name="test", snapshot_dir=str(tmp_path))
+    index.MIN_TRAIN_SIZE = 200
+    for i, v in enumerate(vectors):
+        index.upsert(f"c{i}", v)
+    return index, vectors
+
+
+def test_exact_search_before_training(tmp_path):
+    index, vectors = _random_index(tmp_path)
+    hits = index.search(vectors[7], k=3)
+    assert hits[0][0] == "c7"
+    assert abs(hits[0][1] - 1.0) < 1e-5
+
+
+def test_trained_search_finds_self_and_tracks_updates(tmp_path):
+    index, vectors = _random_index(tmp_path)
+    assert index.train() is True
+    index.DEFAULT_NPROBE = index.stats()["lists"]
+    assert index.search(vectors[42], k=1)[0][0] == "c42"
+
+    index.upsert("c42", vectors[43])
+    assert {h[0] for h in index.search(vectors[43], k=2)} == {"c42", "c43"}
+
+    index.remove("c43")
+    assert index.search(vectors[43], k=1)[0][0] == "c42"
+
+
+def test_search_respects_allowed_and_excluded_ids(tmp_path):
+    index, vectors = _random_index(tmp_path)
+    hits = index.search(vectors[1], k=5, allowed_ids={"c1", "c2"}, exclude_ids=["c1"])
+    assert [h[0] for h in hits] == ["c2"]
+
+
+def test_snapshot_round_trip(tmp_path):
+    index, vectors = _random_index(tmp_path)
+    index.train()
+    assert index.save() is True
+
+    restored = VectorIndex(models.Candidate, name="test", snapshot_dir=str(tmp_path))
+    assert restored.load() is True
+    assert len(restored) == len(index)
+    assert restored.stats()["lists"] == index.stats()["lists"]
+    restored.DEFAULT_NPROBE = restored.stats()["lists"]
+    assert restored.search(vectors[5], k=1)[0][0] == "c5"
+
+    # Updates after load must not touch the snapshot on disk
+    restored.upsert("new", vectors[9])
+    restored.remove("c0")
+    again = VectorIndex(models.Candidate, name="test", snapshot_dir=str(tmp_path))
+    again.load()
+    assert len(again) == len(index)
+
+
+def test_load_ignores_a_generation_the_pointer_does_not_name(tmp_path):
+    index, vectors = _random_index(tmp_path, n=50)
+    assert index.save() is True
+    first = index._read_pointer()
+
+    index.remove("c0")
+    assert index.save() is True
+    second = index._read_pointer()
+    assert second != first and os.path.isdir(index._generation_dir(first))
+
+    # A pointer naming a directory written for another generation is rejected
+    os.rename(index._generation_dir(first), index._generation_dir("bogus"))
+    with open(index._pointer_path(), "w") as fh:
+        fh.write("bogus")
+    assert VectorIndex(models.Candidate, name="test", snapshot_dir=str(tmp_path)).load() is False
+
+
+def test_old_generations_are_pruned(tmp_path):
+    index, _ = _random_index(tmp_path, n=20)
+    for _ in range(4):
+        assert index.save() is True
+    dirs = [e for e in os.listdir(tmp_path) if e.startswith("test.") and os.path.isdir(tmp_path / e)]
+    assert len(dirs) == VectorIndex.SNAPSHOT_GENERATIONS_KEPT
+    assert index._read_pointer() in {d[len("test."):] for d in dirs}
+
+
+def test_rows_deleted_while_down_are_dropped_after_load(tmp_path, db_session):
+    index, vectors = _random_index(tmp_path, n=5, dim=384)
+    index.save()
+    db_session.add_all(
+        [models.Candidate(id=f"c{i}", embedding_vector=vectors[i].tolist()) for i in (0, 1, 3, 4)]
+    )
+    db_session.commit()
+
+    restored = VectorIndex(models.Candidate, name="test", snapshot_dir=str(tmp_path))
+    assert restored.load() is True
+    assert restored.get("c2") is not None
+    restored.ensure_fresh(db_session)
+    assert restored.get("c2") is None
+    assert len(restored) == 4
+    assert [h[0] for h in restored.search(vectors[2], k=5) if h[0] == "c2"] == []